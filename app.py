@@ -10,7 +10,10 @@ from services.data_loader import load_scraped_data
 from pipelines.sentiment_pipeline import SentimentPipeline
 from pipelines.aggregation_pipeline import AggregationPipeline
 from pipelines.report_pipeline import ReportPipeline
-from fpdf import FPDF
+from services import registry
+from services.instrumentation import get_instrumentation
+from services.result_writer import load_processed_comments
+from services.pdf_renderer import get_pdf_renderer
 import re
 
 # Configure Logging
@@ -23,81 +26,40 @@ st.set_page_config(
     layout="wide"
 )
 
-# --- PDF Generation Utility ---
+# --- Shared Resources ---
+# Cached per server process: every session and rerun reuses the same model weights and clients
+
+@st.cache_resource(show_spinner="Loading sentiment model...")
+def get_sentiment_pipeline():
+    # Load BERT weights now rather than inside the first analysis
+    registry.get_sentiment_model().pipeline
+    return SentimentPipeline()
+
+@st.cache_resource
+def get_report_pipeline():
+    return ReportPipeline()
 
-def normalize_turkish_chars(text):
+# --- Report Rendering ---
+
+def render_report_stream(chunks):
     """
-    Replaces Turkish equivalents with Latin/ASCII characters for FPDF compatibility.
+    Renders streamed markdown chunks as they arrive; returns the full report text.
     """
-    replacements = {
-        'ğ': 'g', 'Ğ': 'G',
-        'ü': 'u', 'Ü': 'U',
-        'ş': 's', 'Ş': 'S',
-        'ı': 'i', 'İ': 'I',
-        'ö': 'o', 'Ö': 'O',
-        'ç': 'c', 'Ç': 'C',
-        'â': 'a', 'î': 'i', 'û': 'u'
-    }
-    for k, v in replacements.items():
-        text = text.replace(k, v)
-    
-    # Fallback for any other complex chars
-    return text.encode('latin-1', 'replace').decode('latin-1')
+    placeholder = st.empty()
+    report_md = ""
+    for chunk in chunks:
+        report_md += chunk
+        placeholder.markdown(report_md + "▌")
+    placeholder.markdown(report_md)
+    return report_md
 
-class PDF(FPDF):
-    def header(self):
-        self.set_font('Arial', 'B', 15)
-        title = normalize_turkish_chars('Sentiment Intelligence Report')
-        self.cell(0, 10, title, 0, 1, 'C')
-        self.ln(10)
-
-    def footer(self):
-        self.set_y(-15)
-        self.set_font('Arial', 'I', 8)
-        self.cell(0, 10, f'Page {self.page_no()}', 0, 0, 'C')
+# --- PDF Generation Utility ---
 
 def create_pdf(report_content, stats):
     """
-    Converts markdown report and stats to PDF using FPDF.
+    Converts markdown report and stats to PDF bytes (rendered in memory, no temp file).
     """
-    pdf = PDF()
-    pdf.add_page()
-    
-    # 1. Stats Section
-    pdf.set_font('Arial', 'B', 12)
-    pdf.cell(0, 10, 'Key Metrics', 0, 1)
-    
-    pdf.set_font('Arial', '', 11)
-    pdf.cell(0, 7, f"Average Sentiment: {stats['avg_sentiment']:.3f}", 0, 1)
-    pdf.cell(0, 7, f"Negative Ratio: {stats['negative_ratio']:.2f}", 0, 1)
-    pdf.ln(5)
-    
-    # 2. Report Content
-    pdf.set_font('Arial', '', 11)
-    
-    lines = report_content.split('\n')
-    for line in lines:
-        clean_line = line.strip()
-        
-        # Normalize for PDF encoding
-        safe_line = normalize_turkish_chars(clean_line)
-        
-        # Header handling
-        if clean_line.startswith('#'):
-            safe_line = safe_line.lstrip('#').strip()
-            pdf.set_font('Arial', 'B', 12)
-            pdf.ln(2)
-            pdf.multi_cell(0, 7, safe_line)
-            pdf.set_font('Arial', '', 11)
-        else:
-            # Bold cleanup
-            safe_line = safe_line.replace('**', '').replace('__', '')
-            if safe_line:
-                pdf.multi_cell(0, 6, safe_line)
-                
-    pdf_file = tempfile.mktemp(suffix=".pdf")
-    pdf.output(pdf_file, 'F')
-    return pdf_file
+    return get_pdf_renderer().render(report_content, stats)
 
 # --- UI Layout ---
 
@@ -106,9 +68,10 @@ st.markdown("Analyze customer sentiment from Şikayetvar and other sources using
 
 # --- Sidebar ---
 st.sidebar.header("Configuration")
-mode = st.sidebar.radio("Input Source", ["Live Scraping (Şikayetvar)", "Upload JSON"])
+mode = st.sidebar.radio("Input Source", ["Live Scraping (Şikayetvar)", "Upload JSON", "Load Past Run (Parquet)"])
 
 scraped_file_path = None
+past_run_df = None
 
 if mode == "Live Scraping (Şikayetvar)":
     company_slug = st.sidebar.text_input("Company Slug", value="turk-telekom", help="e.g., turk-telekom, garanti-bbva")
@@ -124,7 +87,8 @@ if mode == "Live Scraping (Şikayetvar)":
             scraper_dir = os.path.join(os.getcwd(), "web scraping ")
             target_path = os.path.join(scraper_dir, output_filename)
             
-            success = run_scraper(company_slug, max_items, output_filename)
+            with get_instrumentation().stage("scraping", 1):
+                success = run_scraper(company_slug, max_items, output_filename)
             
             if success:
                 st.success("✅ Scraping completed!")
@@ -141,6 +105,14 @@ elif mode == "Upload JSON":
             scraped_file_path = tmp.name
         st.sidebar.success("File uploaded!")
 
+elif mode == "Load Past Run (Parquet)":
+    uploaded_run = st.sidebar.file_uploader("Upload processed comments", type=["parquet"])
+    brand_name = st.sidebar.text_input("Brand", value="Unknown")
+    if uploaded_run:
+        # Results were scored in an earlier run (main.py --comments-output): no inference needed
+        past_run_df = load_processed_comments(uploaded_run)
+        st.sidebar.success(f"Loaded {len(past_run_df)} processed comments!")
+
 # --- Analysis Pipeline ---
 
 if scraped_file_path and os.path.exists(scraped_file_path):
@@ -177,58 +149,95 @@ if scraped_file_path and os.path.exists(scraped_file_path):
         try:
             # Step 1: Sentiment Analysis
             status_text.text("Running Sentiment Analysis (BERT)...")
-            sentiment_pipeline = SentimentPipeline()
+            sentiment_pipeline = get_sentiment_pipeline()
             processed_comments = sentiment_pipeline.run(comments)
             progress_bar.progress(40)
             
             # Step 2: Aggregation
             status_text.text("Aggregating Statistics...")
             agg_pipeline = AggregationPipeline()
-            stats = agg_pipeline.run(processed_comments)
+            with get_instrumentation().stage("aggregation", len(processed_comments)):
+                stats = agg_pipeline.run(processed_comments)
             progress_bar.progress(70)
             
             # Step 3: Report Gen
             status_text.text("Genering Gemini Report...")
-            report_pipeline = ReportPipeline()
-            
-            # Default goal
-            goal = "Genel müşteri memnuniyeti analizi"
-            final_report = report_pipeline.run(brand, goal, stats)
-            progress_bar.progress(100)
-            status_text.text("Analysis Complete!")
-            
+            report_pipeline = get_report_pipeline()
+            brand_health = report_pipeline.calculate_brand_health(stats['avg_sentiment'], stats['negative_ratio'])
+
             # --- Results Display ---
             st.divider()
-            
+
             # Metrics Row
             col1, col2, col3 = st.columns(3)
-            col1.metric("Brand Health Score", f"{final_report['brand_health_score']}/100")
+            col1.metric("Brand Health Score", f"{brand_health}/100")
             col2.metric("Avg Sentiment", f"{stats['avg_sentiment']:.2f}")
             col3.metric("Negative Ratio", f"{stats['negative_ratio']:.0%}")
-            
-            # Report
+
+            # Report, rendered while the LLM is still writing it
             st.subheader("📝 AI Executive Report")
-            report_md = final_report.get("report_markdown", "")
+            # Default goal
+            goal = "Genel müşteri memnuniyeti analizi"
+            with get_instrumentation().stage("report"):
+                report_md = render_report_stream(report_pipeline.stream_report(brand, goal, stats))
+            progress_bar.progress(100)
+            status_text.text("Analysis Complete!")
+
             if report_md:
-                st.markdown(report_md)
-                
                 # PDF Export
                 st.subheader("Download Report")
-                pdf_path = create_pdf(report_md, stats)
-                if pdf_path:
-                    with open(pdf_path, "rb") as pdf_file:
-                        st.download_button(
-                            label="📄 Download Report as PDF",
-                            data=pdf_file,
-                            file_name=f"{brand}_sentiment_report.pdf",
-                            mime="application/pdf"
-                        )
+                with get_instrumentation().stage("pdf_export", 1):
+                    pdf_bytes = create_pdf(report_md, stats)
+                if pdf_bytes:
+                    st.download_button(
+                        label="📄 Download Report as PDF",
+                        data=pdf_bytes,
+                        file_name=f"{brand}_sentiment_report.pdf",
+                        mime="application/pdf"
+                    )
                 else:
                     st.warning("Could not generate PDF.")
             else:
                 st.warning("Report generation returned empty content (possibly API quota).")
-                
+
+            # Stage timings (instrumentation.enabled in settings.yaml); totals for this server process
+            if get_instrumentation().enabled:
+                with st.expander("Run metrics"):
+                    st.json(get_instrumentation().summary())
+
         except Exception as e:
             st.error(f"An error occurred during analysis: {e}")
             logger.error(f"Pipeline error: {e}", exc_info=True)
-            
+
+# --- Past Run ---
+
+if past_run_df is not None:
+    st.divider()
+    st.subheader("1. Processed Comments")
+    if past_run_df.empty:
+        st.warning("No processed comments found in the file.")
+        st.stop()
+    st.dataframe(past_run_df[["date", "platform", "topic", "label", "score", "text"]], use_container_width=True)
+
+    stats = AggregationPipeline().run_frame(past_run_df)
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Comments", len(past_run_df))
+    col2.metric("Avg Sentiment", f"{stats['avg_sentiment']:.2f}")
+    col3.metric("Negative Ratio", f"{stats['negative_ratio']:.0%}")
+
+    st.subheader("2. Breakdowns")
+    by_topic = pd.DataFrame.from_dict(stats["by_topic"], orient="index")
+    st.dataframe(by_topic.sort_values("count", ascending=False), use_container_width=True)
+    if stats["trend"]:
+        trend = pd.DataFrame(stats["trend"]).set_index("date")
+        st.line_chart(trend[["avg_sentiment", "rolling_avg_sentiment"]])
+
+    if st.button("Generate AI Report"):
+        report_pipeline = get_report_pipeline()
+        brand_health = report_pipeline.calculate_brand_health(stats['avg_sentiment'], stats['negative_ratio'])
+        st.metric("Brand Health Score", f"{brand_health}/100")
+        goal = "Genel müşteri memnuniyeti analizi"
+        report_md = render_report_stream(report_pipeline.stream_report(brand_name, goal, stats))
+        if not report_md:
+            st.warning("Report generation returned empty content (possibly API quota).")
@@ -0,0 +1,97 @@
+"""
+Aggregation micro-benchmark: the original list/Counter implementation, the streaming
+IncrementalAggregator and the vectorized engine on synthetic processed comments.
+
+    python benchmarks/aggregation.py [--rows 1000000] [--runs 3]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from collections import Counter
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+from pipelines.aggregation_pipeline import AggregationPipeline, IncrementalAggregator, aggregate_columns
+
+TOPICS = ["kargo", "kalite", "fiyat", "hizmet", "iade", "fatura", "bağlantı", "uygulama"]
+PLATFORMS = ["sikayetvar", "twitter", "instagram"]
+
+def make_columns(rows, seed=42):
+    rng = np.random.default_rng(seed)
+    dates = np.datetime64("2026-01-01") + rng.integers(0, 90, rows)
+    return {
+        "scores": np.round(rng.uniform(-1, 1, rows), 3),
+        "topics": np.array(TOPICS, dtype=object)[rng.integers(0, len(TOPICS), rows)],
+        "platforms": np.array(PLATFORMS, dtype=object)[rng.integers(0, len(PLATFORMS), rows)],
+        "dates": np.datetime_as_string(dates).astype(object)
+    }
+
+def to_comments(columns):
+    return [
+        {"sentiment": {"score": score}, "topic": topic, "platform": platform, "date": date}
+        for score, topic, platform, date in zip(
+            columns["scores"].tolist(), columns["topics"], columns["platforms"], columns["dates"]
+        )
+    ]
+
+def legacy_run(processed_comments):
+    # The list-based AggregationPipeline.run this engine replaced
+    scores = [c["sentiment"]["score"] for c in processed_comments]
+    topics = [c["topic"] for c in processed_comments]
+    negative_count = len([s for s in scores if s < -0.2])
+    return {
+        "avg_sentiment": sum(scores) / len(scores),
+        "negative_ratio": negative_count / len(scores),
+        "top_topics": Counter(topics).most_common(5),
+        "total_comments": len(processed_comments)
+    }
+
+def incremental_run(processed_comments):
+    aggregator = IncrementalAggregator()
+    for comment in processed_comments:
+        aggregator.update(comment)
+    return aggregator.snapshot(), aggregator.breakdowns()
+
+def time_it(fn, runs):
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description="Aggregation micro-benchmark")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Synthetic processed comments")
+    parser.add_argument("--runs", type=int, default=3, help="Runs per implementation (median is reported)")
+    args = parser.parse_args()
+
+    columns = make_columns(args.rows)
+    comments = to_comments(columns)
+
+    cases = {
+        "legacy (overall stats only)": lambda: legacy_run(comments),
+        "incremental (dicts)": lambda: incremental_run(comments),
+        "vectorized (dicts)": lambda: AggregationPipeline().run(comments),
+        "vectorized (columns)": lambda: aggregate_columns(
+            columns["scores"], columns["topics"], columns["platforms"], columns["dates"]
+        ),
+    }
+
+    print(f"{args.rows:,} rows, median of {args.runs} runs")
+    for name, fn in cases.items():
+        median = time_it(fn, args.runs)
+        print(f"{name:<30} {median * 1000:9.1f} ms  {args.rows / median / 1e6:6.2f} M rows/s")
+
+    legacy = legacy_run(comments)
+    vectorized = aggregate_columns(columns["scores"], columns["topics"], columns["platforms"], columns["dates"])
+    assert vectorized["top_topics"] == legacy["top_topics"]
+    assert vectorized["negative_ratio"] == legacy["negative_ratio"]
+    assert abs(vectorized["avg_sentiment"] - legacy["avg_sentiment"]) < 1e-9
+    print("Vectorized results match the legacy implementation.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Accuracy-vs-speed comparison of the sentiment backends (torch, onnx, onnx-int8)
+on the sample comments in schemas/input_schema.json (or a scraped JSON file).
+
+Each backend runs in its own interpreter so load time and peak RSS are not mixed up.
+Agreement is measured against the torch backend.
+
+    python benchmarks/compare_backends.py [--input scraped.json] [--repeat 20]
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, PROJECT_ROOT)
+
+DEFAULT_INPUT = os.path.join(PROJECT_ROOT, "schemas", "input_schema.json")
+BACKENDS = ("torch", "onnx", "onnx-int8")
+
+def load_texts(path, repeat):
+    if path == DEFAULT_INPUT:
+        with open(path, 'r', encoding='utf-8') as f:
+            comments = json.load(f)["comments"]
+    else:
+        from services.data_loader import load_scraped_data
+        comments = load_scraped_data(path)["comments"]
+    return [c["text"] for c in comments] * repeat
+
+def run_backend(backend, texts):
+    """
+    Child mode: score all texts with one backend and report timings.
+    """
+    from services.cache import set_cache_enabled
+    from models.sentiment_model import SentimentModel
+
+    # Measure inference, not cache hits
+    set_cache_enabled(False)
+    model = SentimentModel(backend=backend)
+
+    started = time.perf_counter()
+    model.analyze_batch(texts[:1])
+    load_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    results = model.analyze_batch(texts)
+    seconds = time.perf_counter() - started
+
+    return {
+        "backend": backend,
+        "load_seconds": load_seconds,
+        "seconds": seconds,
+        "comments_per_second": len(texts) / seconds if seconds else 0.0,
+        "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "results": results
+    }
+
+def compare(reference, candidate):
+    pairs = list(zip(reference["results"], candidate["results"]))
+    agreement = sum(r["label"] == c["label"] for r, c in pairs) / len(pairs)
+    mean_abs_diff = sum(abs(r["score"] - c["score"]) for r, c in pairs) / len(pairs)
+    return agreement, mean_abs_diff
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare sentiment inference backends")
+    parser.add_argument("--input", default=DEFAULT_INPUT, help="Sample schema or scraped JSON file")
+    parser.add_argument("--repeat", type=int, default=20, help="Repeat the sample texts N times")
+    parser.add_argument("--backends", default=",".join(BACKENDS), help="Comma-separated backends to run")
+    parser.add_argument("--output", help="Optional path for the JSON summary")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    texts = load_texts(args.input, args.repeat)
+
+    if args.child:
+        print(json.dumps(run_backend(args.child, texts), ensure_ascii=False))
+        return
+
+    runs = {}
+    for backend in args.backends.split(","):
+        cmd = [sys.executable, os.path.abspath(__file__), "--child", backend,
+               "--input", args.input, "--repeat", str(args.repeat)]
+        completed = subprocess.run(cmd, cwd=PROJECT_ROOT, capture_output=True, text=True)
+        if completed.returncode != 0:
+            error_lines = completed.stderr.strip().splitlines() or ["unknown error"]
+            print(f"{backend}: failed ({error_lines[-1]})")
+            continue
+        runs[backend] = json.loads(completed.stdout.strip().splitlines()[-1])
+
+    reference = runs.get("torch")
+    summary = []
+    print(f"{len(texts)} comments")
+    print(f"{'backend':<10} {'load s':>8} {'infer s':>8} {'comm/s':>8} {'speedup':>8} {'RSS MB':>8} {'agree':>7} {'|Δscore|':>9}")
+    for backend, run in runs.items():
+        speedup = reference["seconds"] / run["seconds"] if reference and run["seconds"] else float("nan")
+        agreement, diff = compare(reference, run) if reference else (float("nan"), float("nan"))
+        print(f"{backend:<10} {run['load_seconds']:>8.2f} {run['seconds']:>8.2f} {run['comments_per_second']:>8.1f} "
+              f"{speedup:>7.2f}x {run['max_rss_mb']:>8.0f} {agreement:>7.1%} {diff:>9.4f}")
+        summary.append({
+            key: value for key, value in run.items() if key != "results"
+        } | {"speedup_vs_torch": speedup, "label_agreement": agreement, "mean_abs_score_diff": diff})
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"comments": len(texts), "backends": summary}, f, indent=2)
+        print(f"Summary saved to {args.output}")
+
+if __name__ == "__main__":
+    main()
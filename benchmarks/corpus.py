@@ -0,0 +1,67 @@
+"""
+Synthetic Turkish complaint corpora in the Şikayetvar scraper format, reproducible from a seed.
+"""
+import json
+import random
+
+SUBJECTS = [
+    "Kargom {days} gündür teslim edilmedi",
+    "Faturama haber verilmeden {amount} TL ek ücret yansıtıldı",
+    "İnternet bağlantım {days} gündür sürekli kopuyor",
+    "İade talebim {days} gün geçmesine rağmen sonuçlanmadı",
+    "Müşteri hizmetlerine {days} gündür ulaşamıyorum",
+    "Uygulamaya giriş yapamıyorum, şifre sıfırlama çalışmıyor",
+    "Ürün bozuk geldi, değişim için {days} gündür bekliyorum",
+    "Paketlerin fiyatına yine zam geldi",
+    "Teslimat çok hızlıydı, teşekkür ederim",
+    "Temsilci çok ilgiliydi, sorunum hemen çözüldü, memnun kaldım",
+]
+
+DETAILS = [
+    "Defalarca aradım ama kimse yardımcı olmadı.",
+    "Bu durum gerçekten rezalet.",
+    "Mağdur durumdayım, çözüm bekliyorum.",
+    "Daha önce böyle bir sorun yaşamamıştım.",
+    "Lütfen en kısa sürede dönüş yapın.",
+    "Asla tavsiye etmem.",
+    "Genel olarak hizmetten memnunum ama bu konu çözülmeli.",
+    "",
+]
+
+DATES = ["Bugün", "Dün", "2 saat önce", "15 Ocak", "3 Şubat", "28 Mart", "11 Nisan", "5 Mayıs"]
+
+def generate_items(count, company="ornek-firma", seed=42, duplicate_ratio=0.05):
+    """
+    Scraper-format items; about `duplicate_ratio` of them repeat an earlier complaint verbatim.
+    """
+    rng = random.Random(seed)
+    items = []
+    for i in range(count):
+        if items and rng.random() < duplicate_ratio:
+            items.append(dict(rng.choice(items), user=f"kullanici{i}"))
+            continue
+        subject = rng.choice(SUBJECTS).format(days=rng.randint(2, 30), amount=rng.randint(50, 900))
+        detail = " ".join(rng.sample(DETAILS, rng.randint(1, 3))).strip()
+        items.append({
+            "company": company,
+            "text": f"{subject}. {detail} Şikayet no: {i}".strip(),
+            "user": f"kullanici{i}",
+            "date": rng.choice(DATES)
+        })
+    return items
+
+def generate_comments(count, seed=42):
+    """
+    Comments in the pipeline's input schema.
+    """
+    platforms = ["sikayetvar", "twitter", "instagram"]
+    rng = random.Random(seed + 1)
+    return [
+        {"id": i + 1, "text": item["text"], "platform": rng.choice(platforms), "date": f"2026-01-{rng.randint(1, 28):02d}"}
+        for i, item in enumerate(generate_items(count, seed=seed))
+    ]
+
+def write_scraped_file(path, count, seed=42):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(generate_items(count, seed=seed), f, ensure_ascii=False)
+    return path
@@ -0,0 +1,69 @@
+"""
+Cold-start benchmark: times fresh interpreter runs of commands that do not need
+inference and checks that no heavy ML/LLM SDK was imported along the way.
+
+    python benchmarks/import_time.py [--runs 5] [--budget 0.5]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+HEAVY_MODULES = ["transformers", "torch", "google.generativeai", "openai", "httpx", "streamlit"]
+
+COMMANDS = {
+    "main --help": [sys.executable, "main.py", "--help"],
+    "import main": [sys.executable, "-c", "import main"],
+    "import pipelines": [
+        sys.executable, "-c",
+        "import pipelines.sentiment_pipeline, pipelines.aggregation_pipeline, pipelines.report_pipeline"
+    ],
+}
+
+def time_command(cmd, runs):
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run(cmd, cwd=PROJECT_ROOT, check=True, stdout=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - started)
+    return timings
+
+def heavy_modules_loaded():
+    probe = (
+        "import sys, json, main, pipelines.report_pipeline;"
+        f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+    )
+    output = subprocess.run([sys.executable, "-c", probe], cwd=PROJECT_ROOT, check=True,
+                            capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold start / import time benchmark")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreter runs per command")
+    parser.add_argument("--budget", type=float, default=0.5, help="Max median seconds per command")
+    args = parser.parse_args()
+
+    failed = False
+    for name, cmd in COMMANDS.items():
+        timings = time_command(cmd, args.runs)
+        median = statistics.median(timings)
+        status = "OK" if median <= args.budget else "OVER BUDGET"
+        failed |= median > args.budget
+        print(f"{name:<20} median {median * 1000:7.1f} ms  min {min(timings) * 1000:7.1f} ms  [{status}]")
+
+    loaded = heavy_modules_loaded()
+    if loaded:
+        failed = True
+        print(f"Heavy modules imported eagerly: {', '.join(loaded)}")
+    else:
+        print("No heavy modules imported at startup.")
+
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Deterministic offline stand-ins for the sentiment model and the LLM clients, with
+configurable latency, so pipelines can be tested and benchmarked without model
+downloads or API keys. install_stubs() swaps them in through the service registry.
+"""
+import json
+import re
+import time
+import zlib
+from services import registry
+
+NEGATIVE_WORDS = ("rezalet", "berbat", "gecikti", "kötü", "bozuk", "ulaşamıyorum", "iade", "mağdur", "asla")
+POSITIVE_WORDS = ("harika", "memnun", "teşekkür", "hızlı", "beğendim", "güzel", "başarılı")
+
+TOPIC_KEYWORDS = {
+    "kargo": ("kargo", "teslimat", "paket"),
+    "fatura": ("fatura", "ücret", "ödeme"),
+    "bağlantı": ("internet", "bağlantı", "hat", "çekmiyor"),
+    "iade": ("iade", "geri ödeme"),
+    "fiyat": ("fiyat", "pahalı", "zam"),
+    "hizmet": ("müşteri hizmetleri", "temsilci", "çağrı"),
+    "uygulama": ("uygulama", "şifre", "giriş"),
+}
+
+NUMBERED_LINE_RE = re.compile(r'^(\d+)\. "(.*)"$', re.MULTILINE)
+SINGLE_COMMENT_RE = re.compile(r'Yorum: "(.*)"', re.DOTALL)
+
+def stub_topic(text):
+    lowered = text.lower()
+    for topic, keywords in TOPIC_KEYWORDS.items():
+        if any(keyword in lowered for keyword in keywords):
+            return topic
+    return "kalite"
+
+def stub_sentiment(text):
+    """
+    Lexicon score in [-1, 1]; texts without cue words get a stable hash-based score.
+    """
+    lowered = text.lower()
+    negative = sum(word in lowered for word in NEGATIVE_WORDS)
+    positive = sum(word in lowered for word in POSITIVE_WORDS)
+    if negative or positive:
+        score = (positive - negative) / (positive + negative)
+    else:
+        score = (zlib.crc32(text.encode("utf-8")) % 2001 - 1000) / 1000
+    score = round(score, 3)
+    return {
+        "label": "positive" if score >= 0 else "negative",
+        "score": score,
+        "confidence": round(abs(score), 3)
+    }
+
+class StubSentimentModel:
+    """
+    SentimentModel stand-in: `batch_latency` per analyze_batch call plus `item_latency` per text.
+    """
+    def __init__(self, item_latency=0.0, batch_latency=0.0):
+        self.item_latency = item_latency
+        self.batch_latency = batch_latency
+
+    def analyze_batch(self, texts, batch_size=None):
+        delay = self.batch_latency + self.item_latency * len(texts)
+        if delay:
+            time.sleep(delay)
+        return [stub_sentiment(text) for text in texts]
+
+    def analyze(self, text):
+        return self.analyze_batch([text])[0]
+
+class StubGeminiClient:
+    """
+    GeminiClient stand-in answering single and batched topic prompts by keyword.
+    """
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.calls = 0
+
+    def generate_content(self, prompt):
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        numbered = NUMBERED_LINE_RE.findall(prompt)
+        if numbered:
+            return json.dumps({number: stub_topic(text) for number, text in numbered}, ensure_ascii=False)
+        single = SINGLE_COMMENT_RE.search(prompt)
+        return stub_topic(single.group(1)) if single else "diğer"
+
+REPORT_TEMPLATE = """# 📊 Detaylı Müşteri İçgörü Raporu
+
+## 1. Yönetici Özeti
+Bu rapor çevrimdışı test istemcisi tarafından üretildi ({length} karakterlik istem).
+
+## 2. Duygu ve Memnuniyet Analizi
+*   **Genel Görünüm:** Deterministik örnek içerik.
+
+## 3. Stratejik Tavsiyeler
+*   **Tavsiye 1:** Kargo süreçlerini iyileştirin.
+*   **Tavsiye 2:** Müşteri hizmetlerine erişimi kolaylaştırın.
+*   **Tavsiye 3:** Fatura itirazlarını hızlandırın.
+"""
+
+class StubLLMService:
+    """
+    LLMService stand-in: a fixed markdown report after `latency` seconds, streamed in
+    `chunks` pieces with `first_chunk_latency` before the first one.
+    """
+    def __init__(self, latency=0.0, first_chunk_latency=0.0, chunks=8):
+        self.latency = latency
+        self.first_chunk_latency = first_chunk_latency
+        self.chunks = chunks
+
+    def generate_content(self, prompt):
+        if self.latency:
+            time.sleep(self.latency)
+        return REPORT_TEMPLATE.format(length=len(prompt))
+
+    def stream_content(self, prompt):
+        report = REPORT_TEMPLATE.format(length=len(prompt))
+        if self.first_chunk_latency:
+            time.sleep(self.first_chunk_latency)
+        size = -(-len(report) // self.chunks)
+        rest_delay = max(0.0, self.latency - self.first_chunk_latency) / self.chunks
+        for start in range(0, len(report), size):
+            if start and rest_delay:
+                time.sleep(rest_delay)
+            yield report[start:start + size]
+
+def install_stubs(sentiment_item_latency=0.0, sentiment_batch_latency=0.0,
+                  topic_latency=0.0, report_latency=0.0, report_first_chunk_latency=0.0):
+    """
+    Registers the stubs as the process-wide sentiment model, Gemini client and LLM service.
+    Undo with registry.reset().
+    """
+    stubs = {
+        "sentiment_model": StubSentimentModel(sentiment_item_latency, sentiment_batch_latency),
+        "gemini_client": StubGeminiClient(topic_latency),
+        "llm_service": StubLLMService(report_latency, report_first_chunk_latency),
+    }
+    for name, stub in stubs.items():
+        registry.register(name, stub)
+    return stubs
@@ -0,0 +1,237 @@
+"""
+Offline benchmark suite: synthetic Turkish corpora at several sizes, deterministic stubs
+in place of the sentiment model, Gemini and the report LLM, and per-stage plus end-to-end
+(main.main) throughput, latency and memory. Results go to a JSON file that can be
+compared against an earlier run to catch regressions.
+
+    python benchmarks/suite.py [--sizes 1000 10000 100000] [--runs 3] [--output results.json]
+                               [--baseline previous.json] [--tolerance 0.2]
+
+Stub latencies (per sentiment batch, per topic prompt, per report) are configurable, so the
+suite can model slow providers while staying deterministic and free of network access.
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(PROJECT_ROOT)
+
+from benchmarks.corpus import generate_comments, write_scraped_file
+from benchmarks.stubs import install_stubs
+from services.cache import set_cache_enabled
+from services.instrumentation import get_instrumentation
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_stages(comments):
+    """
+    Runs sentiment/topics, aggregation and report generation in-process.
+    Returns the instrumentation summary for the run.
+    """
+    from pipelines.sentiment_pipeline import SentimentPipeline
+    from pipelines.aggregation_pipeline import AggregationPipeline
+    from pipelines.report_pipeline import ReportPipeline
+
+    instrumentation = get_instrumentation()
+    instrumentation.reset()
+
+    pipeline = SentimentPipeline(topic_mode="llm")
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        processed = pipeline.run(comments)
+
+    with instrumentation.stage("aggregation", len(processed)):
+        stats = AggregationPipeline().run(processed)
+
+    report_pipeline = ReportPipeline()
+    started = time.perf_counter()
+    chunks = []
+    for chunk in report_pipeline.stream_report("Benchmark", "Performans ölçümü", stats):
+        if not chunks:
+            instrumentation.gauge("report_first_chunk_seconds", time.perf_counter() - started)
+        chunks.append(chunk)
+    instrumentation.observe("report", time.perf_counter() - started, 1)
+    report_pipeline.build_output("".join(chunks), stats)
+
+    return instrumentation.summary()
+
+def run_end_to_end(scraped_path, workdir):
+    """
+    Runs main.main on a scraped-format file; main writes report.md into the working directory.
+    """
+    from main import main
+
+    get_instrumentation().reset()
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        started = time.perf_counter()
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            main(["--scraped-data", scraped_path, "--output", "output.json", "--no-cache", "--metrics"])
+        return time.perf_counter() - started
+    finally:
+        os.chdir(cwd)
+
+def traced_peak(func, *args):
+    """
+    Peak Python heap allocation (tracemalloc) while running func. Done in a separate
+    pass because tracing slows allocation-heavy code several times over.
+    """
+    tracemalloc.start()
+    try:
+        func(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def stage_results(summaries):
+    """
+    Median over runs of each stage's wall time and throughput, plus per-item latency percentiles.
+    """
+    stages = {}
+    for name in summaries[0]["stages"]:
+        runs = [s["stages"][name] for s in summaries if name in s["stages"]]
+        stages[name] = {
+            "wall_seconds": statistics.median(r["wall_seconds"] for r in runs),
+            "items": runs[0]["items"],
+            "items_per_second": statistics.median(r["items_per_second"] or 0 for r in runs),
+            "item_latency_seconds": runs[-1]["item_latency_seconds"]
+        }
+    return stages
+
+def benchmark_size(size, runs, seed, workdir, trace_memory):
+    comments = generate_comments(size, seed=seed)
+    scraped_path = write_scraped_file(os.path.join(workdir, f"corpus_{size}.json"), size, seed=seed)
+
+    summaries = [run_stages(comments) for _ in range(runs)]
+    end_to_end = [run_end_to_end(scraped_path, workdir) for _ in range(runs)]
+    with open(os.path.join(workdir, "output.metrics.json")) as f:
+        main_metrics = json.load(f)
+
+    result = {
+        "size": size,
+        "stages": stage_results(summaries),
+        "report_first_chunk_seconds": statistics.median(
+            s["gauges"].get("report_first_chunk_seconds", 0) for s in summaries
+        ),
+        "end_to_end": {
+            "wall_seconds": statistics.median(end_to_end),
+            "items_per_second": size / statistics.median(end_to_end),
+            "stages": {name: s["wall_seconds"] for name, s in main_metrics["stages"].items()}
+        },
+        "peak_rss_bytes": main_metrics["peak_rss_bytes"]
+    }
+    if trace_memory:
+        result["traced_peak_bytes"] = {
+            "stages": traced_peak(run_stages, comments),
+            "end_to_end": traced_peak(run_end_to_end, scraped_path, workdir)
+        }
+    return result
+
+def compare(results, baseline, tolerance, min_delta):
+    """
+    Lists timings that got slower than the baseline by more than `tolerance` (a fraction)
+    and by at least `min_delta` seconds, so sub-millisecond stages do not flag on noise.
+    """
+    previous = {entry["size"]: entry for entry in baseline["results"]}
+    regressions = []
+    for entry in results:
+        before = previous.get(entry["size"])
+        if before is None:
+            continue
+        pairs = [("end_to_end", before["end_to_end"]["wall_seconds"], entry["end_to_end"]["wall_seconds"])]
+        pairs += [
+            (name, before["stages"][name]["wall_seconds"], stage["wall_seconds"])
+            for name, stage in entry["stages"].items() if name in before["stages"]
+        ]
+        for name, old, new in pairs:
+            if new > old * (1 + tolerance) and new - old >= min_delta:
+                regressions.append({"size": entry["size"], "metric": name, "baseline": old, "current": new})
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline pipeline benchmark suite")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Corpus sizes to benchmark")
+    parser.add_argument("--runs", type=int, default=3, help="Timed runs per size (medians are reported)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--sentiment-batch-latency", type=float, default=0.0, help="Stub seconds per sentiment batch call")
+    parser.add_argument("--sentiment-item-latency", type=float, default=0.0, help="Stub seconds per scored text")
+    parser.add_argument("--topic-latency", type=float, default=0.0, help="Stub seconds per topic prompt")
+    parser.add_argument("--report-latency", type=float, default=0.0, help="Stub seconds per report")
+    parser.add_argument("--min-delta", type=float, default=0.005, help="Ignore slowdowns smaller than this many seconds")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc pass")
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--baseline", help="Earlier results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed slowdown vs. the baseline (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    latencies = {
+        "sentiment_item_latency": args.sentiment_item_latency,
+        "sentiment_batch_latency": args.sentiment_batch_latency,
+        "topic_latency": args.topic_latency,
+        "report_latency": args.report_latency
+    }
+    install_stubs(**latencies)
+    # Cached results from an earlier run would make every run after the first a lookup benchmark
+    set_cache_enabled(False)
+    get_instrumentation().enabled = True
+
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        # Warm-up: lazy imports (pandas, numpy) would otherwise land in the first size's timings
+        run_stages(generate_comments(100, seed=args.seed))
+        for size in args.sizes:
+            print(f"Benchmarking {size} comments...")
+            entry = benchmark_size(size, args.runs, args.seed, workdir, not args.no_memory)
+            results.append(entry)
+            for name, stage in entry["stages"].items():
+                print(f"  {name:<12} {stage['wall_seconds']:8.3f}s {stage['items_per_second']:12.0f} items/s")
+            print(f"  {'end-to-end':<12} {entry['end_to_end']['wall_seconds']:8.3f}s "
+                  f"{entry['end_to_end']['items_per_second']:12.0f} items/s")
+
+    output = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "runs": args.runs,
+            "seed": args.seed,
+            "stub_latencies": latencies
+        },
+        "results": results
+    }
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        output["regressions"] = compare(results, baseline, args.tolerance, args.min_delta)
+
+    with open(args.output, "w") as f:
+        json.dump(output, f, indent=2)
+    print(f"Results saved to {args.output}")
+
+    if output.get("regressions"):
+        for r in output["regressions"]:
+            print(f"Regression: {r['metric']} at {r['size']} comments: {r['baseline']:.3f}s -> {r['current']:.3f}s")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
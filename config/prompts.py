@@ -43,3 +43,13 @@ Acil çözüm bekleyen en önemli 3 sorunu belirle ve neden kritik olduklarını
 
 **Not:** Rapor dilin profesyonel, yapıcı ve çözüm odaklı olsun.
 """
+
+BATCH_TOPIC_EXTRACTION_PROMPT = """
+Aşağıdaki numaralandırılmış yorumların her birini TEK bir ana konu ile etiketle.
+Konu adı kısa olmalı (örneğin: kargo, kalite, fiyat, hizmet).
+Sadece JSON nesnesi döndür; anahtar yorum numarası, değer konu adı olsun.
+Örnek: {{"1": "kargo", "2": "fiyat"}}
+
+Yorumlar:
+{comments}
+"""
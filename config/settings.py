@@ -0,0 +1,23 @@
+import os
+import logging
+from functools import lru_cache
+import yaml
+
+logger = logging.getLogger(__name__)
+
+SETTINGS_PATH = os.path.join(os.path.dirname(__file__), 'settings.yaml')
+
+@lru_cache(maxsize=None)
+def get_settings():
+    """
+    Loads .env and settings.yaml once per process; all modules share the result.
+    """
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    try:
+        with open(SETTINGS_PATH, 'r') as f:
+            return yaml.safe_load(f) or {}
+    except Exception as e:
+        logger.error(f"Failed to load settings.yaml: {e}")
+        return {}
@@ -1,13 +1,18 @@
 import os
+import json
 import sys
 import subprocess
 import argparse
 import logging
+import time
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
 
+# Per-company history (seen complaints + merged aggregates) for --incremental runs
+HISTORY_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".state", "history")
+
 def run_scraper(company, max_items, output_file):
     """
     Runs the web scraper script located in 'web scraping /main.py'.
@@ -48,50 +53,138 @@ def run_scraper(company, max_items, output_file):
         logger.error(f"Error running scraper: {e}")
         return False
 
-def main():
-    parser = argparse.ArgumentParser(description="Full Sentiment Intelligence Pipeline")
-    parser.add_argument("--company", required=True, help="Company slug to scrape (e.g., 'turk-telekom')")
-    parser.add_argument("--max", type=int, default=10, help="Max items to scrape")
-    args = parser.parse_args()
-    
-    # 1. Scrape Data
-    logger.info(">>> STEP 1: Starting Web Scraping...")
-    # We'll save the scraped data to a temporary location or just straight to the web scraping dir
-    scraped_file_name = f"{args.company}_latest.json"
-    # Note: The scraper script saves relative to its CWD.
-    
-    if not run_scraper(args.company, args.max, scraped_file_name):
-        logger.error("Aborting pipeline due to scraper failure.")
-        return
+def is_fresh(path, max_age_minutes):
+    """
+    True if `path` was written less than `max_age_minutes` ago and holds a non-empty
+    JSON list of scraped items. Empty or unparsable files are always stale.
+    """
+    if max_age_minutes <= 0 or not os.path.exists(path):
+        return False
+    if time.time() - os.path.getmtime(path) >= max_age_minutes * 60:
+        return False
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            items = json.load(f)
+    except (OSError, ValueError):
+        return False
+    return isinstance(items, list) and len(items) > 0
 
-    # The file should now exist in 'web scraping /' directory
-    scraped_file_path = os.path.join("web scraping ", scraped_file_name)
-    
-    if not os.path.exists(scraped_file_path):
-        logger.error(f"Expected scraped file not found at {scraped_file_path}")
-        return
+def run_multi_scraper(companies, max_items, concurrency=4, state_dir=None):
+    """
+    Scrapes several companies in one headless browser with 'web scraping /async_scraper.py'.
+    Each company is saved to 'web scraping /<company>_latest.json'.
+    With `state_dir` only complaints missing from the companies' history are scraped.
+    """
+    scraper_dir = os.path.join(os.getcwd(), "web scraping ")
+    scraper_script = os.path.join(scraper_dir, "async_scraper.py")
+
+    scraper_venv_python = os.path.join(scraper_dir, ".venv", "bin", "python")
+    python_executable = scraper_venv_python if os.path.exists(scraper_venv_python) else sys.executable
+
+    cmd = [
+        python_executable,
+        scraper_script,
+        "--companies", *companies,
+        "--max", str(max_items),
+        "--concurrency", str(concurrency)
+    ]
+    if state_dir:
+        cmd += ["--state-dir", state_dir]
+
+    logger.info(f"Running scraper command: {' '.join(cmd)}")
+
+    try:
+        subprocess.run(cmd, check=True, cwd=scraper_dir)
+        logger.info("Scraping completed successfully.")
+        return True
+    except subprocess.CalledProcessError as e:
+        logger.error(f"Scraper failed with exit code {e.returncode}")
+        return False
+    except Exception as e:
+        logger.error(f"Error running scraper: {e}")
+        return False
+
+def run_analysis_for(company, scraped_file_path, resume=False, incremental=False, metrics=False, pdf=False):
+    logger.info(f">>> Starting Sentiment Analysis Pipeline for {company}...")
 
-    # 2. Run Analysis Pipeline
-    logger.info(">>> STEP 2: Starting Sentiment Analysis Pipeline...")
-    
     # Import main module dynamically to avoid running it on import (though we fixed that)
     # But running it via function call is cleaner
     try:
         from main import main as run_analysis
-        
+
         # Prepare arguments for the main pipeline
         analysis_args = [
             "--scraped-data", scraped_file_path,
-            "--output", f"{args.company}_report.json"
+            "--output", f"{company}_report.json"
         ]
-        
+        if resume:
+            analysis_args.append("--resume")
+        if incremental:
+            analysis_args += ["--history-state", os.path.join(HISTORY_DIR, f"{company}.json")]
+        if metrics:
+            analysis_args.append("--metrics")
+        if pdf:
+            analysis_args += ["--pdf", f"{company}_report.pdf"]
+
         run_analysis(analysis_args)
-        logger.info(">>> Pipeline completed successfully.")
-        
+        logger.info(f">>> Pipeline completed successfully for {company}.")
+
     except ImportError:
         logger.error("Could not import main pipeline script.")
     except Exception as e:
-        logger.error(f"Error during analysis pipeline: {e}")
+        logger.error(f"Error during analysis pipeline for {company}: {e}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Full Sentiment Intelligence Pipeline")
+    parser.add_argument("--company", required=True, nargs="+", help="Company slug(s) to scrape (e.g., 'turk-telekom')")
+    parser.add_argument("--max", type=int, default=10, help="Max items to scrape per company")
+    parser.add_argument("--concurrency", type=int, default=4, help="Companies scraped in parallel (one browser context each)")
+    parser.add_argument("--max-age", type=float, default=60, help="Reuse an existing scrape file younger than this many minutes (0 = always scrape)")
+    parser.add_argument("--resume", action="store_true", help="Resume the analysis from its checkpoint journal")
+    parser.add_argument("--metrics", action="store_true", help="Record stage timings; each <company>_report.metrics.json covers the run so far, scraping included")
+    parser.add_argument("--pdf", action="store_true", help="Also write <company>_report.pdf for each company")
+    parser.add_argument("--incremental", action="store_true", help="Scrape and analyze only complaints not seen in earlier runs, merging them into the stored history")
+    args = parser.parse_args()
+
+    # 1. Scrape Data
+    logger.info(">>> STEP 1: Starting Web Scraping...")
+    # Note: The scrapers save relative to their CWD, the 'web scraping /' directory
+    scraped_files = {
+        company: os.path.join("web scraping ", f"{company}_latest.json")
+        for company in args.company
+    }
+
+    stale = []
+    for company, path in scraped_files.items():
+        if is_fresh(path, args.max_age):
+            logger.info(f"Reusing scrape file {path} (younger than {args.max_age:g} minutes).")
+        else:
+            stale.append(company)
+
+    instrumentation = None
+    if args.metrics:
+        from services.instrumentation import get_instrumentation
+        instrumentation = get_instrumentation()
+        instrumentation.enabled = True
+
+    state_dir = HISTORY_DIR if args.incremental else None
+    scrape_started = time.perf_counter()
+    # One headless browser with a pool of contexts instead of a process per company
+    scraped = not stale or run_multi_scraper(stale, args.max, args.concurrency, state_dir)
+    if instrumentation and stale:
+        instrumentation.observe("scraping", time.perf_counter() - scrape_started, len(stale))
+    if not scraped:
+        logger.error("Aborting pipeline due to scraper failure.")
+        return
+
+    # 2. Run Analysis Pipeline
+    logger.info(">>> STEP 2: Starting Sentiment Analysis Pipeline...")
+    for company, scraped_file_path in scraped_files.items():
+        # The file should now exist in 'web scraping /' directory
+        if not os.path.exists(scraped_file_path):
+            logger.error(f"Expected scraped file not found at {scraped_file_path}")
+            continue
+        run_analysis_for(company, scraped_file_path, args.resume, args.incremental, args.metrics, args.pdf)
 
 if __name__ == "__main__":
     main()
@@ -1,9 +1,12 @@
 import json
 import os
 import argparse
-from pipelines.sentiment_pipeline import SentimentPipeline
-from pipelines.aggregation_pipeline import AggregationPipeline
+import itertools
+import time
+from pipelines.sentiment_pipeline import SentimentPipeline, TOPIC_MODE, WORKER_CHUNK_SIZE
+from pipelines.aggregation_pipeline import IncrementalAggregator
 from pipelines.report_pipeline import ReportPipeline
+from services.instrumentation import get_instrumentation
 
 def load_input(file_path):
     with open(file_path, 'r') as f:
@@ -19,15 +22,38 @@ def main(args_list=None):
     parser.add_argument("--input", default="schemas/input_schema.json", help="Path to input JSON file")
     parser.add_argument("--scraped-data", help="Path to scraped JSON file (e.g., 'web scraping /turk_telekom_sikayetler.json')")
     parser.add_argument("--output", default="output.json", help="Path to output JSON file")
+    parser.add_argument("--async-llm", action="store_true", help="Send LLM requests concurrently with the async client (rate limited per provider)")
+    parser.add_argument("--topic-mode", choices=["llm", "embedding"], help="Topic extraction mode (default: topics.mode in settings.yaml)")
+    parser.add_argument("--workers", type=int, default=1, help="Sentiment worker processes (1 = score in this process)")
+    parser.add_argument("--chunk-size", type=int, default=WORKER_CHUNK_SIZE, help="Comments per task sent to a sentiment worker (rounded up to whole topic batches)")
+    parser.add_argument("--dedup", action="store_true", help="Score one representative per (near-)duplicate cluster and reuse its result")
+    parser.add_argument("--comments-output", help="Write per-comment results to this Parquet file while processing")
+    parser.add_argument("--checkpoint", help="Journal of processed comments (default: <output>.checkpoint.jsonl)")
+    parser.add_argument("--resume", action="store_true", help="Skip comments already processed in the checkpoint journal")
+    parser.add_argument("--history-state", help="Per-company history file: skip complaints analyzed before and merge new results into it")
+    parser.add_argument("--metrics", action="store_true", help="Record per-stage timings and write a run summary next to the output (<output>.metrics.json)")
+    parser.add_argument("--metrics-prom", help="Also write the run summary in Prometheus text format to this path")
+    parser.add_argument("--pdf", help="Also render the report and key metrics to this PDF file")
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the local LLM response and sentiment caches")
     args = parser.parse_args(args_list)
 
+    if args.no_cache:
+        from services.cache import set_cache_enabled
+        set_cache_enabled(False)
+
+    instrumentation = get_instrumentation()
+    if args.metrics or args.metrics_prom:
+        instrumentation.enabled = True
+
     # Load input
+    load_started = time.perf_counter()
     input_data = {}
     
     if args.scraped_data:
         print(f"Loading scraped data from {args.scraped_data}...")
-        from services.data_loader import load_scraped_data
-        scraped_data = load_scraped_data(args.scraped_data)
+        from services.data_loader import stream_scraped_data
+        # Comments are parsed lazily so large dumps are never fully loaded
+        scraped_data = stream_scraped_data(args.scraped_data)
         if scraped_data:
              # Merge with default schema/overrides if needed
              # For now, we take the scraped comments and inferred brand
@@ -45,45 +71,174 @@ def main(args_list=None):
 
     brand = input_data.get("brand", "Unknown Brand")
     goal = input_data.get("company_goal", "Genel Analiz")
-    comments = input_data.get("comments", [])
+    comments = iter(input_data.get("comments", []))
+
+    history = None
+    new_fingerprints = []
+    if args.history_state:
+        from services.history import CompanyHistory, comment_fingerprint
+        try:
+            history = CompanyHistory(args.history_state)
+        except ValueError as e:
+            print(f"Error: {e}")
+            return
+
+        def unseen(items):
+            # Only the delta since the last run is analyzed
+            for comment in items:
+                fingerprint = comment_fingerprint(comment)
+                if fingerprint not in history.seen:
+                    new_fingerprints.append(fingerprint)
+                    yield comment
 
-    if not comments:
-        print("No comments found in input.")
-        return
+        comments = unseen(comments)
+
+    first_comment = next(comments, None)
+    # Input is streamed, so this is the time to the first comment; later parsing overlaps analysis
+    instrumentation.observe("load", time.perf_counter() - load_started)
+    if first_comment is None:
+        if not history or not history.seen:
+            print("No comments found in input.")
+            return
+        print("No new comments since the last run; reporting on stored history.")
+    else:
+        comments = itertools.chain([first_comment], comments)
 
     # Initialize pipelines
-    sentiment_pipeline = SentimentPipeline()
-    aggregation_pipeline = AggregationPipeline()
-    report_pipeline = ReportPipeline()
+    sentiment_pipeline = SentimentPipeline(
+        topic_mode=args.topic_mode or TOPIC_MODE,
+        use_async=args.async_llm,
+        workers=args.workers,
+        chunk_size=args.chunk_size
+    )
+    aggregator = IncrementalAggregator()
+    report_pipeline = ReportPipeline(use_async=args.async_llm)
+
+    # Every processed comment is journaled so a crashed or quota-limited run can be resumed
+    from services.cache import make_key
+    from services.checkpoint import CheckpointJournal, comment_key
+    from models import sentiment_model
+    signature = make_key(
+        sentiment_model.SENTIMENT_MODEL_NAME,
+        sentiment_model.SENTIMENT_BACKEND,
+        sentiment_model.SENTIMENT_MAX_LENGTH,
+        sentiment_model.SENTIMENT_CHUNK_LONG_TEXTS,
+        sentiment_pipeline.topic_mode
+    )
+    journal = CheckpointJournal(args.checkpoint or f"{args.output}.checkpoint.jsonl", signature)
+    if args.resume:
+        journal.load()
+    journal.open(resume=args.resume)
+
+    # 1. Sentiment & Topic Analysis, 2. Aggregation
+    # Results are folded into the aggregator as they stream out; no per-comment list is kept
+    print("Running Sentiment & Aggregation Pipelines...")
+    analysis_started = time.perf_counter()
+    result_writer = None
+    if args.comments_output:
+        from services.result_writer import ParquetResultWriter
+        result_writer = ParquetResultWriter(args.comments_output)
 
-    # 1. Sentiment & Topic Analysis
-    print("Running Sentiment Pipeline...")
-    processed_comments = sentiment_pipeline.run(comments)
+    def pending(items, handle_done):
+        # Journaled comments are folded in directly; only the rest reach the models
+        for comment in items:
+            done = journal.get(comment)
+            if done is None:
+                yield comment
+            else:
+                handle_done(comment, done)
 
-    # 2. Aggregation
-    print("Running Aggregation Pipeline...")
-    stats = aggregation_pipeline.run(processed_comments)
+    try:
+        if args.dedup:
+            from services.deduplication import Deduplicator, fan_out, weighted_members
+            # Clustering needs every comment's text, so this mode holds the comment list in memory
+            clusters = Deduplicator().cluster(comments)
+            clusters_by_key = {comment_key(cluster[0]): cluster for cluster in clusters}
+
+            def handle_cluster(representative, processed):
+                cluster = clusters_by_key[comment_key(representative)]
+                for member_result, weight in weighted_members(processed, cluster):
+                    aggregator.update(member_result, weight=weight)
+                if result_writer:
+                    result_writer.write_many(fan_out(processed, cluster))
+
+            representatives = (cluster[0] for cluster in clusters)
+            for processed in sentiment_pipeline.iter_run(pending(representatives, handle_cluster)):
+                handle_cluster(processed, processed)
+                journal.record(processed)
+        else:
+            def handle_comment(comment, processed):
+                aggregator.update(processed)
+                if result_writer:
+                    result_writer.write(processed)
+
+            for processed in sentiment_pipeline.iter_run(pending(comments, handle_comment)):
+                handle_comment(processed, processed)
+                journal.record(processed)
+    finally:
+        sentiment_pipeline.close()
+        journal.close()
+        if result_writer:
+            result_writer.close()
+            print(f"Per-comment results saved to {args.comments_output}")
+    instrumentation.observe("analysis", time.perf_counter() - analysis_started, aggregator.overall.count)
+
+    with instrumentation.stage("aggregation"):
+        if history:
+            history.commit(aggregator, new_fingerprints)
+            print(f"History updated: {len(new_fingerprints)} new, {len(history.seen)} complaints in total.")
+            aggregator = history.aggregator
+        stats = aggregator.report_stats()
     print(f"Stats: Avg Sentiment: {stats['avg_sentiment']:.2f}, Negative Ratio: {stats['negative_ratio']:.2f}")
 
     # 3. Report Generation
+    # The report is printed and written to report.md chunk by chunk as the LLM streams it
     print("Generating Report with Gemini...")
-    final_report = report_pipeline.run(brand, goal, stats)
+    chunks = []
+    report_file = None
+    report_started = time.perf_counter()
+    try:
+        for chunk in report_pipeline.stream_report(brand, goal, stats):
+            if report_file is None:
+                instrumentation.gauge("report_first_chunk_seconds", time.perf_counter() - report_started)
+                report_file = open("report.md", "w")
+                print("\n--- Report ---")
+            report_file.write(chunk)
+            report_file.flush()
+            print(chunk, end="", flush=True)
+            chunks.append(chunk)
+    finally:
+        if report_file is not None:
+            report_file.close()
+        instrumentation.observe("report", time.perf_counter() - report_started)
+
+    if chunks:
+        print("\n----------------------")
+        print("Report saved to report.md")
+
+    final_report = report_pipeline.build_output("".join(chunks), stats)
 
     # Save Output JSON
     save_output(final_report, args.output)
-    
-    # Save formatted markdown report
-    report_content = final_report.get("report_markdown", "")
-    if report_content:
-        with open("report.md", "w") as f:
-            f.write(report_content)
-        print("Report saved to report.md")
-        print("\n--- Report Preview ---")
-        print(report_content[:500] + "...\n(See report.md for full content)")
-        print("----------------------")
-    else:
+
+    if not chunks:
         print("Warning: No markdown report content generated.")
+    elif args.pdf:
+        from services.pdf_renderer import get_pdf_renderer
+        with instrumentation.stage("pdf_export", 1):
+            pdf_bytes = get_pdf_renderer().render(final_report["report_markdown"], stats)
+        with open(args.pdf, 'wb') as f:
+            f.write(pdf_bytes)
+        print(f"PDF report saved to {args.pdf}")
 
+    if instrumentation.enabled:
+        summary = instrumentation.summary()
+        metrics_path = os.path.splitext(args.output)[0] + ".metrics.json"
+        instrumentation.write_json(metrics_path, summary)
+        print(f"Run metrics saved to {metrics_path}")
+        if args.metrics_prom:
+            instrumentation.write_prometheus(args.metrics_prom, summary)
+            print(f"Prometheus metrics saved to {args.metrics_prom}")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,77 @@
+import os
+import shutil
+from config.settings import get_settings
+
+# Load config
+config = get_settings()
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+ONNX_CACHE_DIR = os.path.join(PROJECT_ROOT, config['sentiment'].get('onnx_cache_dir', '.cache/onnx'))
+
+ONNX_FILE_NAME = "model.onnx"
+QUANTIZED_FILE_NAME = "model_quantized.onnx"
+
+def export_dir_for(model_name):
+    return os.path.join(ONNX_CACHE_DIR, model_name.replace('/', '__'))
+
+def export_model(model_name):
+    """
+    Exports the HF model to ONNX once; later calls reuse the cached export.
+    """
+    export_dir = export_dir_for(model_name)
+    if os.path.exists(os.path.join(export_dir, ONNX_FILE_NAME)):
+        return export_dir
+
+    from optimum.onnxruntime import ORTModelForSequenceClassification
+    from transformers import AutoTokenizer
+
+    print(f"Exporting {model_name} to ONNX (one-time) into {export_dir}...")
+    tmp_dir = export_dir + ".tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    model = ORTModelForSequenceClassification.from_pretrained(model_name, export=True)
+    model.save_pretrained(tmp_dir)
+    AutoTokenizer.from_pretrained(model_name).save_pretrained(tmp_dir)
+    # Rename last so an interrupted export is never mistaken for a finished one
+    os.replace(tmp_dir, export_dir)
+    return export_dir
+
+def quantize_model(export_dir):
+    """
+    Dynamic int8 quantization of the exported graph (weights int8, activations quantized at runtime).
+    """
+    quantized_path = os.path.join(export_dir, QUANTIZED_FILE_NAME)
+    if not os.path.exists(quantized_path):
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        print(f"Quantizing {export_dir} to int8 (one-time)...")
+        tmp_path = quantized_path + ".tmp"
+        quantize_dynamic(
+            os.path.join(export_dir, ONNX_FILE_NAME),
+            tmp_path,
+            weight_type=QuantType.QInt8
+        )
+        os.replace(tmp_path, quantized_path)
+    return quantized_path
+
+def load_onnx_pipeline(model_name, quantized=False):
+    """
+    Builds a transformers text-classification pipeline backed by ONNX Runtime,
+    so batching and label handling are the same as the torch backend.
+    """
+    try:
+        from optimum.onnxruntime import ORTModelForSequenceClassification
+    except ImportError as e:
+        raise ImportError(
+            "The onnx sentiment backends need optimum and onnxruntime: "
+            "pip install 'optimum[onnxruntime]'"
+        ) from e
+    from transformers import AutoTokenizer, pipeline
+
+    export_dir = export_model(model_name)
+    file_name = ONNX_FILE_NAME
+    if quantized:
+        file_name = os.path.basename(quantize_model(export_dir))
+
+    model = ORTModelForSequenceClassification.from_pretrained(export_dir, file_name=file_name)
+    tokenizer = AutoTokenizer.from_pretrained(export_dir)
+    return pipeline("sentiment-analysis", model=model, tokenizer=tokenizer)
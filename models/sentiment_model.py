@@ -1,22 +1,54 @@
-from transformers import pipeline
-import yaml
-import os
+import threading
+from config.settings import get_settings
+from services.cache import get_sentiment_cache, sentiment_cache_key, encode_sentiment, decode_sentiment
 
 # Load config
-config_path = os.path.join(os.path.dirname(__file__), '..', 'config', 'settings.yaml')
-with open(config_path, 'r') as f:
-    config = yaml.safe_load(f)
+config = get_settings()
 
 SENTIMENT_MODEL_NAME = config['sentiment']['model_name']
+SENTIMENT_BATCH_SIZE = config['sentiment'].get('batch_size', 32)
+SENTIMENT_BACKEND = config['sentiment'].get('backend', 'torch')
+SENTIMENT_BACKENDS = ("torch", "onnx", "onnx-int8")
+# Token budget per forward pass; capped at the model's own limit
+SENTIMENT_MAX_LENGTH = config['sentiment'].get('max_length', 512)
+# Score long complaints as overlapping token windows instead of dropping the tail
+SENTIMENT_CHUNK_LONG_TEXTS = config['sentiment'].get('chunk_long_texts', False)
+SENTIMENT_WINDOW_STRIDE = config['sentiment'].get('window_stride', 64)
+
+def pool_probabilities(window_probs):
+    """
+    Confidence-weighted mean of per-window class probabilities: each window counts
+    with the probability of its own top class. A single window is returned as is.
+    """
+    if len(window_probs) == 1:
+        return window_probs[0]
+    weights = [max(probs) for probs in window_probs]
+    total = sum(weights)
+    return [
+        sum(w * probs[k] for w, probs in zip(weights, window_probs)) / total
+        for k in range(len(window_probs[0]))
+    ]
 
 class SentimentModel:
-    def __init__(self):
-        print(f"Loading sentiment model: {SENTIMENT_MODEL_NAME}...")
-        self.pipeline = pipeline(
-            "sentiment-analysis",
-            model=SENTIMENT_MODEL_NAME,
-            tokenizer=SENTIMENT_MODEL_NAME
-        )
+    def __init__(self, backend=SENTIMENT_BACKEND):
+        if backend not in SENTIMENT_BACKENDS:
+            raise ValueError(f"Unknown sentiment backend '{backend}', expected one of {SENTIMENT_BACKENDS}")
+        self.backend = backend
+        self.max_length = SENTIMENT_MAX_LENGTH
+        self.chunk_long_texts = SENTIMENT_CHUNK_LONG_TEXTS
+        self.window_stride = SENTIMENT_WINDOW_STRIDE
+        # Backend and windowing change scores, so each combination gets its own cache entries
+        self.cache_model_name = "|".join([
+            SENTIMENT_MODEL_NAME,
+            backend,
+            f"max{self.max_length}",
+            "windows" if self.chunk_long_texts else "truncate"
+        ])
+        # Weights are loaded on first use, see the `pipeline` property
+        self._pipeline = None
+        # One instance is shared across threads (Streamlit sessions), so loading
+        # and inference are serialized
+        self._lock = threading.RLock()
         self.label_map = {
             "negative": -1.0,
             "neutral": 0.0,
@@ -25,10 +57,36 @@ class SentimentModel:
             "LABEL_1": 0.0,
             "LABEL_2": 1.0
         }
+        self.cache = get_sentiment_cache()
 
-    def analyze(self, text):
-        # Truncate if too long, though bert handles 512 tokens usually
-        result = self.pipeline(text[:512])[0]
+    @property
+    def pipeline(self):
+        if self._pipeline is None:
+            with self._lock:
+                if self._pipeline is None:
+                    print(f"Loading sentiment model: {SENTIMENT_MODEL_NAME} ({self.backend})...")
+                    if self.backend == "torch":
+                        # transformers/torch are imported here so importing this module stays cheap
+                        from transformers import pipeline
+                        self._pipeline = pipeline(
+                            "sentiment-analysis",
+                            model=SENTIMENT_MODEL_NAME,
+                            tokenizer=SENTIMENT_MODEL_NAME
+                        )
+                    else:
+                        from models.onnx_backend import load_onnx_pipeline
+                        self._pipeline = load_onnx_pipeline(
+                            SENTIMENT_MODEL_NAME,
+                            quantized=self.backend == "onnx-int8"
+                        )
+        return self._pipeline
+
+    def _token_limit(self):
+        tokenizer = self.pipeline.tokenizer
+        model_limit = getattr(self.pipeline.model.config, "max_position_embeddings", None) or tokenizer.model_max_length
+        return min(self.max_length, model_limit, tokenizer.model_max_length)
+
+    def _to_sentiment(self, result):
         label = result['label'].lower()
         
         # Mapping for the specific Turkish model 'savasy/bert-base-turkish-sentiment-cased'
@@ -43,3 +101,89 @@ class SentimentModel:
             "score": round(score, 3),
             "confidence": round(result['score'], 3)
         }
+
+    def analyze(self, text):
+        return self.analyze_batch([text])[0]
+
+    def analyze_batch(self, texts, batch_size=SENTIMENT_BATCH_SIZE):
+        """
+        Scores many texts, consulting the sentiment cache in bulk first so only
+        misses (each distinct text once) go to the model. Results are returned in input order.
+        """
+        keys = [sentiment_cache_key(self.cache_model_name, text) for text in texts]
+        cached = self.cache.get_many(keys)
+
+        # One inference per distinct uncached key
+        pending = {}
+        for key, text in zip(keys, texts):
+            if key not in cached and key not in pending:
+                pending[key] = text
+
+        if pending:
+            scored = self._infer_batch(list(pending.values()), batch_size)
+            fresh = {key: encode_sentiment(s) for key, s in zip(pending, scored)}
+            self.cache.set_many(fresh)
+            cached.update(fresh)
+
+        return [decode_sentiment(cached[key]) for key in keys]
+
+    def _tokenize(self, texts):
+        """
+        Tokenizes every text exactly once, truncated at the model's real token limit.
+        With chunking on, long texts become overlapping windows instead.
+        Returns (features, owners): one feature dict per window and the text index it belongs to.
+        """
+        tokenizer = self.pipeline.tokenizer
+        limit = self._token_limit()
+        kwargs = {"truncation": True, "max_length": limit}
+        if self.chunk_long_texts:
+            kwargs.update(return_overflowing_tokens=True, stride=min(self.window_stride, limit // 2))
+
+        encoded = tokenizer(texts, **kwargs)
+        owners = encoded.pop("overflow_to_sample_mapping", None) or list(range(len(texts)))
+        input_names = [name for name in tokenizer.model_input_names if name in encoded]
+        features = [
+            {name: encoded[name][i] for name in input_names}
+            for i in range(len(owners))
+        ]
+        return features, owners
+
+    def _infer_batch(self, texts, batch_size):
+        """
+        Scores many texts with one forward pass per batch.
+        Windows are bucketed by token count so each batch pads only up to its own
+        longest member; windows of one long text are pooled, results keep input order.
+        """
+        if not texts:
+            return []
+
+        import torch
+
+        with self._lock:
+            model = self.pipeline.model
+            tokenizer = self.pipeline.tokenizer
+            features, owners = self._tokenize(texts)
+
+            # Length bucketing: neighbours in sorted order have similar token counts
+            order = sorted(range(len(features)), key=lambda i: len(features[i]["input_ids"]))
+            window_probs = [None] * len(features)
+            for start in range(0, len(order), batch_size):
+                batch_ids = order[start:start + batch_size]
+                batch = tokenizer.pad([features[i] for i in batch_ids], return_tensors="pt")
+                with torch.no_grad():
+                    logits = model(**batch).logits
+                for i, probs in zip(batch_ids, logits.softmax(dim=-1).tolist()):
+                    window_probs[i] = probs
+
+        per_text = [[] for _ in texts]
+        for owner, probs in zip(owners, window_probs):
+            per_text[owner].append(probs)
+
+        id2label = model.config.id2label
+        results = []
+        for probs_list in per_text:
+            probs = pool_probabilities(probs_list)
+            best = max(range(len(probs)), key=probs.__getitem__)
+            # Same label/score shape the HF pipeline returns
+            results.append(self._to_sentiment({"label": id2label[best], "score": probs[best]}))
+        return results
@@ -1,30 +1,323 @@
 from collections import Counter
+from config.settings import get_settings
 
-class AggregationPipeline:
-    def run(self, processed_comments):
-        if not processed_comments:
+# Load config
+config = get_settings()
+
+REPORTING_CONFIG = config.get('reporting', {})
+# Comments scoring below -threshold count as negative
+NEGATIVE_THRESHOLD = -config.get('sentiment', {}).get('threshold', 0.2)
+NEGATIVE_RATIO_THRESHOLD = REPORTING_CONFIG.get('negative_ratio_threshold', 0.3)
+TREND_WINDOW_DAYS = REPORTING_CONFIG.get('trend_window_days', 7)
+TOP_TOPICS = REPORTING_CONFIG.get('top_topics', 5)
+
+# Sentiment scores carry 3 decimals, so sums are kept in integer thousandths:
+# that keeps merged partial aggregates exact regardless of merge order.
+SCORE_SCALE = 1000
+
+class _Bucket:
+    """
+    Running totals for one breakdown key (a platform, date or topic).
+    """
+    __slots__ = ("count", "score_sum", "negative_count")
+
+    def __init__(self, count=0, score_sum=0, negative_count=0):
+        self.count = count
+        self.score_sum = score_sum
+        self.negative_count = negative_count
+
+    def add(self, scaled_score, is_negative, weight=1):
+        self.count += weight
+        self.score_sum += scaled_score * weight
+        self.negative_count += is_negative * weight
+
+    def merge(self, other):
+        self.count += other.count
+        self.score_sum += other.score_sum
+        self.negative_count += other.negative_count
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "avg_sentiment": self.score_sum / SCORE_SCALE / self.count,
+            "negative_ratio": self.negative_count / self.count
+        }
+
+class IncrementalAggregator:
+    """
+    Streaming aggregation of processed comments with O(1) memory per key.
+    Partial aggregates (parallel workers, earlier runs) combine with merge().
+    """
+    def __init__(self, negative_threshold=NEGATIVE_THRESHOLD):
+        self.negative_threshold = negative_threshold
+        self.overall = _Bucket()
+        self.topic_counts = Counter()
+        self.by_platform = {}
+        self.by_date = {}
+        self.by_topic = {}
+
+    def update(self, comment, weight=1):
+        """
+        Adds one processed comment; `weight` > 1 counts it for that many identical comments
+        (e.g. a deduplicated cluster).
+        """
+        score = comment["sentiment"]["score"]
+        scaled_score = round(score * SCORE_SCALE)
+        is_negative = score < self.negative_threshold
+
+        self.overall.add(scaled_score, is_negative, weight)
+        self.topic_counts[comment["topic"]] += weight
+        self.by_platform.setdefault(comment.get("platform"), _Bucket()).add(scaled_score, is_negative, weight)
+        self.by_date.setdefault(comment.get("date"), _Bucket()).add(scaled_score, is_negative, weight)
+        self.by_topic.setdefault(comment["topic"], _Bucket()).add(scaled_score, is_negative, weight)
+
+    def merge(self, other):
+        if other.negative_threshold != self.negative_threshold:
+            raise ValueError("Cannot merge aggregates built with different negative thresholds")
+        self.overall.merge(other.overall)
+        self.topic_counts.update(other.topic_counts)
+        for mine, theirs in ((self.by_platform, other.by_platform), (self.by_date, other.by_date),
+                             (self.by_topic, other.by_topic)):
+            for key, bucket in theirs.items():
+                mine.setdefault(key, _Bucket()).merge(bucket)
+        return self
+
+    def snapshot(self):
+        """
+        Stats dict in the shape ReportPipeline.run expects.
+        """
+        if not self.overall.count:
             return {
                 "avg_sentiment": 0,
                 "negative_ratio": 0,
                 "top_topics": []
             }
 
-        scores = [c["sentiment"]["score"] for c in processed_comments]
-        topics = [c["topic"] for c in processed_comments]
-        
-        # Calculate stats
-        avg_sentiment = sum(scores) / len(scores)
-        negative_count = len([s for s in scores if s < -0.2]) # Threshold can be from config
-        negative_ratio = negative_count / len(scores)
-        
-        # Get top topics
-        top_topics = Counter(topics).most_common(5)
-        # Format top topics as a list of strings for easier consumption or passed as dict
-        # The prompt expects something readable.
-        
+        overall = self.overall.summary()
         return {
-            "avg_sentiment": avg_sentiment,
-            "negative_ratio": negative_ratio,
-            "top_topics": top_topics,
-            "total_comments": len(processed_comments)
+            "avg_sentiment": overall["avg_sentiment"],
+            "negative_ratio": overall["negative_ratio"],
+            "top_topics": self.topic_counts.most_common(TOP_TOPICS),
+            "total_comments": self.overall.count
         }
+
+    def breakdowns(self):
+        """
+        Per-platform, per-date and per-topic count, average sentiment and negative ratio.
+        """
+        return {
+            "by_platform": {key: b.summary() for key, b in self.by_platform.items()},
+            "by_date": {key: b.summary() for key, b in self.by_date.items()},
+            "by_topic": {key: b.summary() for key, b in self.by_topic.items()}
+        }
+
+    def trend(self, window_days=TREND_WINDOW_DAYS):
+        """
+        Daily series with a rolling average, built from the per-date buckets.
+        """
+        buckets = self.by_date.values()
+        return _rolling_trend(
+            list(self.by_date),
+            [b.count for b in buckets],
+            [b.score_sum for b in buckets],
+            [b.negative_count for b in buckets],
+            window_days
+        )
+
+    def report_stats(self, trend_window_days=TREND_WINDOW_DAYS, negative_ratio_threshold=NEGATIVE_RATIO_THRESHOLD):
+        """
+        snapshot() plus breakdowns, trend and negative hotspots, in the shape aggregate_columns returns.
+        """
+        stats = self.snapshot()
+        if not self.overall.count:
+            return stats
+        breakdowns = self.breakdowns()
+        return {
+            **stats,
+            **breakdowns,
+            "trend": self.trend(trend_window_days),
+            "negative_hotspots": _negative_hotspots(breakdowns, negative_ratio_threshold)
+        }
+
+    def to_dict(self):
+        """
+        JSON-serializable state, so aggregates can be stored and merged in later runs.
+        """
+        def dump(buckets):
+            return [[key, b.count, b.score_sum, b.negative_count] for key, b in buckets.items()]
+
+        return {
+            "negative_threshold": self.negative_threshold,
+            "overall": [self.overall.count, self.overall.score_sum, self.overall.negative_count],
+            "topic_counts": list(self.topic_counts.items()),
+            "by_platform": dump(self.by_platform),
+            "by_date": dump(self.by_date),
+            "by_topic": dump(self.by_topic)
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        aggregator = cls(negative_threshold=state["negative_threshold"])
+        aggregator.overall = _Bucket(*state["overall"])
+        aggregator.topic_counts = Counter(dict(state["topic_counts"]))
+        aggregator.by_platform = {key: _Bucket(*values) for key, *values in state["by_platform"]}
+        aggregator.by_date = {key: _Bucket(*values) for key, *values in state["by_date"]}
+        # State saved before per-topic buckets existed only has topic counts; by_topic then
+        # covers the comments merged in since
+        aggregator.by_topic = {key: _Bucket(*values) for key, *values in state.get("by_topic", [])}
+        return aggregator
+
+def _group_summaries(keys, scaled_scores, negative):
+    """
+    Count, average sentiment and negative ratio per distinct key, in first-seen key order.
+    Sums stay in integer thousandths, so results match IncrementalAggregator exactly.
+    """
+    import numpy as np
+    import pandas as pd
+
+    codes, uniques = pd.factorize(np.asarray(keys, dtype=object))
+    keys = list(uniques)
+    # Missing keys (None/NaN) get code -1; give them their own group like the dict aggregator
+    if (codes < 0).any():
+        codes = np.where(codes < 0, len(keys), codes)
+        keys.append(None)
+    counts = np.bincount(codes, minlength=len(keys))
+    score_sums = np.bincount(codes, weights=scaled_scores, minlength=len(keys))
+    negative_counts = np.bincount(codes, weights=negative, minlength=len(keys))
+    return keys, counts, score_sums, negative_counts
+
+def _summary_dict(keys, counts, score_sums, negative_counts):
+    return {
+        key: {
+            "count": int(count),
+            "avg_sentiment": int(score_sum) / SCORE_SCALE / int(count),
+            "negative_ratio": int(negative_count) / int(count)
+        }
+        for key, count, score_sum, negative_count in zip(keys, counts, score_sums, negative_counts)
+    }
+
+def _rolling_trend(keys, counts, score_sums, negative_counts, window_days):
+    """
+    Daily series plus a `window_days` calendar-day rolling average and negative ratio.
+    Dates that do not parse are left out of the trend.
+    """
+    import pandas as pd
+
+    daily = pd.DataFrame({
+        "date": pd.to_datetime(pd.Series(keys, dtype=object), errors="coerce"),
+        "count": counts,
+        "score_sum": score_sums,
+        "negative_count": negative_counts
+    }).dropna(subset=["date"])
+    if daily.empty:
+        return []
+    daily = daily.groupby("date").sum().sort_index()
+    rolling = daily.rolling(f"{window_days}D").sum()
+
+    return [
+        {
+            "date": date.strftime("%Y-%m-%d"),
+            "count": int(row.count),
+            "avg_sentiment": row.score_sum / SCORE_SCALE / row.count,
+            "negative_ratio": row.negative_count / row.count,
+            "rolling_avg_sentiment": roll.score_sum / SCORE_SCALE / roll.count,
+            "rolling_negative_ratio": roll.negative_count / roll.count
+        }
+        for date, row, roll in zip(daily.index, daily.itertuples(), rolling.itertuples())
+    ]
+
+def _negative_hotspots(breakdowns, negative_ratio_threshold):
+    """
+    Breakdown groups above the negative-ratio threshold, worst first.
+    """
+    hotspots = [
+        {"dimension": dimension[len("by_"):], "key": key, **summary}
+        for dimension, groups in breakdowns.items()
+        for key, summary in groups.items()
+        if summary["negative_ratio"] > negative_ratio_threshold
+    ]
+    hotspots.sort(key=lambda h: (-h["negative_ratio"], -h["count"]))
+    return hotspots
+
+def aggregate_columns(scores, topics, platforms=None, dates=None,
+                      negative_threshold=NEGATIVE_THRESHOLD,
+                      negative_ratio_threshold=NEGATIVE_RATIO_THRESHOLD,
+                      trend_window_days=TREND_WINDOW_DAYS):
+    """
+    Vectorized aggregation over columnar arrays (one entry per comment).
+    Returns the ReportPipeline stats plus per-platform, per-date and per-topic
+    breakdowns, a rolling daily trend and the groups above the negative-ratio threshold.
+    """
+    import numpy as np
+
+    scores = np.asarray(scores, dtype=np.float64)
+    total = len(scores)
+    if not total:
+        return {
+            "avg_sentiment": 0,
+            "negative_ratio": 0,
+            "top_topics": []
+        }
+    if platforms is None:
+        platforms = np.full(total, None, dtype=object)
+    if dates is None:
+        dates = np.full(total, None, dtype=object)
+
+    scaled_scores = np.rint(scores * SCORE_SCALE)
+    negative = scores < negative_threshold
+
+    topic_groups = _group_summaries(topics, scaled_scores, negative)
+    platform_groups = _group_summaries(platforms, scaled_scores, negative)
+    date_groups = _group_summaries(dates, scaled_scores, negative)
+
+    # Stable sort keeps first-seen order among equal counts, like Counter.most_common
+    topic_keys, topic_counts = topic_groups[0], topic_groups[1]
+    top_order = np.argsort(-topic_counts, kind="stable")[:TOP_TOPICS]
+
+    breakdowns = {
+        "by_platform": _summary_dict(*platform_groups),
+        "by_date": _summary_dict(*date_groups),
+        "by_topic": _summary_dict(*topic_groups)
+    }
+
+    return {
+        "avg_sentiment": int(scaled_scores.sum()) / SCORE_SCALE / total,
+        "negative_ratio": int(negative.sum()) / total,
+        "top_topics": [(topic_keys[i], int(topic_counts[i])) for i in top_order],
+        "total_comments": total,
+        **breakdowns,
+        "trend": _rolling_trend(*date_groups, trend_window_days),
+        "negative_hotspots": _negative_hotspots(breakdowns, negative_ratio_threshold)
+    }
+
+class AggregationPipeline:
+    """
+    Batch aggregation of processed comments (lists of dicts or a columnar DataFrame).
+    Streaming runs use IncrementalAggregator instead.
+    """
+    def __init__(self, negative_threshold=NEGATIVE_THRESHOLD, trend_window_days=TREND_WINDOW_DAYS):
+        self.negative_threshold = negative_threshold
+        self.trend_window_days = trend_window_days
+
+    def run(self, processed_comments):
+        return aggregate_columns(
+            [c["sentiment"]["score"] for c in processed_comments],
+            [c["topic"] for c in processed_comments],
+            [c.get("platform") for c in processed_comments],
+            [c.get("date") for c in processed_comments],
+            negative_threshold=self.negative_threshold,
+            trend_window_days=self.trend_window_days
+        )
+
+    def run_frame(self, df):
+        """
+        Aggregates a DataFrame with score/topic/platform/date columns (e.g. a Parquet past run).
+        """
+        return aggregate_columns(
+            df["score"].to_numpy(),
+            df["topic"].to_numpy(dtype=object),
+            df["platform"].to_numpy(dtype=object),
+            df["date"].to_numpy(dtype=object),
+            negative_threshold=self.negative_threshold,
+            trend_window_days=self.trend_window_days
+        )
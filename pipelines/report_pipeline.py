@@ -1,29 +1,55 @@
-from services.llm_service import LLMService
+from services import registry
+from services.async_llm_client import run_sync
 from config.prompts import REPORT_GENERATION_PROMPT
 import json
 import re
 
 class ReportPipeline:
-    def __init__(self):
-        self.llm_service = LLMService()
+    def __init__(self, use_async=False, llm_service=None):
+        self.llm_service = llm_service or registry.get_llm_service()
+        self.use_async = use_async
 
-    def generate_report(self, brand, company_goal, stats):
+    async def _generate_async(self, prompt):
+        return await registry.get_async_llm_service().generate_content(prompt)
+
+    def build_prompt(self, brand, company_goal, stats):
         # Format top topics for the prompt
         top_topics_str = ", ".join([f"{t[0]} ({t[1]})" for t in stats['top_topics']])
-        
-        prompt = REPORT_GENERATION_PROMPT.format(
+
+        return REPORT_GENERATION_PROMPT.format(
             brand=brand,
             goal=company_goal,
             avg_sentiment=stats['avg_sentiment'],
             negative_ratio=stats['negative_ratio'],
             top_topics=top_topics_str
         )
-        
-        response_text = self.llm_service.generate_content(prompt)
+
+    def generate_report(self, brand, company_goal, stats):
+        prompt = self.build_prompt(brand, company_goal, stats)
+
+        if self.use_async:
+            response_text = run_sync(self._generate_async(prompt))
+        else:
+            response_text = self.llm_service.generate_content(prompt)
         
         # Return raw markdown
         return {"report_markdown": response_text}
 
+    def stream_report(self, brand, company_goal, stats):
+        """
+        Yields the report markdown in chunks as the LLM produces it.
+        The async client does not stream, so with use_async the report arrives as one chunk.
+        """
+        prompt = self.build_prompt(brand, company_goal, stats)
+
+        if self.use_async:
+            response_text = run_sync(self._generate_async(prompt))
+            if response_text:
+                yield response_text
+            return
+
+        yield from self.llm_service.stream_content(prompt)
+
         
     def calculate_brand_health(self, avg_sentiment, negative_ratio):
         # normalize avg_sentiment (-1 to 1) to (0 to 1) -> (avg + 1) / 2
@@ -39,17 +65,23 @@ class ReportPipeline:
         score = 100 - (negative_ratio * 60) + (avg_sentiment * 40)
         return max(0, min(100, int(score)))
 
-    def run(self, brand, goal, stats):
-        report = self.generate_report(brand, goal, stats)
+    def build_output(self, report_markdown, stats):
         brand_health = self.calculate_brand_health(stats['avg_sentiment'], stats['negative_ratio'])
-        
+
         final_output = {
             "brand_health_score": brand_health,
-            "report_markdown": report.get("report_markdown", ""),
+            "report_markdown": report_markdown,
             "sentiment_overview": {
                 "average_score": round(stats['avg_sentiment'], 3),
                 "negative_ratio": round(stats['negative_ratio'], 3)
             }
         }
+        # Breakdowns, trend and hotspots are passed through when the aggregator produced them
+        for key in ("total_comments", "top_topics", "by_platform", "by_date", "by_topic", "trend", "negative_hotspots"):
+            if key in stats:
+                final_output[key] = stats[key]
         return final_output
-        return final_output
+
+    def run(self, brand, goal, stats):
+        report = self.generate_report(brand, goal, stats)
+        return self.build_output(report.get("report_markdown", ""), stats)
@@ -1,23 +1,67 @@
-from models.sentiment_model import SentimentModel
-from services.gemini_client import GeminiClient
-from config.prompts import TOPIC_EXTRACTION_PROMPT
+import itertools
+from pipelines.sentiment_workers import ShardedSentimentScorer
+from services import registry
+from services.topic_extractor import TopicExtractor, TOPIC_BATCH_SIZE
+from config.settings import get_settings
+from services.async_llm_client import run_sync
+from services.instrumentation import get_instrumentation
+
+# Chunk sizes are whole numbers of topic prompts, so no chunk ends in a partial topic batch
+# Comments pulled from the input per processing step when streaming
+STREAM_CHUNK_SIZE = 10 * TOPIC_BATCH_SIZE
+# Comments per task sent to a sentiment worker process
+WORKER_CHUNK_SIZE = 2 * TOPIC_BATCH_SIZE
+TOPIC_MODE = get_settings().get('topics', {}).get('mode', 'llm')
+TOPIC_MODES = ("llm", "embedding")
+
+def align_to_batches(size, batch_size=TOPIC_BATCH_SIZE):
+    """
+    Rounds a chunk size up to a multiple of the topic batch size.
+    """
+    return -(-size // batch_size) * batch_size
+
+def iter_chunks(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
 
 class SentimentPipeline:
-    def __init__(self):
-        self.sentiment_model = SentimentModel()
-        self.gemini_client = GeminiClient()
+    def __init__(self, batch_topics=True, use_async=False, workers=1, chunk_size=WORKER_CHUNK_SIZE,
+                 sentiment_model=None, gemini_client=None, topic_mode=TOPIC_MODE):
+        self.workers = workers
+        self.gemini_client = gemini_client or registry.get_gemini_client()
+        self.topic_extractor = TopicExtractor(self.gemini_client)
+        # Each worker chunk becomes one topic step; a partial last batch would cost an extra call
+        self.chunk_size = align_to_batches(chunk_size, self.topic_extractor.batch_size)
+        if workers > 1:
+            # Same analyze/analyze_batch interface, scored on a process pool
+            self.sentiment_model = ShardedSentimentScorer(workers, chunk_size=self.chunk_size)
+        else:
+            # Shared per process, so weights are loaded once however many pipelines exist
+            self.sentiment_model = sentiment_model or registry.get_sentiment_model()
+        # Pack several comments into one topic prompt instead of one call per comment
+        self.batch_topics = batch_topics
+        # Send topic prompts concurrently through the async client layer
+        self.use_async = use_async
+        if topic_mode not in TOPIC_MODES:
+            raise ValueError(f"Unknown topic mode '{topic_mode}', expected one of {TOPIC_MODES}")
+        # "embedding": label locally, only low-confidence comments reach the LLM
+        self.topic_mode = topic_mode
+        self.topic_classifier = registry.get_topic_classifier() if topic_mode == "embedding" else None
 
-    def process_comment(self, comment):
-        # 1. Sentiment Analysis
-        sentiment = self.sentiment_model.analyze(comment['text'])
-        
-        # 2. Topic Extraction (using Gemini)
-        topic_prompt = TOPIC_EXTRACTION_PROMPT.format(comment=comment['text'])
-        topic = self.gemini_client.generate_content(topic_prompt).strip().lower()
-        
-        # Clean up topic (remove extra quotes or newlines if any)
-        topic = topic.replace('"', '').replace("'", "").split('\n')[0]
+    def extract_topic(self, text):
+        # Topic Extraction (using Gemini)
+        return self.topic_extractor.extract(text)
+
+    async def _extract_topics_async(self, texts):
+        # The shared client keeps its rate limiter and connections from chunk to chunk
+        client = registry.get_async_gemini_client()
+        return await self.topic_extractor.extract_batch_async(texts, client)
 
+    def build_result(self, comment, sentiment, topic):
         return {
             "id": comment['id'],
             "text": comment['text'],
@@ -27,10 +71,68 @@ class SentimentPipeline:
             "date": comment.get('date')
         }
 
+    def process_comment(self, comment):
+        # 1. Sentiment Analysis
+        sentiment = self.sentiment_model.analyze(comment['text'])
+        
+        # 2. Topic Extraction
+        topic = self.extract_topic(comment['text'])
+
+        return self.build_result(comment, sentiment, topic)
+
+    def extract_topics(self, texts):
+        if self.topic_classifier is not None:
+            return self.topic_classifier.extract_batch(texts, fallback=self.extract_topics_llm)
+        return self.extract_topics_llm(texts)
+
+    def extract_topics_llm(self, texts):
+        if self.use_async:
+            return run_sync(self._extract_topics_async(texts))
+        if self.batch_topics:
+            return self.topic_extractor.extract_batch(texts)
+        return [self.extract_topic(text) for text in texts]
+
+    def process_batch(self, comments, sentiments=None):
+        texts = [c['text'] for c in comments]
+        instrumentation = get_instrumentation()
+
+        # 1. Sentiment Analysis, batched over all comments (unless already scored by workers)
+        if sentiments is None:
+            with instrumentation.stage("sentiment", len(texts)):
+                sentiments = self.sentiment_model.analyze_batch(texts)
+
+        # 2. Topic Extraction
+        with instrumentation.stage("topics", len(texts)):
+            topics = self.extract_topics(texts)
+
+        return [
+            self.build_result(comment, sentiment, topic)
+            for comment, sentiment, topic in zip(comments, sentiments, topics)
+        ]
+
+    def iter_run(self, comments, chunk_size=STREAM_CHUNK_SIZE):
+        """
+        Consumes comments from any iterable (e.g. a streaming loader) in chunks
+        and yields processed comments in input order.
+        """
+        if self.workers > 1:
+            # Workers score upcoming chunks while topics are extracted for the current one
+            chunks = iter_chunks(comments, self.chunk_size)
+            for chunk, sentiments in self.sentiment_model.iter_scores(chunks):
+                yield from self.process_batch(chunk, sentiments)
+            return
+
+        for chunk in iter_chunks(comments, align_to_batches(chunk_size, self.topic_extractor.batch_size)):
+            yield from self.process_batch(chunk)
+
     def run(self, comments):
-        processed_comments = []
-        print(f"Processing {len(comments)} comments...")
-        for comment in comments:
-            processed = self.process_comment(comment)
-            processed_comments.append(processed)
-        return processed_comments
+        if hasattr(comments, '__len__'):
+            print(f"Processing {len(comments)} comments...")
+        else:
+            print("Processing comment stream...")
+        return list(self.iter_run(comments))
+
+    def close(self):
+        # Only the worker pool is owned by the pipeline; shared models stay loaded
+        if isinstance(self.sentiment_model, ShardedSentimentScorer):
+            self.sentiment_model.close()
@@ -0,0 +1,103 @@
+import os
+import multiprocessing
+from collections import deque
+from models.sentiment_model import SentimentModel
+from services.cache import get_sentiment_cache, sentiment_cache_key, encode_sentiment, decode_sentiment, set_cache_enabled
+
+# Model instance owned by each worker process, loaded once in the initializer
+_worker_model = None
+
+def _init_worker(model_factory, torch_threads):
+    global _worker_model
+    # The parent owns the sentiment cache: workers never open the SQLite file, so
+    # --no-cache is honoured and N processes do not write it concurrently
+    set_cache_enabled(False)
+    try:
+        import torch
+        # N workers x default torch threads would oversubscribe the cores
+        torch.set_num_threads(torch_threads)
+    except ImportError:
+        pass
+    _worker_model = model_factory()
+
+def _score_chunk(texts):
+    return _worker_model.analyze_batch(texts)
+
+class ShardedSentimentScorer:
+    """
+    Scores comment chunks on a pool of worker processes, each with its own SentimentModel.
+    The sentiment cache is consulted in bulk in this process; only misses go to the workers.
+    Results always come back in input order.
+    """
+    def __init__(self, workers, chunk_size=64, torch_threads=None, model_factory=SentimentModel):
+        self.workers = workers
+        self.chunk_size = chunk_size
+        # Same cache entries as an in-process model (weights are not loaded here)
+        self.cache_model_name = getattr(model_factory(), "cache_model_name", None)
+        self.cache = get_sentiment_cache()
+        torch_threads = torch_threads or max(1, (os.cpu_count() or 1) // workers)
+        # spawn: forking a process that already imported torch is unsafe
+        context = multiprocessing.get_context("spawn")
+        print(f"Starting {workers} sentiment workers ({torch_threads} torch threads each)...")
+        self.pool = context.Pool(
+            workers,
+            initializer=_init_worker,
+            initargs=(model_factory, torch_threads)
+        )
+
+    def _submit(self, texts):
+        """
+        Looks the texts up in the cache and sends each distinct miss to a worker.
+        """
+        if self.cache_model_name is None or not self.cache.enabled:
+            return None, None, None, self.pool.apply_async(_score_chunk, (texts,))
+        keys = [sentiment_cache_key(self.cache_model_name, text) for text in texts]
+        cached = self.cache.get_many(keys)
+        pending = {}
+        for key, text in zip(keys, texts):
+            if key not in cached and key not in pending:
+                pending[key] = text
+        result = self.pool.apply_async(_score_chunk, (list(pending.values()),)) if pending else None
+        return keys, cached, pending, result
+
+    def _collect(self, submitted):
+        keys, cached, pending, result = submitted
+        if keys is None:
+            return result.get()
+        if result is not None:
+            fresh = {key: encode_sentiment(s) for key, s in zip(pending, result.get())}
+            self.cache.set_many(fresh)
+            cached.update(fresh)
+        return [decode_sentiment(cached[key]) for key in keys]
+
+    def iter_scores(self, chunks):
+        """
+        Yields (chunk, sentiments) for each chunk of comments, in order.
+        At most 2 chunks per worker are in flight, so a streamed input is never read ahead unboundedly.
+        """
+        in_flight = deque()
+        max_in_flight = self.workers * 2
+
+        for chunk in chunks:
+            in_flight.append((chunk, self._submit([c['text'] for c in chunk])))
+            if len(in_flight) >= max_in_flight:
+                done_chunk, submitted = in_flight.popleft()
+                yield done_chunk, self._collect(submitted)
+
+        while in_flight:
+            done_chunk, submitted = in_flight.popleft()
+            yield done_chunk, self._collect(submitted)
+
+    def analyze_batch(self, texts):
+        submitted = [self._submit(texts[i:i + self.chunk_size]) for i in range(0, len(texts), self.chunk_size)]
+        results = []
+        for chunk in submitted:
+            results.extend(self._collect(chunk))
+        return results
+
+    def analyze(self, text):
+        return self.analyze_batch([text])[0]
+
+    def close(self):
+        self.pool.close()
+        self.pool.join()
@@ -0,0 +1,282 @@
+import asyncio
+import random
+import threading
+import time
+import logging
+from config.settings import get_settings
+from services.cache import get_llm_cache, make_key
+from services.instrumentation import get_instrumentation
+# Model names and keys are shared with the synchronous service, so both write the same cache keys
+from services.llm_service import GEMINI_API_KEY, GEMINI_MODEL_NAME, OPENAI_API_KEY, OPENAI_MODEL_NAME
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Load config
+config = get_settings()
+
+ASYNC_CONFIG = config.get('async_llm', {})
+PROVIDER_CONFIG = ASYNC_CONFIG.get('providers', {})
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+def estimate_tokens(text):
+    """
+    Rough token estimate (~4 characters per token), used for tokens/min budgeting.
+    """
+    return max(1, len(text) // 4)
+
+def create_http_client(max_connections=ASYNC_CONFIG.get('max_connections', 20),
+                       timeout=ASYNC_CONFIG.get('timeout_seconds', 60)):
+    """
+    Creates an HTTP client whose connection pool can be shared by several provider clients.
+    """
+    import httpx
+    return httpx.AsyncClient(
+        timeout=timeout,
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections
+        )
+    )
+
+class TokenBucket:
+    """
+    Async token bucket refilled continuously at `rate_per_minute`.
+    """
+    def __init__(self, rate_per_minute, capacity=None):
+        self.rate_per_second = rate_per_minute / 60.0
+        self.capacity = capacity or rate_per_minute
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate_per_second)
+        self.updated_at = now
+
+    async def acquire(self, amount=1):
+        # A single request larger than the bucket would otherwise wait forever
+        amount = min(amount, self.capacity)
+        async with self.lock:
+            while True:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                await asyncio.sleep((amount - self.tokens) / self.rate_per_second)
+
+class RateLimiter:
+    """
+    Per-provider limiter combining a requests/min and a tokens/min bucket.
+    """
+    def __init__(self, requests_per_minute=None, tokens_per_minute=None):
+        self.request_bucket = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.token_bucket = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+
+    async def acquire(self, tokens=1):
+        if self.request_bucket:
+            await self.request_bucket.acquire(1)
+        if self.token_bucket:
+            await self.token_bucket.acquire(tokens)
+
+class AsyncLLMClient:
+    """
+    Base asyncio client: bounded concurrency, rate limiting and jittered
+    exponential backoff on 429/5xx. Subclasses build and parse provider payloads.
+    """
+    provider = None
+
+    def __init__(self, model_name, api_key, base_url=None, http_client=None,
+                 max_concurrency=None, requests_per_minute=None, tokens_per_minute=None,
+                 max_retries=None, backoff_base=None, backoff_max=None):
+        provider_config = PROVIDER_CONFIG.get(self.provider, {})
+        self.model_name = model_name
+        self.api_key = api_key
+        self.base_url = (base_url or provider_config.get('base_url', '')).rstrip('/')
+        self.semaphore = asyncio.Semaphore(max_concurrency or ASYNC_CONFIG.get('max_concurrency', 8))
+        self.rate_limiter = RateLimiter(
+            requests_per_minute or provider_config.get('requests_per_minute'),
+            tokens_per_minute or provider_config.get('tokens_per_minute')
+        )
+        self.max_retries = max_retries if max_retries is not None else ASYNC_CONFIG.get('max_retries', 5)
+        self.backoff_base = backoff_base if backoff_base is not None else ASYNC_CONFIG.get('backoff_base_seconds', 1.0)
+        self.backoff_max = backoff_max if backoff_max is not None else ASYNC_CONFIG.get('backoff_max_seconds', 30.0)
+        self.owns_http_client = http_client is None
+        self.http_client = http_client or create_http_client()
+        self.cache = get_llm_cache()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+
+    async def aclose(self):
+        if self.owns_http_client:
+            await self.http_client.aclose()
+
+    def build_request(self, prompt):
+        """
+        Returns (url, headers, json_body) for the provider.
+        """
+        raise NotImplementedError
+
+    def parse_response(self, data):
+        """
+        Extracts the generated text from the provider's JSON response.
+        """
+        raise NotImplementedError
+
+    def backoff_delay(self, attempt, retry_after=None):
+        if retry_after:
+            try:
+                return min(self.backoff_max, float(retry_after))
+            except ValueError:
+                pass
+        delay = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        # Equal jitter: keep at least half the delay, randomize the rest
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    async def generate_content(self, prompt):
+        """
+        Generates content for a single prompt. Returns "" after exhausting retries,
+        matching the synchronous clients.
+        """
+        import httpx
+
+        cache_key = make_key(self.provider, self.model_name, prompt)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        url, headers, body = self.build_request(prompt)
+
+        async with self.semaphore:
+            for attempt in range(self.max_retries + 1):
+                await self.rate_limiter.acquire(estimate_tokens(prompt))
+                retry_after = None
+                try:
+                    response = await self.http_client.post(url, headers=headers, json=body)
+                    if response.status_code in RETRYABLE_STATUS_CODES:
+                        retry_after = response.headers.get("retry-after")
+                        logger.warning(f"{self.provider} returned {response.status_code} (attempt {attempt + 1}).")
+                    else:
+                        response.raise_for_status()
+                        content = self.parse_response(response.json())
+                        get_instrumentation().count_llm_call(self.provider, prompt, content)
+                        if content:
+                            self.cache.set(cache_key, content)
+                        return content
+                except httpx.TransportError as e:
+                    logger.warning(f"{self.provider} transport error (attempt {attempt + 1}): {e}")
+                except (httpx.HTTPStatusError, ValueError, KeyError, IndexError) as e:
+                    logger.error(f"{self.provider} generation failed: {e}")
+                    return ""
+
+                if attempt < self.max_retries:
+                    await asyncio.sleep(self.backoff_delay(attempt, retry_after))
+
+        logger.error(f"{self.provider} generation failed after {self.max_retries + 1} attempts.")
+        return ""
+
+    async def generate_many(self, prompts):
+        """
+        Runs prompts concurrently (bounded by max_concurrency); results keep input order.
+        """
+        return await asyncio.gather(*(self.generate_content(p) for p in prompts))
+
+class AsyncGeminiClient(AsyncLLMClient):
+    provider = "gemini"
+
+    def __init__(self, model_name=GEMINI_MODEL_NAME, api_key=GEMINI_API_KEY, **kwargs):
+        super().__init__(model_name, api_key, **kwargs)
+
+    def build_request(self, prompt):
+        url = f"{self.base_url}/models/{self.model_name}:generateContent"
+        headers = {"x-goog-api-key": self.api_key or ""}
+        body = {"contents": [{"parts": [{"text": prompt}]}]}
+        return url, headers, body
+
+    def parse_response(self, data):
+        parts = data["candidates"][0]["content"]["parts"]
+        return "".join(part.get("text", "") for part in parts)
+
+class AsyncOpenAIClient(AsyncLLMClient):
+    provider = "openai"
+
+    def __init__(self, model_name=OPENAI_MODEL_NAME, api_key=OPENAI_API_KEY, **kwargs):
+        super().__init__(model_name, api_key, **kwargs)
+
+    def build_request(self, prompt):
+        url = f"{self.base_url}/chat/completions"
+        headers = {"Authorization": f"Bearer {self.api_key or ''}"}
+        body = {
+            "model": self.model_name,
+            "messages": [
+                {"role": "system", "content": "You are a helpful assistant generating reports."},
+                {"role": "user", "content": prompt}
+            ]
+        }
+        return url, headers, body
+
+    def parse_response(self, data):
+        return data["choices"][0]["message"]["content"] or ""
+
+class AsyncLLMService:
+    """
+    Async counterpart of LLMService: OpenAI first, Gemini as fallback,
+    sharing one HTTP connection pool unless a Gemini client is passed in.
+    """
+    def __init__(self, http_client=None, gemini_client=None, **client_kwargs):
+        self.owns_http_client = http_client is None
+        self.http_client = http_client or create_http_client()
+        self.clients = []
+        if OPENAI_API_KEY:
+            self.clients.append(AsyncOpenAIClient(http_client=self.http_client, **client_kwargs))
+        if GEMINI_API_KEY:
+            # An existing Gemini client (e.g. the one topic extraction uses) shares its rate limiter
+            self.clients.append(gemini_client or AsyncGeminiClient(http_client=self.http_client, **client_kwargs))
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+
+    async def aclose(self):
+        if self.owns_http_client:
+            await self.http_client.aclose()
+
+    async def generate_content(self, prompt):
+        for client in self.clients:
+            response_text = await client.generate_content(prompt)
+            if response_text:
+                return response_text
+            logger.warning(f"{client.provider} returned no content. Switching to fallback...")
+        return ""
+
+    async def generate_many(self, prompts):
+        return await asyncio.gather(*(self.generate_content(p) for p in prompts))
+
+class AsyncRunner:
+    """
+    One event loop on a daemon thread for synchronous pipeline code. The shared async
+    clients are only ever awaited on this loop, so their rate limiters and connection
+    pools carry over from one call (chunk, report) to the next.
+    """
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name="async-llm", daemon=True)
+        self.thread.start()
+
+    def run(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+
+def run_sync(coro):
+    """
+    Runs a coroutine from synchronous pipeline code on the shared event loop.
+    """
+    from services import registry
+    return registry.get_async_runner().run(coro)
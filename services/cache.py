@@ -0,0 +1,231 @@
+import hashlib
+import json
+import re
+import unicodedata
+import sqlite3
+import threading
+import time
+import logging
+import os
+from config.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Load config
+config = get_settings()
+
+CACHE_CONFIG = config.get('cache', {})
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+def make_key(*parts):
+    """
+    Content address for a cache entry: sha256 over the NUL-joined parts.
+    """
+    return hashlib.sha256("\0".join(str(p) for p in parts).encode("utf-8")).hexdigest()
+
+WHITESPACE_RE = re.compile(r'\s+')
+
+def normalize_text(text):
+    """
+    Canonical form used for text-keyed caches: NFC unicode, collapsed whitespace.
+    Case is kept because the sentiment model is cased.
+    """
+    return WHITESPACE_RE.sub(' ', unicodedata.normalize('NFC', text)).strip()
+
+class SQLiteCache:
+    """
+    Small persistent key/value store with TTL, max-size LRU eviction and hit/miss counters.
+    Safe to share between threads of one process.
+    """
+    def __init__(self, path, ttl_seconds=None, max_entries=None, enabled=True):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        self.conn = None
+
+    def _connect(self):
+        if self.conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self.conn = sqlite3.connect(self.path, check_same_thread=False)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_accessed ON cache (accessed_at)")
+        return self.conn
+
+    def _is_expired(self, created_at, now):
+        return self.ttl_seconds is not None and now - created_at > self.ttl_seconds
+
+    def get(self, key):
+        if not self.enabled:
+            return None
+        now = time.time()
+        with self.lock:
+            conn = self._connect()
+            row = conn.execute("SELECT value, created_at FROM cache WHERE key = ?", (key,)).fetchone()
+            if row is None or self._is_expired(row[1], now):
+                if row is not None:
+                    conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                    conn.commit()
+                self.misses += 1
+                return None
+            conn.execute("UPDATE cache SET accessed_at = ? WHERE key = ?", (now, key))
+            conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def set(self, key, value):
+        if not self.enabled:
+            return
+        now = time.time()
+        with self.lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, value, now, now)
+            )
+            self._evict(conn)
+            conn.commit()
+
+    def get_many(self, keys):
+        """
+        Bulk lookup; returns {key: value} for the keys that are present and fresh.
+        """
+        if not self.enabled or not keys:
+            return {}
+        now = time.time()
+        unique_keys = list(dict.fromkeys(keys))
+        found = {}
+        with self.lock:
+            conn = self._connect()
+            expired = []
+            # Stay well below SQLite's bound-parameter limit
+            for start in range(0, len(unique_keys), 500):
+                chunk = unique_keys[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = conn.execute(
+                    f"SELECT key, value, created_at FROM cache WHERE key IN ({placeholders})", chunk
+                ).fetchall()
+                for key, value, created_at in rows:
+                    if self._is_expired(created_at, now):
+                        expired.append(key)
+                    else:
+                        found[key] = value
+            if found:
+                conn.executemany("UPDATE cache SET accessed_at = ? WHERE key = ?", [(now, k) for k in found])
+            if expired:
+                conn.executemany("DELETE FROM cache WHERE key = ?", [(k,) for k in expired])
+            conn.commit()
+            self.hits += len(found)
+            self.misses += len(unique_keys) - len(found)
+        return found
+
+    def set_many(self, items):
+        """
+        Bulk insert of {key: value}.
+        """
+        if not self.enabled or not items:
+            return
+        now = time.time()
+        with self.lock:
+            conn = self._connect()
+            conn.executemany(
+                "INSERT OR REPLACE INTO cache (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                [(key, value, now, now) for key, value in items.items()]
+            )
+            self._evict(conn)
+            conn.commit()
+
+    def _evict(self, conn):
+        if not self.max_entries:
+            return
+        count = conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+        overflow = count - self.max_entries
+        if overflow > 0:
+            # Least recently used entries go first
+            conn.execute(
+                "DELETE FROM cache WHERE key IN "
+                "(SELECT key FROM cache ORDER BY accessed_at ASC LIMIT ?)",
+                (overflow,)
+            )
+
+    def clear(self):
+        with self.lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM cache")
+            conn.commit()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+    def close(self):
+        with self.lock:
+            if self.conn is not None:
+                self.conn.close()
+                self.conn = None
+
+_llm_cache = None
+_llm_cache_lock = threading.Lock()
+
+def get_llm_cache():
+    """
+    Process-wide cache for LLM responses, configured from the `cache` section of settings.yaml.
+    """
+    global _llm_cache
+    with _llm_cache_lock:
+        if _llm_cache is None:
+            _llm_cache = SQLiteCache(
+                os.path.join(PROJECT_ROOT, CACHE_CONFIG.get('llm_path', '.cache/llm_cache.sqlite')),
+                ttl_seconds=CACHE_CONFIG.get('ttl_seconds'),
+                max_entries=CACHE_CONFIG.get('max_entries'),
+                enabled=CACHE_CONFIG.get('enabled', True)
+            )
+        return _llm_cache
+
+_sentiment_cache = None
+_sentiment_cache_lock = threading.Lock()
+
+def get_sentiment_cache():
+    """
+    Process-wide cache for sentiment results, keyed by (model name, normalized text).
+    Results are deterministic, so entries never expire; size is bounded by LRU eviction.
+    """
+    global _sentiment_cache
+    with _sentiment_cache_lock:
+        if _sentiment_cache is None:
+            _sentiment_cache = SQLiteCache(
+                os.path.join(PROJECT_ROOT, CACHE_CONFIG.get('sentiment_path', '.cache/sentiment_cache.sqlite')),
+                max_entries=CACHE_CONFIG.get('sentiment_max_entries'),
+                enabled=CACHE_CONFIG.get('enabled', True)
+            )
+        return _sentiment_cache
+
+def sentiment_cache_key(model_name, text):
+    return make_key(model_name, normalize_text(text))
+
+def encode_sentiment(sentiment):
+    return json.dumps(sentiment, separators=(',', ':'))
+
+def decode_sentiment(value):
+    return json.loads(value)
+
+def set_cache_enabled(enabled):
+    """
+    Turns the shared caches on or off (used by the CLI bypass flag).
+    """
+    get_llm_cache().enabled = enabled
+    get_sentiment_cache().enabled = enabled
@@ -0,0 +1,128 @@
+import json
+import os
+import logging
+from services.cache import make_key, normalize_text
+
+logger = logging.getLogger(__name__)
+
+# Processed comments buffered before they are appended to the journal
+FLUSH_EVERY = 64
+
+def comment_key(comment):
+    """
+    Journal key: the comment ID plus a hash of its normalized text, so an edited
+    or re-numbered comment in a new scrape is never mistaken for finished work.
+    """
+    return make_key(comment.get('id'), normalize_text(comment['text']))
+
+class CheckpointJournal:
+    """
+    Append-only JSONL journal of processed comments. The first line records the
+    run signature (model/topic settings); a journal written under a different
+    signature is not resumed from.
+    """
+    def __init__(self, path, signature="", flush_every=FLUSH_EVERY):
+        self.path = path
+        self.signature = signature
+        self.flush_every = flush_every
+        self.done = {}
+        self.buffer = []
+        self.file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def load(self):
+        """
+        Reads finished results from an existing journal. A line cut short by a crash is ignored.
+        """
+        self.done = {}
+        if not os.path.exists(self.path):
+            return self.done
+
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line_number, line in enumerate(f):
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(f"Skipping unreadable checkpoint line {line_number + 1} in {self.path}")
+                    continue
+                if line_number == 0:
+                    if entry.get("signature") != self.signature:
+                        logger.warning(f"Checkpoint {self.path} was written with different settings; starting over.")
+                        return self.done
+                    continue
+                self.done[entry["key"]] = entry["result"]
+
+        logger.info(f"Resuming from {self.path}: {len(self.done)} comments already processed.")
+        return self.done
+
+    def open(self, resume=False):
+        """
+        Opens the journal for appending. Without `resume` (or when nothing usable was
+        loaded) any previous journal is replaced.
+        """
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if resume and self.done:
+            self._truncate_partial_line()
+            self.file = open(self.path, 'a', encoding='utf-8')
+        else:
+            self.done = {}
+            self.file = open(self.path, 'w', encoding='utf-8')
+            self.file.write(json.dumps({"signature": self.signature}) + "\n")
+            self.file.flush()
+        return self
+
+    def _truncate_partial_line(self, block_size=65536):
+        """
+        Cuts a line left unfinished by a crash, so appended records start on a line of their own.
+        """
+        with open(self.path, 'r+b') as f:
+            end = f.seek(0, os.SEEK_END)
+            position = end
+            while position > 0:
+                start = max(0, position - block_size)
+                f.seek(start)
+                block = f.read(position - start)
+                newline = block.rfind(b"\n")
+                if newline >= 0:
+                    position = start + newline + 1
+                    break
+                position = start
+            if position < end:
+                logger.warning(f"Dropping an incomplete last line from {self.path}")
+                f.truncate(position)
+
+    def get(self, comment):
+        return self.done.get(comment_key(comment))
+
+    def record(self, processed):
+        """
+        Queues one processed comment; every `flush_every` results are appended and fsynced.
+        """
+        self.buffer.append(processed)
+        if len(self.buffer) >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        if not self.buffer or self.file is None:
+            return
+        lines = [
+            json.dumps({"key": comment_key(p), "result": p}, ensure_ascii=False, separators=(',', ':'))
+            for p in self.buffer
+        ]
+        self.file.write("\n".join(lines) + "\n")
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.buffer = []
+
+    def close(self):
+        if self.file is not None:
+            self.flush()
+            self.file.close()
+            self.file = None
@@ -1,5 +1,7 @@
 import json
 import logging
+import itertools
+import os
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
@@ -51,6 +53,158 @@ def parse_turkish_date(date_str, default_year=None):
         logger.warning(f"Failed to parse date '{date_str}': {e}")
         return datetime.now().strftime("%Y-%m-%d")
 
+# Read size for the incremental JSON parser
+CHUNK_SIZE = 1 << 16
+JSON_LINES_EXTENSIONS = (".jsonl", ".ndjson")
+
+def _read_non_whitespace(f, chunk_size=CHUNK_SIZE):
+    """
+    Reads until the first non-whitespace character; returns the buffer read so far.
+    """
+    buffer = ""
+    while not buffer.strip():
+        chunk = f.read(chunk_size)
+        if not chunk:
+            break
+        buffer += chunk
+    return buffer.lstrip()
+
+def _iter_json_array(f, buffer, chunk_size=CHUNK_SIZE):
+    """
+    Incrementally decodes the elements of a top-level JSON array.
+    `buffer` holds already-read text starting right after the opening '['.
+    Only one element (plus one read chunk) is held in memory at a time.
+    """
+    decoder = json.JSONDecoder()
+    pos = 0
+    eof = False
+
+    while True:
+        # Skip whitespace and element separators, reading more as needed
+        while True:
+            while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                pos += 1
+            if pos < len(buffer) or eof:
+                break
+            chunk = f.read(chunk_size)
+            if chunk:
+                buffer, pos = buffer[pos:] + chunk, 0
+            else:
+                eof = True
+
+        if pos >= len(buffer):
+            raise json.JSONDecodeError("Unterminated JSON array", buffer, pos)
+        if buffer[pos] == "]":
+            return
+
+        try:
+            item, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            # Element spans the chunk boundary: read more and retry
+            if eof:
+                raise
+            chunk = f.read(chunk_size)
+            if chunk:
+                buffer, pos = buffer[pos:] + chunk, 0
+            else:
+                eof = True
+            continue
+
+        yield item
+        pos = end
+
+def _iter_json_lines(f, first_lines=()):
+    for line in itertools.chain(first_lines, f):
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+def iter_scraped_items(file_path):
+    """
+    Yields raw scraped items one at a time from a JSON array, a JSON Lines file,
+    or the legacy {"items": [...]} wrapper (which is loaded whole).
+    """
+    with open(file_path, 'r', encoding='utf-8') as f:
+        if file_path.endswith(JSON_LINES_EXTENSIONS):
+            yield from _iter_json_lines(f)
+            return
+
+        buffer = _read_non_whitespace(f)
+        if not buffer:
+            return
+
+        if buffer[0] == "[":
+            yield from _iter_json_array(f, buffer[1:])
+            return
+
+        # Either JSON Lines without the extension or a wrapped object
+        first_line, newline, rest = buffer.partition("\n")
+        while not newline:
+            chunk = f.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            more_line, newline, rest = chunk.partition("\n")
+            first_line += more_line
+        try:
+            first_item = json.loads(first_line)
+            is_json_lines = isinstance(first_item, dict) and "items" not in first_item
+        except json.JSONDecodeError:
+            is_json_lines = False
+
+        if is_json_lines:
+            yield first_item
+            yield from _iter_json_lines(f, rest.splitlines())
+        else:
+            data = json.loads(first_line + newline + rest + f.read())
+            items = data if isinstance(data, list) else data.get('items', [])
+            yield from items
+
+def transform_scraped_item(idx, item):
+    """
+    Maps one scraped item to the system's comment schema.
+    """
+    comment = {
+        "id": idx + 1,
+        "text": item.get("text", ""),
+        "platform": "sikayetvar", # Since source is known
+        "date": parse_turkish_date(item.get("date"))
+    }
+    # Incremental runs use the scraper's fingerprint to recognize analyzed complaints
+    if item.get("fingerprint"):
+        comment["fingerprint"] = item["fingerprint"]
+    return comment
+
+def stream_scraped_data(file_path):
+    """
+    Streaming counterpart of load_scraped_data: same result shape, but "comments"
+    is an iterator that parses the file lazily, so memory stays flat for large dumps.
+    """
+    logger.info(f"Streaming scraped data from {file_path}")
+    if not os.path.exists(file_path):
+        logger.error(f"Scraped file not found: {file_path}")
+        return None
+
+    items = iter_scraped_items(file_path)
+    try:
+        first = next(items, None)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        logger.error(f"Invalid JSON in: {file_path}")
+        return None
+
+    if first is None:
+        return {"comments": iter(())}
+
+    result = {
+        "comments": (
+            transform_scraped_item(idx, item)
+            for idx, item in enumerate(itertools.chain([first], items))
+        )
+    }
+    # Infer brand from the first item
+    if "company" in first:
+        result["brand"] = first["company"]
+    return result
+
 def load_scraped_data(file_path):
     """
     Loads scraped data from JSON and transforms it to the system's input schema.
@@ -72,13 +226,7 @@ def load_scraped_data(file_path):
     items = data if isinstance(data, list) else data.get('items', [])
     
     for idx, item in enumerate(items):
-        comment = {
-            "id": idx + 1,
-            "text": item.get("text", ""),
-            "platform": "sikayetvar", # Since source is known
-            "date": parse_turkish_date(item.get("date"))
-        }
-        transformed_comments.append(comment)
+        transformed_comments.append(transform_scraped_item(idx, item))
 
     # Determine brand/goal if possible, or use defaults/from args
     # For now, we return just the comments list and maybe basic metdata
@@ -0,0 +1,128 @@
+import re
+import zlib
+import hashlib
+import logging
+from collections import Counter
+
+logger = logging.getLogger(__name__)
+
+# Mersenne prime for the universal hash family used by MinHash
+MERSENNE_PRIME = (1 << 31) - 1
+PUNCTUATION_RE = re.compile(r'[^\w\s]')
+WHITESPACE_RE = re.compile(r'\s+')
+
+def normalize_for_dedup(text):
+    """
+    Lowercased, punctuation-free, whitespace-collapsed text; re-posts that differ
+    only in casing or punctuation become identical.
+    """
+    text = PUNCTUATION_RE.sub(' ', text.casefold())
+    return WHITESPACE_RE.sub(' ', text).strip()
+
+class Deduplicator:
+    """
+    Groups exact duplicates (hash of normalized text) and near-duplicates
+    (MinHash signatures over character shingles, banded LSH, verified by
+    estimated Jaccard similarity against the cluster representative).
+    """
+    def __init__(self, threshold=0.8, num_perm=64, bands=16, shingle_size=5, seed=42):
+        import numpy as np
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        rng = np.random.default_rng(seed)
+        self.hash_a = rng.integers(1, MERSENNE_PRIME, size=(num_perm, 1), dtype=np.uint64)
+        self.hash_b = rng.integers(0, MERSENNE_PRIME, size=(num_perm, 1), dtype=np.uint64)
+
+        self.clusters = []          # cluster id -> list of member comments (first is the representative)
+        self.exact_index = {}       # normalized text hash -> cluster id
+        self.signatures = []        # cluster id -> representative MinHash signature
+        self.lsh_buckets = {}       # (band, band signature) -> [cluster ids]
+
+    def _signature(self, normalized):
+        import numpy as np
+        k = self.shingle_size
+        shingles = {normalized[i:i + k] for i in range(max(1, len(normalized) - k + 1))}
+        hashes = np.fromiter((zlib.crc32(s.encode('utf-8')) for s in shingles), dtype=np.uint64, count=len(shingles))
+        # (a * x + b) mod p for every hash function at once, minimum per function
+        return ((self.hash_a * hashes[None, :] + self.hash_b) % MERSENNE_PRIME).min(axis=1)
+
+    def _band_keys(self, signature):
+        return [
+            (band, signature[band * self.rows:(band + 1) * self.rows].tobytes())
+            for band in range(self.bands)
+        ]
+
+    def add(self, comment):
+        """
+        Assigns a comment to a cluster and returns the cluster id.
+        """
+        normalized = normalize_for_dedup(comment['text'])
+        digest = hashlib.sha1(normalized.encode('utf-8')).digest()
+
+        cluster_id = self.exact_index.get(digest)
+        if cluster_id is None and normalized:
+            signature = self._signature(normalized)
+            band_keys = self._band_keys(signature)
+            candidates = dict.fromkeys(
+                candidate for key in band_keys for candidate in self.lsh_buckets.get(key, ())
+            )
+            for candidate in candidates:
+                similarity = float((self.signatures[candidate] == signature).mean())
+                if similarity >= self.threshold:
+                    cluster_id = candidate
+                    break
+
+            if cluster_id is None:
+                cluster_id = len(self.clusters)
+                self.clusters.append([])
+                self.signatures.append(signature)
+                for key in band_keys:
+                    self.lsh_buckets.setdefault(key, []).append(cluster_id)
+            self.exact_index[digest] = cluster_id
+        elif cluster_id is None:
+            # Empty after normalization: only exact duplicates can match
+            cluster_id = len(self.clusters)
+            self.clusters.append([])
+            self.signatures.append(None)
+            self.exact_index[digest] = cluster_id
+
+        self.clusters[cluster_id].append(comment)
+        return cluster_id
+
+    def cluster(self, comments):
+        """
+        Clusters all comments; returns a list of member lists, representative first.
+        """
+        total = 0
+        for comment in comments:
+            self.add(comment)
+            total += 1
+        if total:
+            logger.info(f"Deduplication: {total} comments -> {len(self.clusters)} clusters "
+                        f"({1 - len(self.clusters) / total:.1%} duplicates)")
+        return self.clusters
+
+def fan_out(processed, members):
+    """
+    Copies a representative's result (sentiment, topic) to every member of its cluster.
+    """
+    return [
+        dict(processed, id=m['id'], text=m['text'], platform=m.get('platform'), date=m.get('date'))
+        for m in members
+    ]
+
+def weighted_members(processed, members):
+    """
+    Collapses a cluster into (result, weight) pairs, one per distinct (platform, date),
+    so aggregation sees cluster weights without losing per-platform/per-date breakdowns.
+    """
+    groups = Counter((m.get('platform'), m.get('date')) for m in members)
+    return [
+        (dict(processed, platform=platform, date=date), weight)
+        for (platform, date), weight in groups.items()
+    ]
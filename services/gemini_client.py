@@ -1,31 +1,52 @@
-import google.generativeai as genai
-import yaml
 import os
-from dotenv import load_dotenv
-
-load_dotenv()
+from config.settings import get_settings
+from services.cache import get_llm_cache, make_key
+from services.instrumentation import get_instrumentation
 
 # Load config
-config_path = os.path.join(os.path.dirname(__file__), '..', 'config', 'settings.yaml')
-with open(config_path, 'r') as f:
-    config = yaml.safe_load(f)
+config = get_settings()
 
 API_KEY = config['gemini'].get('api_key') or os.getenv("GEMINI_API_KEY")
 MODEL_NAME = config['gemini']['model_name']
 
-if not API_KEY:
-    # Fallback or warning
-    print("WARNING: Gemini API Key not found in settings or env vars.")
+_genai_configured = False
 
-genai.configure(api_key=API_KEY)
+def get_genai():
+    """
+    Imports and configures google.generativeai on first use (the SDK import is slow).
+    """
+    global _genai_configured
+    import google.generativeai as genai
+    if not _genai_configured:
+        if not API_KEY:
+            # Fallback or warning
+            print("WARNING: Gemini API Key not found in settings or env vars.")
+        genai.configure(api_key=API_KEY)
+        _genai_configured = True
+    return genai
 
 class GeminiClient:
     def __init__(self):
-        self.model = genai.GenerativeModel(MODEL_NAME)
+        self._model = None
+        self.cache = get_llm_cache()
+
+    @property
+    def model(self):
+        if self._model is None:
+            self._model = get_genai().GenerativeModel(MODEL_NAME)
+        return self._model
 
     def generate_content(self, prompt):
+        cache_key = make_key("gemini", MODEL_NAME, prompt)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         try:
             response = self.model.generate_content(prompt)
+            get_instrumentation().count_llm_call("gemini", prompt, response.text)
+            if response.text:
+                self.cache.set(cache_key, response.text)
             return response.text
         except Exception as e:
             print(f"Error generating content: {e}")
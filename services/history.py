@@ -0,0 +1,62 @@
+import json
+import os
+import logging
+from services.cache import make_key, normalize_text
+from pipelines.aggregation_pipeline import IncrementalAggregator, NEGATIVE_THRESHOLD
+
+logger = logging.getLogger(__name__)
+
+def comment_fingerprint(comment):
+    """
+    The scraper's fingerprint when it provided one, otherwise a hash of the normalized text.
+    """
+    return comment.get("fingerprint") or make_key(normalize_text(comment["text"]))[:32]
+
+class CompanyHistory:
+    """
+    Persistent per-company state for incremental runs: the fingerprints of every
+    complaint analyzed so far and the merged aggregate of their results.
+    Both live in one JSON file that is replaced atomically, so they never disagree.
+    """
+    def __init__(self, path, negative_threshold=NEGATIVE_THRESHOLD):
+        self.path = path
+        self.seen = set()
+        self.aggregator = IncrementalAggregator(negative_threshold=negative_threshold)
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            stored_threshold = state["aggregate"]["negative_threshold"]
+            # Checked on load: merging the new results would otherwise fail only after the whole run
+            if stored_threshold != negative_threshold:
+                raise ValueError(
+                    f"History {path} was built with negative threshold {stored_threshold}, but the current "
+                    f"threshold is {negative_threshold}. Restore sentiment.threshold or move the history file "
+                    f"away to start a new baseline."
+                )
+            self.seen = set(state.get("seen", []))
+            self.aggregator = IncrementalAggregator.from_dict(state["aggregate"])
+            logger.info(f"Loaded history from {path}: {len(self.seen)} complaints analyzed before.")
+
+    def is_seen(self, comment):
+        return comment_fingerprint(comment) in self.seen
+
+    def commit(self, delta_aggregator, fingerprints):
+        """
+        Merges the aggregate of newly analyzed comments and records their fingerprints.
+        """
+        self.aggregator.merge(delta_aggregator)
+        self.seen.update(fingerprints)
+        self.save()
+
+    def save(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        state = {
+            "seen": sorted(self.seen),
+            "aggregate": self.aggregator.to_dict()
+        }
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
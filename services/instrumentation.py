@@ -0,0 +1,217 @@
+import json
+import sys
+import threading
+import time
+from config.settings import get_settings
+from services.resilience import LatencyHistogram
+
+# Load config
+config = get_settings()
+
+INSTRUMENTATION_CONFIG = config.get('instrumentation', {})
+
+def peak_rss_bytes(who=None):
+    """
+    Peak resident set size of this process (or of its finished children, e.g. sentiment workers).
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    usage = resource.getrusage(who if who is not None else resource.RUSAGE_SELF)
+    # ru_maxrss is in bytes on macOS, kilobytes elsewhere
+    return usage.ru_maxrss if sys.platform == "darwin" else usage.ru_maxrss * 1024
+
+class _NullStage:
+    """
+    Stand-in returned while instrumentation is disabled: every call is a no-op.
+    """
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def add_items(self, count):
+        pass
+
+NULL_STAGE = _NullStage()
+
+class _Stage:
+    def __init__(self, instrumentation, name, items):
+        self.instrumentation = instrumentation
+        self.name = name
+        self.items = items
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.instrumentation.observe(self.name, time.perf_counter() - self.started, self.items)
+        return False
+
+    def add_items(self, count):
+        self.items += count
+
+class _StageStats:
+    __slots__ = ("calls", "seconds", "items", "item_latency")
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.items = 0
+        self.item_latency = LatencyHistogram()
+
+class Instrumentation:
+    """
+    Per-stage wall time, item throughput and per-item latency, LLM call/token counts and
+    gauges for one process. Disabled instances hand out no-op stages and return immediately.
+    """
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.started = time.perf_counter()
+            self.stages = {}
+            self.gauges = {}
+            self.llm_calls = {}
+
+    def stage(self, name, items=0):
+        """
+        Context manager timing one stage run; `items` (or add_items) sets how many
+        items it covered, for throughput and per-item latency.
+        """
+        if not self.enabled:
+            return NULL_STAGE
+        return _Stage(self, name, items)
+
+    def observe(self, name, seconds, items=0):
+        if not self.enabled:
+            return
+        with self.lock:
+            stats = self.stages.get(name)
+            if stats is None:
+                stats = self.stages[name] = _StageStats()
+            stats.calls += 1
+            stats.seconds += seconds
+            stats.items += items
+        if items:
+            # A batch's items are all credited with the batch's average latency
+            stats.item_latency.record(seconds / items, items)
+
+    def gauge(self, name, value):
+        if not self.enabled:
+            return
+        with self.lock:
+            self.gauges[name] = value
+
+    def count_llm_call(self, provider, prompt, response):
+        if not self.enabled:
+            return
+        from services.async_llm_client import estimate_tokens
+        with self.lock:
+            counts = self.llm_calls.setdefault(provider, {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0})
+            counts["calls"] += 1
+            counts["prompt_tokens"] += estimate_tokens(prompt)
+            counts["completion_tokens"] += estimate_tokens(response) if response else 0
+
+    def summary(self):
+        from services import registry
+        from services.cache import get_llm_cache, get_sentiment_cache
+
+        stages = {}
+        with self.lock:
+            for name, stats in self.stages.items():
+                stages[name] = {
+                    "calls": stats.calls,
+                    "wall_seconds": stats.seconds,
+                    "items": stats.items,
+                    "items_per_second": stats.items / stats.seconds if stats.items and stats.seconds else None,
+                    "item_latency_seconds": {
+                        key: stats.item_latency.percentile(q)
+                        for key, q in (("p50", 50), ("p95", 95), ("p99", 99))
+                    } if stats.items else None
+                }
+            gauges = dict(self.gauges)
+            llm_calls = {provider: dict(counts) for provider, counts in self.llm_calls.items()}
+
+        try:
+            import resource
+            children_rss = peak_rss_bytes(resource.RUSAGE_CHILDREN)
+        except ImportError:
+            children_rss = None
+
+        llm_service = registry.peek("llm_service")
+        return {
+            "wall_seconds": time.perf_counter() - self.started,
+            "stages": stages,
+            "gauges": gauges,
+            "peak_rss_bytes": peak_rss_bytes(),
+            "peak_rss_children_bytes": children_rss,
+            # Token counts are estimates (characters / 4), not provider billing numbers
+            "llm_calls": llm_calls,
+            "llm_latency": llm_service.latency_stats() if hasattr(llm_service, "latency_stats") else None,
+            "cache": {
+                "llm": get_llm_cache().stats(),
+                "sentiment": get_sentiment_cache().stats()
+            }
+        }
+
+    def write_json(self, path, summary=None):
+        with open(path, 'w') as f:
+            json.dump(summary or self.summary(), f, indent=2)
+
+    def write_prometheus(self, path, summary=None):
+        """
+        Writes the summary in Prometheus text exposition format (for a node_exporter textfile collector).
+        """
+        summary = summary or self.summary()
+        lines = []
+
+        def metric(name, help_text, samples):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} gauge")
+            for labels, value in samples:
+                if value is None:
+                    continue
+                label_text = ",".join(f'{key}="{val}"' for key, val in labels.items())
+                lines.append(f"{name}{{{label_text}}} {value}" if label_text else f"{name} {value}")
+
+        stages = summary["stages"]
+        metric("nlp_run_wall_seconds", "Wall time of the run.", [({}, summary["wall_seconds"])])
+        metric("nlp_stage_wall_seconds", "Total wall time per stage.",
+               [({"stage": name}, s["wall_seconds"]) for name, s in stages.items()])
+        metric("nlp_stage_items", "Items processed per stage.",
+               [({"stage": name}, s["items"]) for name, s in stages.items()])
+        metric("nlp_stage_items_per_second", "Stage throughput.",
+               [({"stage": name}, s["items_per_second"]) for name, s in stages.items()])
+        metric("nlp_stage_item_latency_seconds", "Per-item latency percentiles per stage.",
+               [({"stage": name, "quantile": q}, s["item_latency_seconds"][key])
+                for name, s in stages.items() if s["item_latency_seconds"]
+                for key, q in (("p50", "0.5"), ("p95", "0.95"), ("p99", "0.99"))])
+        metric("nlp_gauge", "Run gauges.", [({"name": name}, value) for name, value in summary["gauges"].items()])
+        metric("nlp_peak_rss_bytes", "Peak resident set size.",
+               [({"process": "main"}, summary["peak_rss_bytes"]),
+                ({"process": "children"}, summary["peak_rss_children_bytes"])])
+        metric("nlp_llm_calls", "LLM calls per provider.",
+               [({"provider": p}, c["calls"]) for p, c in summary["llm_calls"].items()])
+        metric("nlp_llm_tokens_estimated", "Estimated LLM tokens per provider.",
+               [({"provider": p, "kind": kind}, c[f"{kind}_tokens"])
+                for p, c in summary["llm_calls"].items() for kind in ("prompt", "completion")])
+        metric("nlp_cache_hit_ratio", "Cache hit rate.",
+               [({"cache": name}, stats["hit_rate"]) for name, stats in summary["cache"].items()])
+
+        with open(path, 'w') as f:
+            f.write("\n".join(lines) + "\n")
+
+_instrumentation = Instrumentation(enabled=INSTRUMENTATION_CONFIG.get('enabled', False))
+
+def get_instrumentation():
+    """
+    Process-wide instrumentation, enabled by `instrumentation.enabled` in settings.yaml or main.py --metrics.
+    """
+    return _instrumentation
@@ -1,23 +1,19 @@
-import google.generativeai as genai
-import openai
-import yaml
 import os
+import queue
+import threading
+import time
 import logging
-from dotenv import load_dotenv
-
-load_dotenv()
+from concurrent.futures import Future, wait, FIRST_COMPLETED
+from config.settings import get_settings
+from services.cache import get_llm_cache, make_key
+from services.resilience import CircuitBreaker, LatencyHistogram
+from services.instrumentation import get_instrumentation
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
 # Load config
-config_path = os.path.join(os.path.dirname(__file__), '..', 'config', 'settings.yaml')
-try:
-    with open(config_path, 'r') as f:
-        config = yaml.safe_load(f)
-except Exception as e:
-    logger.error(f"Failed to load settings.yaml: {e}")
-    config = {"gemini": {}}
+config = get_settings()
 
 # Gemini Config
 GEMINI_API_KEY = config.get('gemini', {}).get('api_key') or os.getenv("GEMINI_API_KEY")
@@ -25,52 +21,354 @@ GEMINI_MODEL_NAME = config.get('gemini', {}).get('model_name', "gemini-pro")
 
 # OpenAI Config
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-OPENAI_MODEL_NAME = "gpt-4-turbo"
+OPENAI_MODEL_NAME = config.get('openai', {}).get('model_name', "gpt-4-turbo")
+
+# Hedging / resilience config
+SERVICE_CONFIG = config.get('llm_service', {})
+BREAKER_CONFIG = SERVICE_CONFIG.get('circuit_breaker', {})
+HEDGING = SERVICE_CONFIG.get('hedging', True)
+HEDGE_DELAY_SECONDS = SERVICE_CONFIG.get('hedge_delay_seconds', 3.0)
+HEDGE_ON_P95 = SERVICE_CONFIG.get('hedge_on_p95', True)
+HEDGE_MIN_SAMPLES = SERVICE_CONFIG.get('hedge_min_samples', 20)
+REQUEST_TIMEOUT_SECONDS = SERVICE_CONFIG.get('request_timeout_seconds', 60)
 
-if GEMINI_API_KEY:
-    genai.configure(api_key=GEMINI_API_KEY)
+def run_in_daemon_thread(fn, *args):
+    """
+    Runs fn on a daemon thread and returns its Future. Unlike ThreadPoolExecutor workers,
+    an abandoned hedged call does not hold up interpreter exit until it times out.
+    """
+    future = Future()
 
-if OPENAI_API_KEY:
-    openai.api_key = OPENAI_API_KEY
+    def run():
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(fn(*args))
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=run, name="llm-hedge", daemon=True).start()
+    return future
 
 class LLMService:
-    def __init__(self):
-        self.gemini_model = None
+    """
+    OpenAI first, Gemini as fallback. In hedged mode Gemini is started when OpenAI is
+    slower than the hedge delay (or its own p95) and the first good answer wins; streams
+    race on time to first chunk. Each provider has a circuit breaker and latency histograms.
+    """
+    PROVIDERS = ("openai", "gemini")
+
+    def __init__(self, hedging=HEDGING, hedge_delay=HEDGE_DELAY_SECONDS, hedge_on_p95=HEDGE_ON_P95):
+        # Provider SDKs are imported and configured on first use
+        self._gemini_model = None
+        self._openai = None
+        self.cache = get_llm_cache()
+        self.hedging = hedging
+        self.hedge_delay = hedge_delay
+        self.hedge_on_p95 = hedge_on_p95
+        self.breakers = {
+            name: CircuitBreaker(
+                BREAKER_CONFIG.get('failure_threshold', 3),
+                BREAKER_CONFIG.get('reset_seconds', 60)
+            )
+            for name in self.PROVIDERS
+        }
+        # Full-response latency (generate_content) and time to first chunk (stream_content)
+        self.latency = {name: LatencyHistogram() for name in self.PROVIDERS}
+        self.first_chunk_latency = {name: LatencyHistogram() for name in self.PROVIDERS}
+
+    @property
+    def gemini_model(self):
+        if self._gemini_model is None and GEMINI_API_KEY:
+            from services.gemini_client import get_genai
+            self._gemini_model = get_genai().GenerativeModel(GEMINI_MODEL_NAME)
+        return self._gemini_model
+
+    @property
+    def openai(self):
+        if self._openai is None and OPENAI_API_KEY:
+            import openai
+            openai.api_key = OPENAI_API_KEY
+            self._openai = openai
+        return self._openai
+
+    def _cached_response(self, prompt):
+        # Any configured provider's earlier answer is good enough
+        if OPENAI_API_KEY:
+            cached = self.cache.get(make_key("openai", OPENAI_MODEL_NAME, prompt))
+            if cached is not None:
+                return cached
         if GEMINI_API_KEY:
-             self.gemini_model = genai.GenerativeModel(GEMINI_MODEL_NAME)
-        
-    def generate_content(self, prompt):
-        """
-        Generates content using OpenAI, falling back to Gemini if necessary.
-        """
-        # 1. Try OpenAI
+            return self.cache.get(make_key("gemini", GEMINI_MODEL_NAME, prompt))
+        return None
+
+    def _configured_providers(self):
+        providers = []
         if OPENAI_API_KEY:
-            try:
-                logger.info("Attempting to generate content with OpenAI...")
-                response = openai.chat.completions.create(
-                    model=OPENAI_MODEL_NAME,
-                    messages=[
-                        {"role": "system", "content": "You are a helpful assistant generating reports."},
-                        {"role": "user", "content": prompt}
-                    ]
-                )
-                if response.choices and response.choices[0].message.content:
-                    return response.choices[0].message.content
-            except Exception as e:
-                logger.warning(f"OpenAI generation failed: {e}. Switching to fallback...")
+            providers.append("openai")
         else:
             logger.warning("OpenAI API Key not configured.")
+        if GEMINI_API_KEY:
+            providers.append("gemini")
+        return providers
 
-        # 2. Fallback to Gemini
-        if self.gemini_model:
-            try:
-                logger.info("Attempting to generate content with Gemini...")
-                response = self.gemini_model.generate_content(prompt)
-                if response.text:
-                    return response.text
-            except Exception as e:
-                logger.error(f"Gemini generation failed: {e}")
+    def _request_openai(self, prompt):
+        response = self.openai.chat.completions.create(
+            model=OPENAI_MODEL_NAME,
+            messages=[
+                {"role": "system", "content": "You are a helpful assistant generating reports."},
+                {"role": "user", "content": prompt}
+            ],
+            timeout=REQUEST_TIMEOUT_SECONDS
+        )
+        if response.choices and response.choices[0].message.content:
+            return response.choices[0].message.content
+        return ""
+
+    def _request_gemini(self, prompt):
+        response = self.gemini_model.generate_content(
+            prompt, request_options={"timeout": REQUEST_TIMEOUT_SECONDS}
+        )
+        return response.text or ""
+
+    def _call(self, provider, prompt):
+        """
+        One provider call with latency, circuit-breaker and cache bookkeeping.
+        Returns "" on failure.
+        """
+        logger.info(f"Attempting to generate content with {provider}...")
+        request = self._request_openai if provider == "openai" else self._request_gemini
+        model_name = OPENAI_MODEL_NAME if provider == "openai" else GEMINI_MODEL_NAME
+        started = time.perf_counter()
+        try:
+            content = request(prompt)
+        except Exception as e:
+            logger.warning(f"{provider} generation failed: {e}")
+            content = ""
+        get_instrumentation().count_llm_call(provider, prompt, content)
+        if content:
+            self.latency[provider].record(time.perf_counter() - started)
+            self.breakers[provider].record_success()
+            self.cache.set(make_key(provider, model_name, prompt), content)
         else:
-            logger.warning("Gemini API Key not configured or fallback failed.")
-            
+            self.breakers[provider].record_failure()
+        return content
+
+    def hedge_delay_for(self, provider, streaming=False):
+        """
+        Seconds to wait for `provider` (for its first chunk when streaming) before starting the next one.
+        """
+        histogram = self.first_chunk_latency[provider] if streaming else self.latency[provider]
+        if self.hedge_on_p95 and histogram.total >= HEDGE_MIN_SAMPLES:
+            return histogram.percentile(95)
+        return self.hedge_delay
+
+    def _next_allowed(self, providers):
+        for provider in providers:
+            if self.breakers[provider].allow():
+                return provider
+            logger.warning(f"{provider} circuit breaker is open, skipping.")
+        return None
+
+    def _generate_hedged(self, prompt, providers):
+        providers = iter(providers)
+        primary = self._next_allowed(providers)
+        if primary is None:
+            return ""
+        pending = {run_in_daemon_thread(self._call, primary, prompt)}
+        hedged = False
+        delay = self.hedge_delay_for(primary)
+
+        while pending:
+            done, pending = wait(pending, timeout=None if hedged else delay, return_when=FIRST_COMPLETED)
+            for future in done:
+                content = future.result()
+                if content:
+                    # A call already running cannot be interrupted; its late answer is only cached
+                    for other in pending:
+                        other.cancel()
+                    return content
+            if not hedged:
+                # Primary timed out on the hedge delay or failed outright
+                hedged = True
+                secondary = self._next_allowed(providers)
+                if secondary:
+                    logger.info(f"{primary} did not answer within {delay:.2f}s, hedging with {secondary}...")
+                    pending.add(run_in_daemon_thread(self._call, secondary, prompt))
         return ""
+
+    def generate_content(self, prompt):
+        """
+        Generates content using OpenAI, falling back to (or hedging with) Gemini.
+        Responses are served from / stored in the local LLM cache.
+        """
+        cached = self._cached_response(prompt)
+        if cached is not None:
+            logger.info("Serving content from LLM cache.")
+            return cached
+
+        providers = self._configured_providers()
+        if self.hedging and len(providers) > 1:
+            return self._generate_hedged(prompt, providers)
+
+        for provider in providers:
+            if not self.breakers[provider].allow():
+                logger.warning(f"{provider} circuit breaker is open, skipping.")
+                continue
+            content = self._call(provider, prompt)
+            if content:
+                return content
+            logger.warning(f"{provider} returned no content. Switching to fallback...")
+        return ""
+
+    def latency_stats(self):
+        """
+        Per-provider call count and p50/p95/p99 latency (seconds), plus breaker state.
+        """
+        return {
+            name: {
+                **self.latency[name].summary(),
+                "first_chunk": self.first_chunk_latency[name].summary(),
+                "circuit": self.breakers[name].state
+            }
+            for name in self.PROVIDERS
+        }
+
+    def _open_stream(self, provider, prompt):
+        """
+        Text chunks from one provider's streaming API.
+        """
+        if provider == "openai":
+            stream = self.openai.chat.completions.create(
+                model=OPENAI_MODEL_NAME,
+                messages=[
+                    {"role": "system", "content": "You are a helpful assistant generating reports."},
+                    {"role": "user", "content": prompt}
+                ],
+                stream=True,
+                timeout=REQUEST_TIMEOUT_SECONDS
+            )
+            for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    yield delta
+        else:
+            stream = self.gemini_model.generate_content(
+                prompt, stream=True, request_options={"timeout": REQUEST_TIMEOUT_SECONDS}
+            )
+            for chunk in stream:
+                if chunk.text:
+                    yield chunk.text
+
+    def _stream_worker(self, provider, prompt, events, cancelled):
+        """
+        Pumps one provider's stream into `events` as ("chunk", provider, text) and a final
+        ("done", provider, error). Stops early once `cancelled` is set (another stream won).
+        """
+        logger.info(f"Streaming content from {provider}...")
+        model_name = OPENAI_MODEL_NAME if provider == "openai" else GEMINI_MODEL_NAME
+        parts = []
+        error = None
+        started = time.perf_counter()
+        try:
+            for text in self._open_stream(provider, prompt):
+                if cancelled.is_set():
+                    break
+                if not parts:
+                    self.first_chunk_latency[provider].record(time.perf_counter() - started)
+                parts.append(text)
+                events.put(("chunk", provider, text))
+        except Exception as e:
+            error = e
+        get_instrumentation().count_llm_call(provider, prompt, "".join(parts))
+        # Losing the race is not a provider failure
+        if error is not None or not (parts or cancelled.is_set()):
+            self.breakers[provider].record_failure()
+        elif parts:
+            self.breakers[provider].record_success()
+            if not cancelled.is_set():
+                # Only complete responses are cached
+                self.cache.set(make_key(provider, model_name, prompt), "".join(parts))
+        events.put(("done", provider, error))
+
+    def stream_content(self, prompt):
+        """
+        Streaming counterpart of generate_content: yields text chunks as the provider
+        produces them. Gemini is started if OpenAI fails before its first chunk or, in
+        hedged mode, gives no first chunk within the hedge delay; the first stream to
+        produce a chunk is used and the other is dropped. Only complete responses are cached.
+        """
+        cached = self._cached_response(prompt)
+        if cached is not None:
+            logger.info("Serving content from LLM cache.")
+            yield cached
+            return
+
+        providers = iter(self._configured_providers())
+        primary = self._next_allowed(providers)
+        if primary is None:
+            logger.warning("No LLM provider available for streaming.")
+            return
+
+        events = queue.Queue()
+        cancelled = {}
+
+        def start(provider):
+            cancelled[provider] = threading.Event()
+            threading.Thread(
+                target=self._stream_worker, args=(provider, prompt, events, cancelled[provider]),
+                name="llm-stream", daemon=True
+            ).start()
+
+        start(primary)
+        running = {primary}
+        winner = None
+        fallback_started = False
+        hedge_at = time.monotonic() + self.hedge_delay_for(primary, streaming=True) if self.hedging else None
+
+        try:
+            while running:
+                waiting_for_hedge = hedge_at is not None and winner is None and not fallback_started
+                try:
+                    kind, provider, payload = events.get(
+                        timeout=max(0.0, hedge_at - time.monotonic()) if waiting_for_hedge else None
+                    )
+                except queue.Empty:
+                    fallback_started = True
+                    secondary = self._next_allowed(providers)
+                    if secondary:
+                        logger.info(f"{primary} gave no first chunk in time, hedging with {secondary}...")
+                        start(secondary)
+                        running.add(secondary)
+                    continue
+
+                if kind == "chunk":
+                    if winner is None:
+                        winner = provider
+                        for other, event in cancelled.items():
+                            if other != winner:
+                                event.set()
+                    if provider == winner:
+                        yield payload
+                    continue
+
+                # kind == "done"
+                running.discard(provider)
+                if provider == winner:
+                    if payload is not None:
+                        # Part of the answer is already out; switching provider would garble it
+                        logger.error(f"{provider} stream interrupted: {payload}")
+                    return
+                if winner is None:
+                    logger.warning(f"{provider} generation failed: {payload or 'empty response'}")
+                    if not fallback_started:
+                        fallback_started = True
+                        secondary = self._next_allowed(providers)
+                        if secondary:
+                            logger.info(f"Switching to fallback {secondary}...")
+                            start(secondary)
+                            running.add(secondary)
+        finally:
+            # Consumer stopped early or a stream won: stop pumping the others
+            for event in cancelled.values():
+                event.set()
@@ -0,0 +1,269 @@
+import os
+import re
+import threading
+import logging
+from config.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Load config
+config = get_settings()
+
+PDF_CONFIG = config.get('pdf', {})
+
+# (regular, bold) Unicode TTFs tried when settings.yaml does not name one
+FONT_CANDIDATES = [
+    ("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf"),
+    ("/usr/share/fonts/dejavu/DejaVuSans.ttf", "/usr/share/fonts/dejavu/DejaVuSans-Bold.ttf"),
+    ("/usr/share/fonts/TTF/DejaVuSans.ttf", "/usr/share/fonts/TTF/DejaVuSans-Bold.ttf"),
+    ("/Library/Fonts/Arial Unicode.ttf", None),
+    ("/System/Library/Fonts/Supplemental/Arial.ttf", "/System/Library/Fonts/Supplemental/Arial Bold.ttf"),
+    ("C:/Windows/Fonts/arial.ttf", "C:/Windows/Fonts/arialbd.ttf"),
+]
+
+# Emoji and pictographs (LLM headings like "📊") have no glyphs in text fonts
+_EMOJI = {cp: None for start, end in ((0x1F000, 0x1FAFF), (0x2600, 0x27BF), (0xFE00, 0xFE0F)) for cp in range(start, end + 1)}
+_EMOJI[0x200D] = None
+
+# Used with an embedded Unicode font: only drops emoji
+UNICODE_TABLE = str.maketrans(_EMOJI)
+
+# Used with the core-font fallback (latin-1 only). ü, ö, ç, â, î, û are latin-1 and kept as is;
+# anything still outside latin-1 afterwards becomes "?"
+LATIN1_TABLE = str.maketrans({
+    **_EMOJI,
+    'ğ': 'g', 'Ğ': 'G', 'ş': 's', 'Ş': 'S', 'ı': 'i', 'İ': 'I',
+    '•': '-', '–': '-', '—': '-', '…': '...',
+    '‘': "'", '’': "'", '“': '"', '”': '"',
+})
+
+HEADING_RE = re.compile(r'^(#{1,6})\s*(.*)$')
+BULLET_RE = re.compile(r'^\s*[*+-]\s+(.*)$')
+NUMBERED_RE = re.compile(r'^\s*(\d+[.)])\s+(.*)$')
+RULE_RE = re.compile(r'^\s*([-*_])(\s*\1){2,}\s*$')
+
+def find_fonts(font_path=None, bold_font_path=None):
+    """
+    (regular, bold) TTF paths to embed; (None, None) when no Unicode font is available.
+    """
+    if font_path:
+        if not os.path.exists(font_path):
+            raise FileNotFoundError(f"PDF font not found: {font_path}")
+        return font_path, bold_font_path if bold_font_path and os.path.exists(bold_font_path) else None
+    for regular, bold in FONT_CANDIDATES:
+        if os.path.exists(regular):
+            return regular, bold if bold and os.path.exists(bold) else None
+    return None, None
+
+def parse_markdown_blocks(markdown):
+    """
+    Splits report markdown into ("heading" | "bullet" | "numbered" | "paragraph" | "rule", text) blocks.
+    Numbered items keep their original marker ("2. ..."). Consecutive text lines are joined into one paragraph.
+    """
+    blocks = []
+    paragraph = []
+
+    def end_paragraph():
+        if paragraph:
+            blocks.append(("paragraph", " ".join(paragraph)))
+            paragraph.clear()
+
+    for line in markdown.splitlines():
+        stripped = line.strip()
+        if not stripped:
+            end_paragraph()
+            continue
+        heading = HEADING_RE.match(stripped)
+        if heading:
+            end_paragraph()
+            blocks.append(("heading", heading.group(2).strip()))
+            continue
+        if RULE_RE.match(stripped):
+            end_paragraph()
+            blocks.append(("rule", ""))
+            continue
+        bullet = BULLET_RE.match(line)
+        if bullet:
+            end_paragraph()
+            blocks.append(("bullet", bullet.group(1).strip()))
+            continue
+        numbered = NUMBERED_RE.match(line)
+        if numbered:
+            end_paragraph()
+            blocks.append(("numbered", f"{numbered.group(1)} {numbered.group(2).strip()}"))
+            continue
+        paragraph.append(stripped)
+    end_paragraph()
+    return blocks
+
+def split_bold(text):
+    """
+    (bold, word, space_before) tokens for text with inline **bold** markers.
+    """
+    tokens = []
+    space_before = False
+    for i, segment in enumerate(text.split('**')):
+        bold = i % 2 == 1
+        if segment[:1].isspace():
+            space_before = True
+        for word in segment.split():
+            tokens.append((bold, word, space_before and bool(tokens)))
+            space_before = True
+        space_before = segment[-1:].isspace()
+    return tokens
+
+class PDFReportRenderer:
+    """
+    Renders a markdown report and its key metrics to PDF bytes in memory.
+    Embeds a Unicode TTF (Turkish text is kept as is); without one, falls back to the
+    core Helvetica font with latin-1 transliteration. Reusable for many documents.
+    """
+    # Word widths are cached across documents; cleared past this many entries
+    MAX_CACHED_WIDTHS = 50000
+
+    def __init__(self, font_path=PDF_CONFIG.get('font_path'), bold_font_path=PDF_CONFIG.get('bold_font_path'),
+                 title=PDF_CONFIG.get('title', 'Sentiment Intelligence Report'),
+                 embed_font=PDF_CONFIG.get('embed_font', True)):
+        # Font files are located once per renderer, not per document
+        self.font_path, self.bold_font_path = find_fonts(font_path, bold_font_path) if embed_font else (None, None)
+        self.title = title
+        if embed_font and self.font_path is None:
+            logger.warning("No Unicode TTF font found; PDF text falls back to latin-1 transliteration.")
+        self.family = 'report' if self.font_path else 'helvetica'
+        self.table = UNICODE_TABLE if self.font_path else LATIN1_TABLE
+        # Without a bold face, inline **bold** is rendered in the regular one
+        self.bold_style = 'B' if self.font_path is None or self.bold_font_path else ''
+        self.widths = {}
+
+    def clean(self, text):
+        text = text.translate(self.table)
+        if self.font_path is None:
+            text = text.encode('latin-1', 'replace').decode('latin-1')
+        return text
+
+    def _new_document(self):
+        from fpdf import FPDF
+
+        renderer = self
+
+        class ReportPDF(FPDF):
+            def header(self):
+                self.set_font(renderer.family, renderer.bold_style, 15)
+                self.cell(0, 10, renderer.clean(renderer.title), align='C')
+                self.ln(20)
+
+            def footer(self):
+                self.set_y(-15)
+                self.set_font(renderer.family, '', 8)
+                self.cell(0, 10, f'Page {self.page_no()}', align='C')
+
+        pdf = ReportPDF()
+        if self.font_path:
+            pdf.add_font('report', '', self.font_path)
+            if self.bold_font_path:
+                pdf.add_font('report', 'B', self.bold_font_path)
+        return pdf
+
+    def _width(self, pdf, text, style, size):
+        key = (text, style, size)
+        width = self.widths.get(key)
+        if width is None:
+            if len(self.widths) >= self.MAX_CACHED_WIDTHS:
+                self.widths.clear()
+            pdf.set_font(self.family, style, size)
+            width = self.widths[key] = pdf.get_string_width(text)
+        return width
+
+    def _write_wrapped(self, pdf, text, size, line_height, indent=0, bold=False):
+        """
+        Greedy word wrap with cached word widths, one cell per style run.
+        fpdf2's multi_cell re-measures the line for every character, which dominates
+        rendering time for long reports.
+        """
+        available = pdf.w - pdf.l_margin - pdf.r_margin - indent
+        lines = []
+        line, line_width = [], 0.0
+        for token_bold, word, space_before in split_bold(text):
+            style = self.bold_style if (bold or token_bold) else ''
+            word_width = self._width(pdf, word, style, size)
+            space_width = self._width(pdf, ' ', style, size) if space_before and line else 0.0
+            if line and line_width + space_width + word_width > available:
+                lines.append(line)
+                line, line_width, space_width = [], 0.0, 0.0
+            # Words wider than a whole line (e.g. long URLs) are split by character;
+            # without text shaping a string's width is the sum of its characters' widths
+            if word_width > available:
+                piece, piece_width = "", 0.0
+                for char in word:
+                    char_width = self._width(pdf, char, style, size)
+                    if piece and piece_width + char_width > available:
+                        lines.append([(style, piece, piece_width)])
+                        piece, piece_width = "", 0.0
+                    piece += char
+                    piece_width += char_width
+                word, word_width = piece, piece_width
+            line.append((style, (' ' if space_width else '') + word, space_width + word_width))
+            line_width += space_width + word_width
+        if line:
+            lines.append(line)
+
+        for line in lines:
+            pdf.set_x(pdf.l_margin + indent)
+            # Merge consecutive tokens of the same style into one cell
+            runs = []
+            for style, piece, width in line:
+                if runs and runs[-1][0] == style:
+                    runs[-1][1] += piece
+                    runs[-1][2] += width
+                else:
+                    runs.append([style, piece, width])
+            for style, piece, width in runs:
+                pdf.set_font(self.family, style, size)
+                pdf.cell(width, line_height, piece)
+            pdf.ln(line_height)
+
+    def render(self, report_markdown, stats):
+        """
+        PDF bytes for the report: a key metrics section followed by the markdown blocks.
+        """
+        pdf = self._new_document()
+        pdf.add_page()
+
+        # 1. Stats Section
+        self._write_wrapped(pdf, 'Key Metrics', 12, 10, bold=True)
+        self._write_wrapped(pdf, f"Average Sentiment: {stats['avg_sentiment']:.3f}", 11, 7)
+        self._write_wrapped(pdf, f"Negative Ratio: {stats['negative_ratio']:.2f}", 11, 7)
+        pdf.ln(5)
+
+        # 2. Report Content, parsed once into blocks
+        for kind, text in parse_markdown_blocks(self.clean(report_markdown)):
+            if kind == "rule":
+                pdf.ln(2)
+                pdf.line(pdf.l_margin, pdf.get_y(), pdf.w - pdf.r_margin, pdf.get_y())
+                pdf.ln(2)
+            elif kind == "heading":
+                pdf.ln(2)
+                self._write_wrapped(pdf, text.replace('**', ''), 12, 7, bold=True)
+            elif kind == "bullet":
+                bullet = "• " if self.font_path else "- "
+                self._write_wrapped(pdf, bullet + text, 11, 6, indent=4)
+            elif kind == "numbered":
+                self._write_wrapped(pdf, text, 11, 6, indent=4)
+            else:
+                self._write_wrapped(pdf, text, 11, 6)
+                pdf.ln(1)
+
+        return bytes(pdf.output())
+
+_renderer = None
+_renderer_lock = threading.Lock()
+
+def get_pdf_renderer():
+    """
+    Process-wide renderer, so fonts are located and word widths measured once for many PDFs.
+    """
+    global _renderer
+    with _renderer_lock:
+        if _renderer is None:
+            _renderer = PDFReportRenderer()
+        return _renderer
@@ -0,0 +1,63 @@
+import threading
+
+# Process-wide shared instances (model weights, LLM clients), created on first request
+_instances = {}
+_lock = threading.Lock()
+
+def _get_or_create(name, factory):
+    instance = _instances.get(name)
+    if instance is None:
+        with _lock:
+            instance = _instances.get(name)
+            if instance is None:
+                instance = factory()
+                _instances[name] = instance
+    return instance
+
+def get_sentiment_model():
+    from models.sentiment_model import SentimentModel
+    return _get_or_create("sentiment_model", SentimentModel)
+
+def get_gemini_client():
+    from services.gemini_client import GeminiClient
+    return _get_or_create("gemini_client", GeminiClient)
+
+def get_llm_service():
+    from services.llm_service import LLMService
+    return _get_or_create("llm_service", LLMService)
+
+def get_async_runner():
+    from services.async_llm_client import AsyncRunner
+    return _get_or_create("async_runner", AsyncRunner)
+
+def get_async_gemini_client():
+    # Long-lived, so the per-provider rate limit holds across calls; used via run_sync
+    from services.async_llm_client import AsyncGeminiClient
+    return _get_or_create("async_gemini_client", AsyncGeminiClient)
+
+def get_async_llm_service():
+    from services.async_llm_client import AsyncLLMService
+    # Fetched first: the registry lock is not reentrant
+    gemini_client = get_async_gemini_client()
+    return _get_or_create("async_llm_service", lambda: AsyncLLMService(gemini_client=gemini_client))
+
+def get_topic_classifier():
+    from services.topic_classifier import EmbeddingTopicClassifier
+    return _get_or_create("topic_classifier", EmbeddingTopicClassifier)
+
+def peek(name):
+    """
+    The shared instance if it was already created, without creating it.
+    """
+    return _instances.get(name)
+
+def register(name, instance):
+    """
+    Replaces a shared instance, e.g. with an offline stub in tests or benchmarks.
+    """
+    with _lock:
+        _instances[name] = instance
+
+def reset():
+    with _lock:
+        _instances.clear()
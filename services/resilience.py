@@ -0,0 +1,86 @@
+import bisect
+import threading
+import time
+
+class LatencyHistogram:
+    """
+    Fixed log-spaced latency buckets (0.1 ms .. ~2.5 min, 25% apart). Percentiles are
+    bucket upper bounds, so memory is constant however many calls are recorded.
+    """
+    BOUNDS = [0.0001 * 1.25 ** i for i in range(65)]
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BOUNDS) + 1)
+        self.total = 0
+        self.lock = threading.Lock()
+
+    def record(self, seconds, count=1):
+        with self.lock:
+            self.counts[bisect.bisect_left(self.BOUNDS, seconds)] += count
+            self.total += count
+
+    def percentile(self, q):
+        """
+        Latency (seconds) below which `q` percent of calls finished, or None before any call.
+        """
+        with self.lock:
+            if not self.total:
+                return None
+            rank = q / 100 * self.total
+            seen = 0
+            for index, count in enumerate(self.counts):
+                seen += count
+                if seen >= rank and count:
+                    return self.BOUNDS[index] if index < len(self.BOUNDS) else float("inf")
+        return float("inf")
+
+    def summary(self):
+        return {
+            "count": self.total,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99)
+        }
+
+class CircuitBreaker:
+    """
+    Skips a provider after `failure_threshold` consecutive failures. After `reset_seconds`
+    one trial call is let through (half-open): success closes the breaker, failure re-opens it.
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold=3, reset_seconds=60.0, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.clock = clock
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self.lock = threading.Lock()
+
+    def allow(self):
+        with self.lock:
+            if self.state == self.CLOSED:
+                return True
+            now = self.clock()
+            # Let one trial call through per reset period (a trial that never reported back
+            # does not keep the breaker stuck)
+            if now - self.opened_at >= self.reset_seconds:
+                self.state = self.HALF_OPEN
+                self.opened_at = now
+                return True
+            return False
+
+    def record_success(self):
+        with self.lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = self.clock()
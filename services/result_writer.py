@@ -0,0 +1,107 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Rows buffered before a Parquet row group is written
+ROW_GROUP_SIZE = 5000
+
+COLUMNS = ["id", "text", "label", "score", "confidence", "topic", "platform", "date"]
+
+def _schema():
+    import pyarrow as pa
+    return pa.schema([
+        ("id", pa.string()),
+        ("text", pa.string()),
+        ("label", pa.string()),
+        ("score", pa.float64()),
+        ("confidence", pa.float64()),
+        ("topic", pa.string()),
+        ("platform", pa.string()),
+        ("date", pa.string()),
+    ])
+
+def flatten_processed(processed):
+    """
+    One flat row per processed comment (sentiment fields lifted to top-level columns).
+    """
+    sentiment = processed["sentiment"]
+    return {
+        "id": str(processed["id"]),
+        "text": processed["text"],
+        "label": sentiment["label"],
+        "score": sentiment["score"],
+        "confidence": sentiment["confidence"],
+        "topic": processed["topic"],
+        "platform": processed.get("platform"),
+        "date": processed.get("date"),
+    }
+
+class ParquetResultWriter:
+    """
+    Appends processed comments to a Parquet file one row group at a time,
+    so memory stays bounded by `row_group_size` rows however long the run is.
+    """
+    def __init__(self, path, row_group_size=ROW_GROUP_SIZE):
+        import pyarrow.parquet as pq
+        self.path = path
+        self.row_group_size = row_group_size
+        self.schema = _schema()
+        self.writer = pq.ParquetWriter(path, self.schema, compression="zstd")
+        self.buffer = {name: [] for name in COLUMNS}
+        self.rows_written = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def write(self, processed):
+        for name, value in flatten_processed(processed).items():
+            self.buffer[name].append(value)
+        if len(self.buffer["id"]) >= self.row_group_size:
+            self.flush()
+
+    def write_many(self, processed_comments):
+        for processed in processed_comments:
+            self.write(processed)
+
+    def flush(self):
+        if not self.buffer["id"]:
+            return
+        import pyarrow as pa
+        table = pa.Table.from_pydict(self.buffer, schema=self.schema)
+        self.writer.write_table(table)
+        self.rows_written += table.num_rows
+        self.buffer = {name: [] for name in COLUMNS}
+
+    def close(self):
+        if self.writer is not None:
+            self.flush()
+            self.writer.close()
+            self.writer = None
+            logger.info(f"Wrote {self.rows_written} processed comments to {self.path}")
+
+def load_processed_comments(path):
+    """
+    Reads a processed-comments Parquet file into a pandas DataFrame.
+    """
+    import pandas as pd
+    return pd.read_parquet(path)
+
+def to_processed_comments(df):
+    """
+    Rebuilds processed-comment dicts (the SentimentPipeline output shape) from a DataFrame,
+    e.g. to re-aggregate a past run without inference.
+    """
+    return [
+        {
+            "id": row["id"],
+            "text": row["text"],
+            "sentiment": {"label": row["label"], "score": row["score"], "confidence": row["confidence"]},
+            "topic": row["topic"],
+            "platform": row["platform"],
+            "date": row["date"],
+        }
+        for row in df[COLUMNS].to_dict("records")
+    ]
@@ -0,0 +1,101 @@
+import threading
+import logging
+from config.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Load config
+config = get_settings()
+
+TOPIC_CONFIG = config.get('topics', {})
+ENCODER_MODEL_NAME = TOPIC_CONFIG.get('encoder_model', "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2")
+MIN_SIMILARITY = TOPIC_CONFIG.get('min_similarity', 0.35)
+TOPIC_TAXONOMY = TOPIC_CONFIG.get('taxonomy', {})
+ENCODE_BATCH_SIZE = TOPIC_CONFIG.get('encode_batch_size', 64)
+# Topic for low-confidence comments when there is no LLM fallback
+DEFAULT_TOPIC = TOPIC_CONFIG.get('default_topic', "diğer")
+
+class EmbeddingTopicClassifier:
+    """
+    Offline topic labeling: comments are embedded with a local sentence encoder and
+    assigned to the most similar taxonomy entry (cosine similarity, one matrix product
+    per batch). Items below `min_similarity` are left to a fallback (the LLM extractor).
+    """
+    def __init__(self, taxonomy=None, min_similarity=MIN_SIMILARITY,
+                 encoder_model_name=ENCODER_MODEL_NAME, encoder=None):
+        self.taxonomy = taxonomy or TOPIC_TAXONOMY
+        if not self.taxonomy:
+            raise ValueError("topics.taxonomy in settings.yaml is empty")
+        self.min_similarity = min_similarity
+        self.encoder_model_name = encoder_model_name
+        self._encoder = encoder
+        self._index = None
+        self._lock = threading.Lock()
+
+    @property
+    def encoder(self):
+        if self._encoder is None:
+            # sentence-transformers pulls in torch; load only when this mode is used
+            from sentence_transformers import SentenceTransformer
+            print(f"Loading topic encoder: {self.encoder_model_name}...")
+            self._encoder = SentenceTransformer(self.encoder_model_name)
+        return self._encoder
+
+    def _encode(self, texts):
+        import numpy as np
+        embeddings = np.asarray(
+            self.encoder.encode(texts, batch_size=ENCODE_BATCH_SIZE, normalize_embeddings=True),
+            dtype=np.float32
+        )
+        # Normalize again in case the encoder ignores the flag
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        return embeddings / np.maximum(norms, 1e-12)
+
+    def _build_index(self):
+        """
+        Embeds every taxonomy description once; column j of the index belongs to topic_of[j].
+        """
+        import numpy as np
+        descriptions, topic_of = [], []
+        for topic, examples in self.taxonomy.items():
+            for example in ([topic] + list(examples or [])):
+                descriptions.append(example)
+                topic_of.append(topic)
+        return self._encode(descriptions), np.asarray(topic_of, dtype=object)
+
+    def classify(self, texts):
+        """
+        Returns (topics, similarities) for texts; topics are None where similarity < min_similarity.
+        """
+        if not texts:
+            return [], []
+        with self._lock:
+            if self._index is None:
+                self._index = self._build_index()
+            matrix, topic_of = self._index
+            embeddings = self._encode(texts)
+
+        similarities = embeddings @ matrix.T
+        best = similarities.argmax(axis=1)
+        best_scores = similarities[range(len(texts)), best]
+        topics = [
+            str(topic) if score >= self.min_similarity else None
+            for topic, score in zip(topic_of[best], best_scores)
+        ]
+        return topics, best_scores.tolist()
+
+    def extract_batch(self, texts, fallback=None):
+        """
+        Topics in input order; low-confidence items go to fallback(texts) -> topics in one call.
+        """
+        topics, _ = self.classify(texts)
+        uncertain = [i for i, topic in enumerate(topics) if topic is None]
+        if uncertain:
+            if fallback is None:
+                for i in uncertain:
+                    topics[i] = DEFAULT_TOPIC
+            else:
+                logger.info(f"{len(uncertain)}/{len(texts)} comments below topic similarity threshold, asking LLM.")
+                for i, topic in zip(uncertain, fallback([texts[i] for i in uncertain])):
+                    topics[i] = topic
+        return topics
@@ -0,0 +1,156 @@
+import json
+import re
+import logging
+from config.settings import get_settings
+from config.prompts import TOPIC_EXTRACTION_PROMPT, BATCH_TOPIC_EXTRACTION_PROMPT
+
+logger = logging.getLogger(__name__)
+
+# Load config
+config = get_settings()
+
+TOPIC_BATCH_SIZE = config.get('topics', {}).get('batch_size', 25)
+# Topic recorded when a topic request fails (quota, API error): the value single-comment
+# extraction has always produced for an empty answer, so batched and per-comment runs agree
+FAILED_TOPIC = ""
+
+# Matches "1. kargo", "1) kargo", "1: kargo", "1 - kargo"
+NUMBERED_LINE_RE = re.compile(r'^\s*"?(\d+)"?\s*[\.\):\-]\s*(.+?)\s*,?\s*$')
+
+def normalize_topic(raw_topic):
+    """
+    Cleans an LLM topic answer: lowercase, no quotes, first line only.
+    """
+    topic = raw_topic.strip().lower()
+    return topic.replace('"', '').replace("'", "").split('\n')[0]
+
+def topic_from_answer(response_text):
+    """
+    Topic for a single-comment answer; FAILED_TOPIC when the request failed.
+    """
+    if not response_text or not response_text.strip():
+        return FAILED_TOPIC
+    return normalize_topic(response_text)
+
+def parse_batch_response(response_text, expected_count):
+    """
+    Parses a batched topic answer into {position: raw_topic} (1-based positions).
+    Accepts a JSON object, a JSON list, or numbered lines; unknown positions are dropped.
+    """
+    text = response_text.strip()
+    # Strip markdown code fences the model sometimes adds
+    text = re.sub(r'^```(?:json)?\s*|\s*```$', '', text)
+
+    parsed = {}
+    match = re.search(r'(\{.*\}|\[.*\])', text, re.DOTALL)
+    if match:
+        try:
+            data = json.loads(match.group(1))
+            if isinstance(data, list):
+                data = {str(i + 1): value for i, value in enumerate(data)}
+            for key, value in data.items():
+                if str(key).strip().isdigit() and isinstance(value, str):
+                    parsed[int(key)] = value
+        except (json.JSONDecodeError, AttributeError):
+            parsed = {}
+
+    if not parsed:
+        for line in text.split('\n'):
+            line_match = NUMBERED_LINE_RE.match(line)
+            if line_match:
+                parsed[int(line_match.group(1))] = line_match.group(2)
+
+    return {
+        pos: topic for pos, topic in parsed.items()
+        if 1 <= pos <= expected_count and topic.strip()
+    }
+
+class TopicExtractor:
+    def __init__(self, client, batch_size=TOPIC_BATCH_SIZE):
+        self.client = client
+        self.batch_size = batch_size
+
+    def extract(self, text):
+        """
+        Single-comment topic extraction (one LLM call).
+        """
+        topic_prompt = TOPIC_EXTRACTION_PROMPT.format(comment=text)
+        return topic_from_answer(self.client.generate_content(topic_prompt))
+
+    def build_batch_prompt(self, texts):
+        # Newlines inside a comment would break the numbering
+        numbered = "\n".join(
+            f'{i}. "{" ".join(text.split())}"' for i, text in enumerate(texts, start=1)
+        )
+        return BATCH_TOPIC_EXTRACTION_PROMPT.format(comments=numbered)
+
+    def _merge_batch_answer(self, topics, start, chunk, response_text):
+        """
+        Fills `topics` from one batch answer and returns the indexes still missing.
+        An empty answer means the request itself failed (quota, API error): the chunk gets
+        FAILED_TOPIC, as a failed single-comment request would, instead of one re-ask
+        per comment against a failing provider.
+        """
+        if not response_text or not response_text.strip():
+            logger.warning(f"Batch topic request returned nothing; no topic for {len(chunk)} comments.")
+            for i in range(start, start + len(chunk)):
+                topics[i] = FAILED_TOPIC
+            return []
+
+        parsed = parse_batch_response(response_text, len(chunk))
+        for pos, raw_topic in parsed.items():
+            topics[start + pos - 1] = normalize_topic(raw_topic)
+
+        missing = [i for i in range(start, start + len(chunk)) if topics[i] is None]
+        if missing:
+            logger.warning(f"Batch topic answer missing {len(missing)}/{len(chunk)} items, re-asking individually.")
+        return missing
+
+    def extract_batch(self, texts):
+        """
+        Extracts topics for many comments, packing `batch_size` comments per prompt.
+        Comments left out of a non-empty batch answer are re-asked one by one; a failed
+        (empty) batch answer gives FAILED_TOPIC. Returns topics in input order.
+        """
+        topics = [None] * len(texts)
+
+        for start in range(0, len(texts), self.batch_size):
+            chunk = texts[start:start + self.batch_size]
+            if len(chunk) == 1:
+                topics[start] = self.extract(chunk[0])
+                continue
+
+            response_text = self.client.generate_content(self.build_batch_prompt(chunk))
+            for i in self._merge_batch_answer(topics, start, chunk, response_text):
+                topics[i] = self.extract(texts[i])
+
+        return topics
+
+    async def extract_batch_async(self, texts, async_client):
+        """
+        Same as extract_batch, but all batch prompts (and then all re-asks) are sent
+        concurrently through an AsyncLLMClient.
+        """
+        topics = [None] * len(texts)
+        starts = list(range(0, len(texts), self.batch_size))
+        chunks = [texts[start:start + self.batch_size] for start in starts]
+
+        prompts = [
+            self.build_batch_prompt(chunk) if len(chunk) > 1
+            else TOPIC_EXTRACTION_PROMPT.format(comment=chunk[0])
+            for chunk in chunks
+        ]
+        responses = await async_client.generate_many(prompts)
+
+        missing = []
+        for start, chunk, response_text in zip(starts, chunks, responses):
+            if len(chunk) == 1:
+                topics[start] = topic_from_answer(response_text)
+            else:
+                missing.extend(self._merge_batch_answer(topics, start, chunk, response_text))
+
+        retry_prompts = [TOPIC_EXTRACTION_PROMPT.format(comment=texts[i]) for i in missing]
+        for i, response_text in zip(missing, await async_client.generate_many(retry_prompts)):
+            topics[i] = topic_from_answer(response_text)
+
+        return topics
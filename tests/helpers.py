@@ -0,0 +1,12 @@
+def make_processed(i, score=-0.8, topic="kargo", date="2024-01-01"):
+    """
+    One processed comment in the shape SentimentPipeline yields.
+    """
+    return {
+        "id": i,
+        "text": f"şikayet {i}",
+        "sentiment": {"label": "negative" if score < 0 else "positive", "score": score, "confidence": abs(score)},
+        "topic": topic,
+        "platform": "sikayetvar",
+        "date": date
+    }
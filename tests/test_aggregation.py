@@ -0,0 +1,166 @@
+import sys
+import os
+import json
+import random
+import unittest
+from collections import Counter
+
+# Add root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from pipelines.aggregation_pipeline import AggregationPipeline, IncrementalAggregator, NEGATIVE_THRESHOLD, aggregate_columns
+
+def make_comments(n, seed=7):
+    rng = random.Random(seed)
+    return [
+        {
+            "id": i,
+            "text": f"yorum {i}",
+            "sentiment": {"score": round(rng.uniform(-1, 1), 3)},
+            "topic": rng.choice(["kargo", "fiyat", "kalite", "hizmet", "iade", "uygulama"]),
+            "platform": rng.choice(["sikayetvar", "twitter", "instagram"]),
+            "date": f"2026-01-0{rng.randint(1, 9)}"
+        }
+        for i in range(n)
+    ]
+
+def legacy_stats(processed_comments):
+    scores = [c["sentiment"]["score"] for c in processed_comments]
+    topics = [c["topic"] for c in processed_comments]
+    return {
+        "avg_sentiment": sum(scores) / len(scores),
+        "negative_ratio": len([s for s in scores if s < -0.2]) / len(scores),
+        "top_topics": Counter(topics).most_common(5),
+        "total_comments": len(processed_comments)
+    }
+
+class TestIncrementalAggregator(unittest.TestCase):
+    def test_matches_list_based_stats(self):
+        comments = make_comments(500)
+        stats = AggregationPipeline().run(comments)
+        expected = legacy_stats(comments)
+        self.assertAlmostEqual(stats["avg_sentiment"], expected["avg_sentiment"], places=12)
+        self.assertEqual(stats["negative_ratio"], expected["negative_ratio"])
+        self.assertEqual(stats["top_topics"], expected["top_topics"])
+        self.assertEqual(stats["total_comments"], 500)
+
+    def test_empty_input(self):
+        self.assertEqual(AggregationPipeline().run([]), {"avg_sentiment": 0, "negative_ratio": 0, "top_topics": []})
+
+    def test_merge_is_exact(self):
+        comments = make_comments(300)
+        whole = IncrementalAggregator()
+        for c in comments:
+            whole.update(c)
+
+        shards = [IncrementalAggregator() for _ in range(3)]
+        for i, c in enumerate(comments):
+            shards[i % 3].update(c)
+        merged = shards[2].merge(shards[0]).merge(shards[1])
+
+        self.assertEqual(merged.snapshot()["avg_sentiment"], whole.snapshot()["avg_sentiment"])
+        self.assertEqual(merged.snapshot()["negative_ratio"], whole.snapshot()["negative_ratio"])
+        self.assertEqual(dict(merged.topic_counts), dict(whole.topic_counts))
+        self.assertEqual(merged.breakdowns(), whole.breakdowns())
+
+    def test_state_without_topic_buckets_loads(self):
+        aggregator = IncrementalAggregator()
+        for c in make_comments(20):
+            aggregator.update(c)
+        state = aggregator.to_dict()
+        del state["by_topic"]
+        restored = IncrementalAggregator.from_dict(state)
+        self.assertEqual(restored.snapshot(), aggregator.snapshot())
+        self.assertEqual(restored.breakdowns()["by_topic"], {})
+
+    def test_state_roundtrip(self):
+        aggregator = IncrementalAggregator()
+        for c in make_comments(50):
+            aggregator.update(c)
+        restored = IncrementalAggregator.from_dict(json.loads(json.dumps(aggregator.to_dict())))
+        self.assertEqual(restored.snapshot(), aggregator.snapshot())
+        self.assertEqual(restored.breakdowns(), aggregator.breakdowns())
+
+class TestVectorizedAggregation(unittest.TestCase):
+    def test_threshold_comes_from_config(self):
+        # settings.yaml: sentiment.threshold = 0.2
+        self.assertEqual(NEGATIVE_THRESHOLD, -0.2)
+        self.assertEqual(IncrementalAggregator().negative_threshold, NEGATIVE_THRESHOLD)
+
+    def test_breakdowns_match_incremental(self):
+        comments = make_comments(400)
+        stats = AggregationPipeline().run(comments)
+
+        incremental = IncrementalAggregator()
+        for c in comments:
+            incremental.update(c)
+        breakdowns = incremental.breakdowns()
+
+        self.assertEqual(stats["avg_sentiment"], incremental.snapshot()["avg_sentiment"])
+        self.assertEqual(stats["by_platform"], breakdowns["by_platform"])
+        self.assertEqual(stats["by_date"], breakdowns["by_date"])
+        self.assertEqual(stats["by_topic"], breakdowns["by_topic"])
+        self.assertEqual(
+            {topic: summary["count"] for topic, summary in stats["by_topic"].items()},
+            dict(incremental.topic_counts)
+        )
+
+    def test_report_stats_match_batch(self):
+        comments = make_comments(400)
+        stats = AggregationPipeline().run(comments)
+
+        incremental = IncrementalAggregator()
+        for c in comments:
+            incremental.update(c)
+        report_stats = incremental.report_stats()
+
+        for key in ("total_comments", "top_topics", "by_platform", "by_date", "by_topic", "negative_hotspots"):
+            self.assertEqual(report_stats[key], stats[key])
+        self.assertEqual(len(report_stats["trend"]), len(stats["trend"]))
+        for mine, theirs in zip(report_stats["trend"], stats["trend"]):
+            self.assertEqual(mine["date"], theirs["date"])
+            self.assertAlmostEqual(mine["rolling_avg_sentiment"], theirs["rolling_avg_sentiment"])
+        hotspots = incremental.report_stats(negative_ratio_threshold=0)["negative_hotspots"]
+        self.assertEqual({h["dimension"] for h in hotspots}, {"platform", "date", "topic"})
+        # Saved output is plain JSON
+        json.dumps(report_stats)
+
+    def test_rolling_trend(self):
+        stats = aggregate_columns(
+            [-0.5, 0.5, 0.1, -0.9],
+            ["kargo", "fiyat", "kargo", "iade"],
+            dates=["2026-01-01", "2026-01-02", "2026-01-10", "not a date"],
+            trend_window_days=7
+        )
+        trend = stats["trend"]
+        self.assertEqual([day["date"] for day in trend], ["2026-01-01", "2026-01-02", "2026-01-10"])
+        self.assertAlmostEqual(trend[1]["rolling_avg_sentiment"], 0.0)
+        self.assertEqual(trend[1]["rolling_negative_ratio"], 0.5)
+        # 2026-01-10 is outside the 7-day window of the earlier days
+        self.assertAlmostEqual(trend[2]["rolling_avg_sentiment"], 0.1)
+        self.assertEqual(stats["by_platform"], {None: {"count": 4, "avg_sentiment": -0.2, "negative_ratio": 0.5}})
+
+    def test_negative_hotspots(self):
+        stats = aggregate_columns(
+            [-0.8, -0.6, 0.4, 0.9],
+            ["iade", "iade", "kargo", "kargo"],
+            platforms=["twitter", "twitter", "twitter", "sikayetvar"],
+            negative_ratio_threshold=0.6
+        )
+        hotspots = [(h["dimension"], h["key"]) for h in stats["negative_hotspots"]]
+        self.assertEqual(hotspots, [("topic", "iade"), ("platform", "twitter")])
+
+    def test_frame_input_matches_dicts(self):
+        import pandas as pd
+
+        comments = make_comments(200)
+        df = pd.DataFrame({
+            "score": [c["sentiment"]["score"] for c in comments],
+            "topic": [c["topic"] for c in comments],
+            "platform": [c["platform"] for c in comments],
+            "date": [c["date"] for c in comments]
+        })
+        self.assertEqual(AggregationPipeline().run_frame(df), AggregationPipeline().run(comments))
+
+if __name__ == "__main__":
+    unittest.main()
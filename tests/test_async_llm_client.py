@@ -0,0 +1,139 @@
+import sys
+import os
+import json
+import asyncio
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.async_llm_client import AsyncGeminiClient, AsyncOpenAIClient, TokenBucket, run_sync
+from services import registry
+from services.cache import set_cache_enabled
+
+class FakeLLMHandler(BaseHTTPRequestHandler):
+    """
+    Answers Gemini and OpenAI style requests; the first `fail_first` requests get a 429.
+    """
+    fail_first = 0
+    requests_seen = 0
+    lock = threading.Lock()
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        with FakeLLMHandler.lock:
+            FakeLLMHandler.requests_seen += 1
+            should_fail = FakeLLMHandler.requests_seen <= FakeLLMHandler.fail_first
+
+        if should_fail:
+            self.send_response(429)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        if self.path.endswith(":generateContent"):
+            prompt = body["contents"][0]["parts"][0]["text"]
+            payload = {"candidates": [{"content": {"parts": [{"text": f"echo:{prompt}"}]}}]}
+        else:
+            prompt = body["messages"][-1]["content"]
+            payload = {"choices": [{"message": {"content": f"echo:{prompt}"}}]}
+
+        data = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+class TestAsyncLLMClient(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), FakeLLMHandler)
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        # Every request must reach the fake server
+        set_cache_enabled(False)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        set_cache_enabled(True)
+
+    def setUp(self):
+        FakeLLMHandler.requests_seen = 0
+        FakeLLMHandler.fail_first = 0
+
+    def test_generate_many_keeps_order(self):
+        async def scenario():
+            async with AsyncGeminiClient(api_key="test", base_url=self.base_url, max_concurrency=4) as client:
+                return await client.generate_many([f"p{i}" for i in range(10)])
+
+        self.assertEqual(asyncio.run(scenario()), [f"echo:p{i}" for i in range(10)])
+
+    def test_retries_on_429(self):
+        FakeLLMHandler.fail_first = 2
+
+        async def scenario():
+            async with AsyncOpenAIClient(api_key="test", base_url=self.base_url,
+                                         backoff_base=0.01, backoff_max=0.05) as client:
+                return await client.generate_content("hello")
+
+        self.assertEqual(asyncio.run(scenario()), "echo:hello")
+        self.assertEqual(FakeLLMHandler.requests_seen, 3)
+
+    def test_gives_up_after_max_retries(self):
+        FakeLLMHandler.fail_first = 100
+
+        async def scenario():
+            async with AsyncGeminiClient(api_key="test", base_url=self.base_url, max_retries=1,
+                                         backoff_base=0.01, backoff_max=0.05) as client:
+                return await client.generate_content("hello")
+
+        self.assertEqual(asyncio.run(scenario()), "")
+        self.assertEqual(FakeLLMHandler.requests_seen, 2)
+
+    def test_token_bucket_throttles(self):
+        async def scenario():
+            bucket = TokenBucket(rate_per_minute=600, capacity=2)  # 10 tokens/sec
+            loop = asyncio.get_running_loop()
+            started = loop.time()
+            for _ in range(4):
+                await bucket.acquire()
+            return loop.time() - started
+
+        # 2 immediate, 2 more need ~0.2s of refill
+        self.assertGreaterEqual(asyncio.run(scenario()), 0.15)
+
+    def test_model_names_match_sync_service(self):
+        from services import llm_service
+
+        # Same model, and so the same cache key, whichever client answers a prompt
+        self.assertEqual(AsyncOpenAIClient(api_key="test").model_name, llm_service.OPENAI_MODEL_NAME)
+        self.assertEqual(AsyncGeminiClient(api_key="test").model_name, llm_service.GEMINI_MODEL_NAME)
+
+    def test_pipeline_chunks_share_one_rate_limiter(self):
+        from pipelines.sentiment_pipeline import SentimentPipeline
+
+        client = AsyncGeminiClient(api_key="test", base_url=self.base_url, requests_per_minute=60)
+        registry.register("async_gemini_client", client)
+        try:
+            pipeline = SentimentPipeline(use_async=True, sentiment_model=object(), gemini_client=object(), topic_mode="llm")
+            for _ in range(3):
+                pipeline.extract_topics_llm(["kargo gecikti"])
+            # Every chunk drew from the same bucket instead of a fresh, full one
+            self.assertGreaterEqual(FakeLLMHandler.requests_seen, 3)
+            self.assertLessEqual(client.rate_limiter.request_bucket.tokens, 60 - FakeLLMHandler.requests_seen + 1)
+            # One event loop serves every synchronous call
+            async def current_loop():
+                return asyncio.get_running_loop()
+            self.assertIs(run_sync(current_loop()), run_sync(current_loop()))
+        finally:
+            registry.reset()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import sys
+import os
+import asyncio
+import shutil
+import tempfile
+import unittest
+import json
+
+# Add root and the scraper directory to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'web scraping ')))
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "sikayetvar_company.html")
+
+def chromium_available():
+    try:
+        from playwright.sync_api import sync_playwright
+        with sync_playwright() as p:
+            p.chromium.launch(headless=True).close()
+        return True
+    except Exception:
+        return False
+
+@unittest.skipUnless(chromium_available(), "playwright with Chromium is not installed")
+class TestAsyncScraper(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        # The slug only varies the query string, so every company loads the local fixture
+        self.url_template = "file://" + FIXTURE + "?company={slug}"
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def scrape(self, companies, max_items, **kwargs):
+        from async_scraper import scrape_companies
+        return asyncio.run(scrape_companies(
+            companies, max_items=max_items, concurrency=2, output_dir=self.tmp_dir,
+            url_template=self.url_template, scroll_timeout_ms=1000, **kwargs
+        ))
+
+    def test_scrapes_companies_concurrently(self):
+        from card_extraction import fingerprint
+
+        results = self.scrape(["firma-a", "firma-b", "firma-c"], max_items=8)
+
+        self.assertEqual(sorted(results), ["firma-a", "firma-b", "firma-c"])
+        for company, items in results.items():
+            self.assertEqual(len(items), 8)
+            self.assertEqual(items[0], {
+                "company": company,
+                "text": "Şikayet 0: kargo gecikti, iade yapılmadı.",
+                "user": "kullanici0",
+                "date": "1 Ocak",
+                "fingerprint": fingerprint(company, "Şikayet 0: kargo gecikti, iade yapılmadı.", "kullanici0")
+            })
+            # The card without a description is skipped
+            self.assertNotIn("Şikayet 3", " ".join(i["text"] for i in items))
+
+            with open(os.path.join(self.tmp_dir, f"{company}_latest.json"), encoding="utf-8") as f:
+                self.assertEqual(json.load(f), items)
+
+    def test_stops_when_page_has_no_more_cards(self):
+        results = self.scrape(["firma-a"], max_items=50)
+        # 12 cards, one without a description
+        self.assertEqual(len(results["firma-a"]), 11)
+
+    def test_stops_at_already_seen_complaints(self):
+        from card_extraction import fingerprint
+
+        first = self.scrape(["firma-a"], max_items=4)["firma-a"]
+        self.assertTrue(all(item["fingerprint"] for item in first))
+
+        # Complaints 6-8 were analyzed in an earlier run; only the newer ones come back
+        seen = [fingerprint("firma-a", f"Şikayet {i}: kargo gecikti, iade yapılmadı.", f"kullanici{i}") for i in (6, 7, 8)]
+        with open(os.path.join(self.tmp_dir, "firma-a.json"), "w", encoding="utf-8") as f:
+            json.dump({"seen": seen}, f)
+        results = self.scrape(["firma-a"], max_items=50, state_dir=self.tmp_dir)
+        self.assertEqual([item["user"] for item in results["firma-a"]],
+                         ["kullanici0", "kullanici1", "kullanici2", "kullanici4", "kullanici5"])
+
+    def test_extract_cards_returns_only_new_cards(self):
+        from playwright.sync_api import sync_playwright
+        from card_extraction import CARD_SELECTOR, EXTRACT_CARDS_JS
+
+        with sync_playwright() as p:
+            browser = p.chromium.launch(headless=True)
+            page = browser.new_page()
+            page.goto(self.url_template.format(slug="firma-a"))
+            page.wait_for_selector(CARD_SELECTOR)
+
+            first = page.evaluate(EXTRACT_CARDS_JS, [CARD_SELECTOR, 0])
+            self.assertEqual(first["total"], 5)
+            # Card 3 has no description
+            self.assertEqual([i["user"] for i in first["items"]], ["kullanici0", "kullanici1", "kullanici2", "kullanici4"])
+
+            page.keyboard.press("End")
+            page.wait_for_function("n => document.querySelectorAll('article.card-v2').length > n", arg=5)
+            second = page.evaluate(EXTRACT_CARDS_JS, [CARD_SELECTOR, first["total"]])
+            self.assertEqual(second["total"], 10)
+            self.assertEqual(second["items"][0]["text"], "Şikayet 5: kargo gecikti, iade yapılmadı.")
+            browser.close()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import sys
+import os
+import time
+import tempfile
+import unittest
+
+# Add root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.cache import SQLiteCache, make_key, sentiment_cache_key
+
+class TestSQLiteCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "cache.sqlite")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_roundtrip_persists_and_counts(self):
+        cache = SQLiteCache(self.path)
+        key = make_key("gemini", "gemini-2.0-flash", "prompt")
+        self.assertIsNone(cache.get(key))
+        cache.set(key, "kargo")
+        cache.close()
+
+        reopened = SQLiteCache(self.path)
+        self.assertEqual(reopened.get(key), "kargo")
+        self.assertEqual(reopened.stats()["hits"], 1)
+        self.assertEqual(cache.stats()["misses"], 1)
+        reopened.close()
+
+    def test_key_depends_on_provider_and_model(self):
+        self.assertNotEqual(make_key("gemini", "m", "p"), make_key("openai", "m", "p"))
+        self.assertNotEqual(make_key("gemini", "m1", "p"), make_key("gemini", "m2", "p"))
+
+    def test_ttl_expiry(self):
+        cache = SQLiteCache(self.path, ttl_seconds=0.05)
+        cache.set("k", "v")
+        time.sleep(0.1)
+        self.assertIsNone(cache.get("k"))
+        cache.close()
+
+    def test_lru_eviction(self):
+        cache = SQLiteCache(self.path, max_entries=2)
+        cache.set("a", "1")
+        time.sleep(0.01)
+        cache.set("b", "2")
+        time.sleep(0.01)
+        cache.get("a")  # "b" is now least recently used
+        time.sleep(0.01)
+        cache.set("c", "3")
+        self.assertEqual(cache.get("a"), "1")
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), "3")
+        cache.close()
+
+    def test_disabled_cache_is_bypassed(self):
+        cache = SQLiteCache(self.path, enabled=False)
+        cache.set("k", "v")
+        self.assertIsNone(cache.get("k"))
+        self.assertEqual(cache.stats()["misses"], 0)
+
+    def test_bulk_get_and_set(self):
+        cache = SQLiteCache(self.path, max_entries=1000)
+        cache.set_many({f"k{i}": str(i) for i in range(600)})
+        found = cache.get_many([f"k{i}" for i in range(0, 1200, 2)])
+        self.assertEqual(len(found), 300)
+        self.assertEqual(found["k598"], "598")
+        self.assertEqual(cache.stats()["misses"], 300)
+        cache.close()
+
+    def test_sentiment_key_normalizes_whitespace_not_case(self):
+        model = "savasy/bert-base-turkish-sentiment-cased"
+        self.assertEqual(
+            sentiment_cache_key(model, "Kargo  geç\ngeldi "),
+            sentiment_cache_key(model, "Kargo geç geldi")
+        )
+        self.assertNotEqual(
+            sentiment_cache_key(model, "Kargo geç geldi"),
+            sentiment_cache_key(model, "kargo geç geldi")
+        )
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+import sys
+import os
+import shutil
+import tempfile
+import unittest
+
+# Add root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.checkpoint import CheckpointJournal, comment_key
+from tests.helpers import make_processed
+
+class TestCheckpointJournal(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, "run.checkpoint.jsonl")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def write_journal(self, count, signature="sig"):
+        with CheckpointJournal(self.path, signature, flush_every=4).open() as journal:
+            for i in range(count):
+                journal.record(make_processed(i))
+
+    def test_resume_returns_recorded_results(self):
+        self.write_journal(10)
+
+        journal = CheckpointJournal(self.path, "sig")
+        done = journal.load()
+        self.assertEqual(len(done), 10)
+        self.assertEqual(journal.get({"id": 3, "text": "şikayet  3"}), make_processed(3))
+        # Same ID with different text is new work
+        self.assertIsNone(journal.get({"id": 3, "text": "Başka bir şikayet"}))
+
+    def test_truncated_last_line_is_ignored(self):
+        self.write_journal(5)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write('{"key": "abc", "resu')
+
+        self.assertEqual(len(CheckpointJournal(self.path, "sig").load()), 5)
+
+    def test_resume_after_truncated_line_keeps_new_records(self):
+        self.write_journal(5)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write('{"key": "abc", "resu')
+
+        journal = CheckpointJournal(self.path, "sig")
+        journal.load()
+        with journal.open(resume=True):
+            journal.record(make_processed(5))
+
+        # The record written after the crash must survive the next resume
+        self.assertEqual(len(CheckpointJournal(self.path, "sig").load()), 6)
+
+    def test_resume_appends_and_fresh_run_replaces(self):
+        self.write_journal(3)
+
+        journal = CheckpointJournal(self.path, "sig")
+        journal.load()
+        with journal.open(resume=True):
+            journal.record(make_processed(3))
+        self.assertEqual(len(CheckpointJournal(self.path, "sig").load()), 4)
+
+        CheckpointJournal(self.path, "sig").open(resume=False).close()
+        self.assertEqual(CheckpointJournal(self.path, "sig").load(), {})
+
+    def test_signature_mismatch_starts_over(self):
+        self.write_journal(3, signature="old-model")
+        self.assertEqual(CheckpointJournal(self.path, "new-model").load(), {})
+
+    def test_key_ignores_whitespace_differences(self):
+        self.assertEqual(comment_key({"id": 1, "text": "a  b "}), comment_key({"id": 1, "text": "a b"}))
+
+class TestScrapeFreshness(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, "acme_latest.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def write(self, content):
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(content)
+
+    def test_recent_non_empty_file_is_fresh(self):
+        from full_pipeline import is_fresh
+        self.write('[{"text": "Kargo gecikti"}]')
+        self.assertTrue(is_fresh(self.path, 60))
+        self.assertFalse(is_fresh(self.path, 0))
+
+    def test_empty_or_broken_file_is_stale(self):
+        from full_pipeline import is_fresh
+        for content in ("[]", '[{"text": "Kargo', ""):
+            self.write(content)
+            self.assertFalse(is_fresh(self.path, 60), content)
+
+    def test_old_file_is_stale(self):
+        from full_pipeline import is_fresh
+        self.write('[{"text": "Kargo gecikti"}]')
+        os.utime(self.path, (0, 0))
+        self.assertFalse(is_fresh(self.path, 60))
+
+if __name__ == "__main__":
+    unittest.main()
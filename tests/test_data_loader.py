@@ -0,0 +1,60 @@
+import sys
+import os
+import io
+import json
+import tempfile
+import unittest
+
+# Add root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.data_loader import _iter_json_array, iter_scraped_items, load_scraped_data, stream_scraped_data
+
+ITEMS = [
+    {"company": "turk-telekom", "text": "İnternet sürekli kopuyor, \"destek\" yok.", "user": "a", "date": "16 Ocak 10:23"},
+    {"company": "turk-telekom", "text": "Fatura [yanlış] kesildi, {iade} bekliyorum.", "user": None, "date": None},
+    {"company": "turk-telekom", "text": "Modem arızası " * 50, "user": "c", "date": "3 Mart 09:00"},
+]
+
+class TestStreamingLoader(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def write(self, name, content):
+        path = os.path.join(self.tmp_dir.name, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+        return path
+
+    def test_array_parser_across_small_chunks(self):
+        text = json.dumps(ITEMS, ensure_ascii=False, indent=2)
+        f = io.StringIO(text[1:])
+        self.assertEqual(list(_iter_json_array(f, "", chunk_size=7)), ITEMS)
+
+    def test_json_array_matches_load_scraped_data(self):
+        path = self.write("data.json", json.dumps(ITEMS, ensure_ascii=False, indent=2))
+        streamed = stream_scraped_data(path)
+        loaded = load_scraped_data(path)
+        self.assertEqual(streamed["brand"], loaded["brand"])
+        self.assertEqual(list(streamed["comments"]), loaded["comments"])
+
+    def test_json_lines(self):
+        content = "\n".join(json.dumps(item, ensure_ascii=False) for item in ITEMS) + "\n"
+        for name in ("data.jsonl", "data_without_extension.json"):
+            path = self.write(name, content)
+            self.assertEqual(list(iter_scraped_items(path)), ITEMS)
+
+    def test_wrapped_items_object(self):
+        path = self.write("wrapped.json", json.dumps({"items": ITEMS}, indent=2))
+        self.assertEqual(list(iter_scraped_items(path)), ITEMS)
+
+    def test_missing_and_empty_files(self):
+        self.assertIsNone(stream_scraped_data(os.path.join(self.tmp_dir.name, "missing.json")))
+        path = self.write("empty.json", "[]")
+        self.assertEqual(list(stream_scraped_data(path)["comments"]), [])
+
+if __name__ == "__main__":
+    unittest.main()
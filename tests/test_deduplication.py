@@ -0,0 +1,68 @@
+import sys
+import os
+import unittest
+
+# Add root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from pipelines.aggregation_pipeline import IncrementalAggregator
+
+BASE = ("Siparişimi 10 gün önce verdim, kargo hala gelmedi. Müşteri hizmetlerini aradım "
+        "kimse ilgilenmedi, paramı geri istiyorum. Bu firmadan bir daha alışveriş yapmam.")
+
+def comment(i, text, platform="sikayetvar", date="2026-01-01"):
+    return {"id": i, "text": text, "platform": platform, "date": date}
+
+@unittest.skipIf(np is None, "numpy not installed")
+class TestDeduplicator(unittest.TestCase):
+    def setUp(self):
+        from services.deduplication import Deduplicator
+        self.dedup = Deduplicator()
+
+    def test_exact_and_near_duplicates_share_a_cluster(self):
+        comments = [
+            comment(1, BASE),
+            comment(2, BASE.upper().replace(".", "!!")),          # exact after normalization
+            comment(3, BASE.replace("10 gün", "11 gün")),          # near duplicate
+            comment(4, "Ürün kalitesi muazzam, gerçekten bayıldım!"),
+        ]
+        clusters = self.dedup.cluster(comments)
+        self.assertEqual([[c["id"] for c in cluster] for cluster in clusters], [[1, 2, 3], [4]])
+
+    def test_distinct_texts_stay_apart(self):
+        clusters = self.dedup.cluster([
+            comment(1, "Kargo çok geç geldi, paket ezilmişti."),
+            comment(2, "Fiyatlar piyasaya göre biraz yüksek kalmış."),
+            comment(3, ""),
+        ])
+        self.assertEqual(len(clusters), 3)
+
+    def test_weighted_aggregation_matches_full_fan_out(self):
+        from services.deduplication import fan_out, weighted_members
+        members = [
+            comment(1, BASE),
+            comment(2, BASE, platform="twitter"),
+            comment(3, BASE, date="2026-01-02"),
+            comment(4, BASE),
+        ]
+        processed = {"id": 1, "text": BASE, "sentiment": {"score": -0.987}, "topic": "kargo",
+                     "platform": "sikayetvar", "date": "2026-01-01"}
+
+        weighted, full = IncrementalAggregator(), IncrementalAggregator()
+        for result, weight in weighted_members(processed, members):
+            weighted.update(result, weight=weight)
+        expanded = fan_out(processed, members)
+        for result in expanded:
+            full.update(result)
+
+        self.assertEqual([r["id"] for r in expanded], [1, 2, 3, 4])
+        self.assertEqual(weighted.snapshot(), full.snapshot())
+        self.assertEqual(weighted.breakdowns(), full.breakdowns())
+
+if __name__ == "__main__":
+    unittest.main()
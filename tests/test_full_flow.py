@@ -9,6 +9,9 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from pipelines.sentiment_pipeline import SentimentPipeline
 from pipelines.aggregation_pipeline import AggregationPipeline
 from pipelines.report_pipeline import ReportPipeline
+from benchmarks.stubs import install_stubs
+from services import registry
+from services.cache import set_cache_enabled
 
 class TestFlow(unittest.TestCase):
     def setUp(self):
@@ -19,6 +22,13 @@ class TestFlow(unittest.TestCase):
         ]
         self.brand = "Test Brand"
         self.goal = "Test Goal"
+        # Deterministic offline model and LLM stand-ins: no downloads or API keys needed
+        install_stubs()
+        set_cache_enabled(False)
+
+    def tearDown(self):
+        registry.reset()
+        set_cache_enabled(True)
 
     def test_pipeline_flow(self):
         print("\n--- Testing Full Pipeline Flow ---")
@@ -31,11 +41,14 @@ class TestFlow(unittest.TestCase):
         self.assertTrue("sentiment" in processed[0])
         self.assertTrue("topic" in processed[0])
         
-        # Check sentiment values (approximate)
+        # Check sentiment values
         # "Ürün harika" should be positive
         print(f"Comment 1 Sentiment: {processed[0]['sentiment']}")
+        self.assertEqual(processed[0]['sentiment']['label'], "positive")
         # "Kargo rezalet" should be negative
         print(f"Comment 2 Sentiment: {processed[1]['sentiment']}")
+        self.assertEqual(processed[1]['sentiment']['label'], "negative")
+        self.assertEqual(processed[1]['topic'], "kargo")
 
         # 2. Aggregation
         print("2. Aggregation Pipeline")
@@ -48,14 +61,14 @@ class TestFlow(unittest.TestCase):
         # 3. Report
         print("3. Report Pipeline")
         rp = ReportPipeline()
-        # Mocking or running real if API key exists.
-        # If no API key, it might fail or print warning.
-        # This test assumes we might want to skip or handle gracefully if key is missing.
-        
         report = rp.run(self.brand, self.goal, stats)
         print("Final Report Keys:", report.keys())
         self.assertIn("brand_health_score", report)
-        self.assertIn("executive_summary", report)
+        self.assertIn("report_markdown", report)
+        self.assertIn("Yönetici Özeti", report["report_markdown"])
+        # Breakdowns from the aggregation are kept in the saved output
+        self.assertEqual(set(report["by_platform"]), {"twitter", "instagram", "trendyol"})
+        self.assertIn("trend", report)
 
 if __name__ == "__main__":
     unittest.main()
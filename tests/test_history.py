@@ -0,0 +1,59 @@
+import sys
+import os
+import shutil
+import tempfile
+import unittest
+
+# Add root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.history import CompanyHistory, comment_fingerprint
+from pipelines.aggregation_pipeline import IncrementalAggregator
+from tests.helpers import make_processed
+
+def aggregate(processed):
+    aggregator = IncrementalAggregator()
+    for p in processed:
+        aggregator.update(p)
+    return aggregator
+
+class TestCompanyHistory(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, "history", "firma.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_fingerprint_prefers_scraper_value(self):
+        self.assertEqual(comment_fingerprint({"text": "a", "fingerprint": "abc"}), "abc")
+        self.assertEqual(comment_fingerprint({"text": "a  b"}), comment_fingerprint({"text": "a b"}))
+
+    def test_daily_deltas_merge_into_history(self):
+        day_one = [make_processed(i, -0.5) for i in range(4)]
+        day_two = [make_processed(i, 0.5) for i in range(4, 6)]
+
+        history = CompanyHistory(self.path)
+        history.commit(aggregate(day_one), [comment_fingerprint(p) for p in day_one])
+
+        # Next run: only the delta is analyzed and merged
+        history = CompanyHistory(self.path)
+        self.assertTrue(history.is_seen(day_one[0]))
+        self.assertFalse(history.is_seen(day_two[0]))
+        history.commit(aggregate(day_two), [comment_fingerprint(p) for p in day_two])
+
+        reloaded = CompanyHistory(self.path)
+        self.assertEqual(len(reloaded.seen), 6)
+        self.assertEqual(reloaded.aggregator.snapshot(), aggregate(day_one + day_two).snapshot())
+        self.assertFalse(os.path.exists(self.path + ".tmp"))
+
+    def test_threshold_change_fails_on_load(self):
+        history = CompanyHistory(self.path)
+        history.commit(aggregate([make_processed(0, -0.5)]), ["a"])
+
+        # Caught before any analysis runs, not when the delta is merged at the end
+        with self.assertRaises(ValueError):
+            CompanyHistory(self.path, negative_threshold=-0.5)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import sys
+import os
+import json
+import shutil
+import tempfile
+import unittest
+
+# Add root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.instrumentation import Instrumentation, NULL_STAGE
+
+class TestInstrumentation(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_disabled_is_a_no_op(self):
+        instrumentation = Instrumentation(enabled=False)
+        with instrumentation.stage("sentiment", 10) as stage:
+            stage.add_items(5)
+        self.assertIs(instrumentation.stage("topics"), NULL_STAGE)
+        instrumentation.observe("load", 1.0)
+        instrumentation.count_llm_call("gemini", "prompt", "answer")
+        self.assertEqual(instrumentation.stages, {})
+        self.assertEqual(instrumentation.llm_calls, {})
+
+    def test_stage_throughput_and_latency(self):
+        instrumentation = Instrumentation(enabled=True)
+        instrumentation.observe("sentiment", 2.0, 100)
+        instrumentation.observe("sentiment", 2.0, 100)
+        with instrumentation.stage("report") as stage:
+            stage.add_items(1)
+
+        summary = instrumentation.summary()
+        sentiment = summary["stages"]["sentiment"]
+        self.assertEqual(sentiment["calls"], 2)
+        self.assertEqual(sentiment["items"], 200)
+        self.assertEqual(sentiment["items_per_second"], 50.0)
+        # Each item is credited with its batch's average latency (20 ms)
+        self.assertTrue(0.02 <= sentiment["item_latency_seconds"]["p95"] < 0.025)
+        self.assertEqual(summary["stages"]["report"]["items"], 1)
+        self.assertGreater(summary["peak_rss_bytes"], 0)
+        self.assertIn("hit_rate", summary["cache"]["llm"])
+
+    def test_llm_token_estimates(self):
+        instrumentation = Instrumentation(enabled=True)
+        instrumentation.count_llm_call("gemini", "x" * 400, "y" * 40)
+        instrumentation.count_llm_call("gemini", "x" * 400, "")
+        self.assertEqual(
+            instrumentation.summary()["llm_calls"]["gemini"],
+            {"calls": 2, "prompt_tokens": 200, "completion_tokens": 10}
+        )
+
+    def test_json_and_prometheus_output(self):
+        instrumentation = Instrumentation(enabled=True)
+        instrumentation.observe("topics", 1.5, 30)
+        instrumentation.gauge("report_first_chunk_seconds", 0.8)
+        summary = instrumentation.summary()
+
+        json_path = os.path.join(self.tmp_dir, "output.metrics.json")
+        prom_path = os.path.join(self.tmp_dir, "metrics.prom")
+        instrumentation.write_json(json_path, summary)
+        instrumentation.write_prometheus(prom_path, summary)
+
+        with open(json_path) as f:
+            self.assertEqual(json.load(f)["stages"]["topics"]["items"], 30)
+        with open(prom_path) as f:
+            prom = f.read()
+        self.assertIn('nlp_stage_items{stage="topics"} 30', prom)
+        self.assertIn('nlp_gauge{name="report_first_chunk_seconds"} 0.8', prom)
+        self.assertIn('nlp_stage_item_latency_seconds{stage="topics",quantile="0.95"}', prom)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+import sys
+import os
+import time
+import threading
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+# Add root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services import llm_service
+from services.llm_service import LLMService
+from services.cache import SQLiteCache
+from pipelines.report_pipeline import ReportPipeline
+
+def openai_chunk(text):
+    return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text))])
+
+class FakeOpenAI:
+    def __init__(self, pieces=None, error=None):
+        self.pieces = pieces or []
+        self.error = error
+        self.calls = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, **kwargs):
+        self.calls.append(kwargs)
+        if self.error:
+            raise self.error
+        return (openai_chunk(p) for p in self.pieces)
+
+class FakeGemini:
+    def __init__(self, pieces, delay=0.0):
+        self.pieces = pieces
+        self.delay = delay
+
+    def generate_content(self, prompt, stream=False, request_options=None):
+        self.request_options = request_options
+        if self.delay:
+            time.sleep(self.delay)
+        return [SimpleNamespace(text=p) for p in self.pieces]
+
+def slow_openai(first_chunk_delay, pieces):
+    openai = FakeOpenAI()
+    released = threading.Event()
+
+    def create(**kwargs):
+        openai.calls.append(kwargs)
+        released.wait(first_chunk_delay)
+        return (openai_chunk(p) for p in pieces)
+
+    openai.chat.completions.create = create
+    openai.released = released
+    return openai
+
+def make_service(openai=None, gemini=None, **kwargs):
+    service = LLMService(**kwargs)
+    service._openai = openai
+    service._gemini_model = gemini
+    service.cache = SQLiteCache(":memory:")
+    return service
+
+@mock.patch.object(llm_service, "GEMINI_API_KEY", "test-key")
+@mock.patch.object(llm_service, "OPENAI_API_KEY", "test-key")
+class TestStreamContent(unittest.TestCase):
+    def test_yields_openai_chunks_and_caches_full_text(self):
+        openai = FakeOpenAI(["# Rapor", "\n\nKargo ", "gecikmeleri"])
+        service = make_service(openai=openai)
+
+        self.assertEqual(list(service.stream_content("prompt")), ["# Rapor", "\n\nKargo ", "gecikmeleri"])
+        self.assertTrue(openai.calls[0]["stream"])
+        self.assertEqual(openai.calls[0]["timeout"], llm_service.REQUEST_TIMEOUT_SECONDS)
+        # Second call is one cached chunk, no provider request
+        self.assertEqual(list(service.stream_content("prompt")), ["# Rapor\n\nKargo gecikmeleri"])
+        self.assertEqual(len(openai.calls), 1)
+
+    def test_falls_back_to_gemini_before_first_chunk(self):
+        service = make_service(openai=FakeOpenAI(error=RuntimeError("quota")), gemini=FakeGemini(["a", "b"]))
+        self.assertEqual("".join(service.stream_content("prompt")), "ab")
+
+    def test_interrupted_stream_is_not_cached(self):
+        def broken_stream(**kwargs):
+            yield openai_chunk("yarım ")
+            raise RuntimeError("connection reset")
+
+        openai = FakeOpenAI()
+        openai.chat.completions.create = broken_stream
+        service = make_service(openai=openai, gemini=FakeGemini(["tam"]))
+
+        self.assertEqual("".join(service.stream_content("prompt")), "yarım ")
+        self.assertIsNone(service._cached_response("prompt"))
+
+    def test_slow_first_chunk_is_hedged(self):
+        openai = slow_openai(5, ["geç"])
+        service = make_service(openai=openai, gemini=FakeGemini(["hızlı ", "cevap"]), hedging=True, hedge_delay=0.05)
+
+        started = time.perf_counter()
+        self.assertEqual("".join(service.stream_content("prompt")), "hızlı cevap")
+        self.assertLess(time.perf_counter() - started, 2)
+        openai.released.set()
+        # The winner's time to first chunk is recorded, not the whole stream
+        self.assertEqual(service.first_chunk_latency["gemini"].total, 1)
+        self.assertEqual(service.latency["gemini"].total, 0)
+
+    def test_fast_first_chunk_is_not_hedged(self):
+        gemini = FakeGemini(["b"])
+        service = make_service(openai=FakeOpenAI(["a", "b"]), gemini=gemini, hedging=True, hedge_delay=1.0)
+        self.assertEqual("".join(service.stream_content("prompt")), "ab")
+        self.assertFalse(hasattr(gemini, "request_options"))
+
+    def test_without_hedging_waits_for_primary(self):
+        openai = slow_openai(0.2, ["yavaş"])
+        service = make_service(openai=openai, gemini=FakeGemini(["b"]), hedging=False, hedge_delay=0.01)
+        self.assertEqual("".join(service.stream_content("prompt")), "yavaş")
+
+    def test_stream_hedge_delay_uses_first_chunk_p95(self):
+        service = make_service(hedge_delay=3.0)
+        for _ in range(llm_service.HEDGE_MIN_SAMPLES):
+            service.first_chunk_latency["openai"].record(0.5)
+            service.latency["openai"].record(20.0)
+        self.assertLess(service.hedge_delay_for("openai", streaming=True), 1.0)
+        self.assertGreater(service.hedge_delay_for("openai"), 10.0)
+
+class TestStreamReport(unittest.TestCase):
+    def test_stream_report_and_output(self):
+        class StubService:
+            def stream_content(self, prompt):
+                self.prompt = prompt
+                yield "# Rapor\n"
+                yield "İçerik"
+
+        stub = StubService()
+        pipeline = ReportPipeline(llm_service=stub)
+        stats = {"avg_sentiment": -0.4, "negative_ratio": 0.5, "top_topics": [("kargo", 3)]}
+
+        chunks = list(pipeline.stream_report("Marka", "Analiz", stats))
+        self.assertEqual(chunks, ["# Rapor\n", "İçerik"])
+        self.assertIn("kargo (3)", stub.prompt)
+
+        output = pipeline.build_output("".join(chunks), stats)
+        self.assertEqual(output["report_markdown"], "# Rapor\nİçerik")
+        self.assertEqual(output["brand_health_score"], pipeline.calculate_brand_health(-0.4, 0.5))
+
+if __name__ == "__main__":
+    unittest.main()
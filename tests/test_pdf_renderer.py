@@ -0,0 +1,88 @@
+import sys
+import os
+import re
+import zlib
+import unittest
+
+# Add root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.pdf_renderer import PDFReportRenderer, find_fonts, parse_markdown_blocks, split_bold
+
+REPORT = """# 📊 Detaylı Müşteri İçgörü Raporu
+
+## 1. Yönetici Özeti
+Müşteriler kargo gecikmelerinden
+ve **fatura** itirazlarından şikayetçi.
+
+---
+*   **Tavsiye 1:** Kargo süreçlerini iyileştirin.
+1. Çağrı merkezine erişimi kolaylaştırın.
+2) **İade** sürelerini kısaltın.
+"""
+
+STATS = {"avg_sentiment": -0.312, "negative_ratio": 0.6}
+
+def page_count(pdf_bytes):
+    return len(re.findall(rb"/Type /Page\b", pdf_bytes))
+
+class TestMarkdownParsing(unittest.TestCase):
+    def test_blocks(self):
+        blocks = parse_markdown_blocks(REPORT)
+        self.assertEqual(blocks, [
+            ("heading", "📊 Detaylı Müşteri İçgörü Raporu"),
+            ("heading", "1. Yönetici Özeti"),
+            ("paragraph", "Müşteriler kargo gecikmelerinden ve **fatura** itirazlarından şikayetçi."),
+            ("rule", ""),
+            ("bullet", "**Tavsiye 1:** Kargo süreçlerini iyileştirin."),
+            ("numbered", "1. Çağrı merkezine erişimi kolaylaştırın."),
+            ("numbered", "2) **İade** sürelerini kısaltın."),
+        ])
+
+    def test_split_bold(self):
+        self.assertEqual(split_bold("**Tavsiye 1:** Kargo"), [
+            (True, "Tavsiye", False), (True, "1:", True), (False, "Kargo", True)
+        ])
+        # No space between a bold run and the following text
+        self.assertEqual(split_bold("**a**b c"), [(True, "a", False), (False, "b", False), (False, "c", True)])
+
+class TestPDFReportRenderer(unittest.TestCase):
+    def test_latin1_fallback_table(self):
+        renderer = PDFReportRenderer(embed_font=False)
+        self.assertEqual(renderer.clean("📊 Şikayet ığ çö “x” ✓"), " Sikayet ig çö \"x\" ")
+
+    def test_core_font_render(self):
+        pdf_bytes = PDFReportRenderer(embed_font=False).render(REPORT, STATS)
+        self.assertIsInstance(pdf_bytes, bytes)
+        self.assertTrue(pdf_bytes.startswith(b"%PDF"))
+        self.assertIn(b"/BaseFont /Helvetica", pdf_bytes)
+        # Core-font text is written as latin-1 strings in the compressed page stream
+        content = b"".join(
+            zlib.decompress(stream) for stream in re.findall(rb"stream\r?\n(.*?)\r?\nendstream", pdf_bytes, re.S)
+        )
+        self.assertIn("Yönetici".encode("latin-1"), content)
+        self.assertIn(b"Detayl", content)
+        self.assertNotIn("ı".encode("utf-8"), content)
+        # Ordered list markers are kept, not replaced with bullets
+        self.assertIn("1. Çagri".encode("latin-1"), content)
+        self.assertIn(b"2) ", content)
+
+    @unittest.skipUnless(find_fonts()[0], "No Unicode TTF font installed")
+    def test_unicode_font_embedded(self):
+        renderer = PDFReportRenderer()
+        pdf_bytes = renderer.render(REPORT, STATS)
+        self.assertTrue(pdf_bytes.startswith(b"%PDF"))
+        self.assertIn(b"/FontFile2", pdf_bytes)
+        self.assertEqual(page_count(pdf_bytes), 1)
+
+    def test_long_report_wraps_and_breaks_pages(self):
+        renderer = PDFReportRenderer()
+        long_word = "https://example.com/" + "x" * 300
+        report = "\n\n".join(f"## Bölüm {i}\n" + "Kargo gecikti ve iade yapılmadı. " * 40 for i in range(20))
+        pdf_bytes = renderer.render(report + "\n\n" + long_word, STATS)
+        self.assertGreater(page_count(pdf_bytes), 3)
+        # Widths are measured once per distinct word, not per line
+        self.assertLess(len(renderer.widths), 200)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import sys
+import os
+import threading
+import unittest
+
+# Add root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services import registry
+from pipelines.sentiment_pipeline import SentimentPipeline
+from pipelines.report_pipeline import ReportPipeline
+
+class TestRegistry(unittest.TestCase):
+    def tearDown(self):
+        registry.reset()
+
+    def test_pipelines_share_one_instance(self):
+        first, second = SentimentPipeline(), SentimentPipeline()
+        self.assertIs(first.sentiment_model, second.sentiment_model)
+        self.assertIs(first.gemini_client, second.gemini_client)
+        self.assertIs(ReportPipeline().llm_service, ReportPipeline().llm_service)
+
+    def test_concurrent_first_access_creates_once(self):
+        created = []
+
+        def factory():
+            created.append(object())
+            return created[-1]
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(registry._get_or_create("thing", factory)))
+            for _ in range(16)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(len(created), 1)
+        self.assertTrue(all(r is created[0] for r in results))
+
+    def test_register_overrides_shared_instance(self):
+        stub = object()
+        registry.register("llm_service", stub)
+        self.assertIs(ReportPipeline().llm_service, stub)
+
+if __name__ == "__main__":
+    unittest.main()
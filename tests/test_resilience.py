@@ -0,0 +1,143 @@
+import sys
+import os
+import time
+import threading
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+# Add root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services import llm_service
+from services.llm_service import LLMService
+from services.cache import SQLiteCache
+from services.resilience import CircuitBreaker, LatencyHistogram
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class FakeOpenAI:
+    def __init__(self, delay=0.0, content="openai cevabı", error=None):
+        self.delay = delay
+        self.content = content
+        self.error = error
+        self.calls = 0
+        self.release = threading.Event()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, **kwargs):
+        self.calls += 1
+        if self.error:
+            raise self.error
+        # Wait for the delay, or until the test releases the call early
+        self.release.wait(self.delay)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=self.content))])
+
+class FakeGemini:
+    def __init__(self, content="gemini cevabı"):
+        self.content = content
+        self.calls = 0
+
+    def generate_content(self, prompt, request_options=None):
+        self.calls += 1
+        return SimpleNamespace(text=self.content)
+
+def make_service(openai, gemini, **kwargs):
+    service = LLMService(**kwargs)
+    service._openai = openai
+    service._gemini_model = gemini
+    service.cache = SQLiteCache(":memory:")
+    return service
+
+class TestLatencyHistogram(unittest.TestCase):
+    def test_percentiles_are_bucket_upper_bounds(self):
+        histogram = LatencyHistogram()
+        self.assertIsNone(histogram.percentile(95))
+        for _ in range(95):
+            histogram.record(0.1)
+        for _ in range(5):
+            histogram.record(5.0)
+
+        self.assertTrue(0.1 <= histogram.percentile(50) < 0.125)
+        self.assertTrue(0.1 <= histogram.percentile(95) < 0.125)
+        self.assertTrue(5.0 <= histogram.percentile(99) < 6.25)
+        self.assertEqual(histogram.summary()["count"], 100)
+
+class TestCircuitBreaker(unittest.TestCase):
+    def test_opens_after_threshold_and_half_opens_after_reset(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=2, reset_seconds=30, clock=clock)
+
+        breaker.record_failure()
+        self.assertTrue(breaker.allow())
+        breaker.record_failure()
+        self.assertFalse(breaker.allow())
+
+        clock.now = 31
+        self.assertTrue(breaker.allow())   # one trial call
+        self.assertFalse(breaker.allow())
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+
+        clock.now = 62
+        self.assertTrue(breaker.allow())
+        breaker.record_success()
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+        self.assertTrue(breaker.allow())
+
+@mock.patch.object(llm_service, "GEMINI_API_KEY", "test-key")
+@mock.patch.object(llm_service, "OPENAI_API_KEY", "test-key")
+class TestHedgedGeneration(unittest.TestCase):
+    def test_slow_primary_is_hedged(self):
+        openai = FakeOpenAI(delay=5.0)
+        service = make_service(openai, FakeGemini(), hedge_delay=0.05, hedge_on_p95=False)
+
+        started = time.perf_counter()
+        self.assertEqual(service.generate_content("prompt"), "gemini cevabı")
+        self.assertLess(time.perf_counter() - started, 1.0)
+        openai.release.set()
+
+    def test_fast_primary_is_not_hedged(self):
+        gemini = FakeGemini()
+        service = make_service(FakeOpenAI(), gemini, hedge_delay=1.0, hedge_on_p95=False)
+
+        self.assertEqual(service.generate_content("prompt"), "openai cevabı")
+        self.assertEqual(gemini.calls, 0)
+        self.assertEqual(service.latency_stats()["openai"]["count"], 1)
+
+    def test_failed_primary_falls_back_immediately(self):
+        service = make_service(FakeOpenAI(error=RuntimeError("quota")), FakeGemini(), hedge_delay=5.0)
+
+        started = time.perf_counter()
+        self.assertEqual(service.generate_content("prompt"), "gemini cevabı")
+        self.assertLess(time.perf_counter() - started, 1.0)
+
+    def test_open_breaker_skips_provider(self):
+        openai = FakeOpenAI(error=RuntimeError("down"))
+        service = make_service(openai, FakeGemini(), hedging=False)
+
+        for i in range(5):
+            self.assertEqual(service.generate_content(f"prompt {i}"), "gemini cevabı")
+        # Threshold is 3 consecutive failures (settings.yaml)
+        self.assertEqual(openai.calls, 3)
+        self.assertEqual(service.latency_stats()["openai"]["circuit"], "open")
+
+    def test_hedge_delay_follows_primary_p95(self):
+        service = make_service(FakeOpenAI(), FakeGemini(), hedge_delay=3.0)
+        self.assertEqual(service.hedge_delay_for("openai"), 3.0)
+        for _ in range(llm_service.HEDGE_MIN_SAMPLES):
+            service.latency["openai"].record(0.4)
+        self.assertTrue(0.4 <= service.hedge_delay_for("openai") < 0.5)
+
+    def test_hedged_calls_run_on_daemon_threads(self):
+        # A still-running losing call must not keep the interpreter alive at exit
+        future = llm_service.run_in_daemon_thread(lambda: threading.current_thread().daemon)
+        self.assertTrue(future.result(timeout=1))
+
+if __name__ == "__main__":
+    unittest.main()
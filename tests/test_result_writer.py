@@ -0,0 +1,47 @@
+import sys
+import os
+import shutil
+import tempfile
+import unittest
+
+# Add root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.result_writer import ParquetResultWriter, load_processed_comments, to_processed_comments
+from pipelines.aggregation_pipeline import AggregationPipeline
+from tests.helpers import make_processed
+
+class TestParquetResultWriter(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, "comments.parquet")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_round_trip_in_row_groups(self):
+        import pyarrow.parquet as pq
+
+        processed = [
+            make_processed(i, -0.5 if i % 3 else 0.75, topic="kargo" if i % 2 else "fiyat", date=f"2024-01-0{1 + i % 3}")
+            for i in range(25)
+        ]
+        with ParquetResultWriter(self.path, row_group_size=10) as writer:
+            writer.write_many(processed)
+
+        self.assertEqual(pq.ParquetFile(self.path).num_row_groups, 3)
+        df = load_processed_comments(self.path)
+        self.assertEqual(len(df), 25)
+        self.assertEqual(list(df["id"][:3]), ["0", "1", "2"])
+        self.assertEqual(df["topic"][1], "kargo")
+
+        # Re-aggregating the stored results matches aggregating the originals
+        restored = to_processed_comments(df)
+        self.assertEqual(AggregationPipeline().run(restored), AggregationPipeline().run(processed))
+
+    def test_empty_run_writes_readable_file(self):
+        ParquetResultWriter(self.path).close()
+        self.assertEqual(len(load_processed_comments(self.path)), 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+import sys
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+
+# Add root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models.sentiment_model import SentimentModel, pool_probabilities
+from services.cache import set_cache_enabled
+
+try:
+    from transformers import BertTokenizerFast
+except ImportError:
+    BertTokenizerFast = None
+
+try:
+    import torch
+except ImportError:
+    torch = None
+
+def make_tokenizer(directory):
+    vocab_path = os.path.join(directory, "vocab.txt")
+    with open(vocab_path, "w") as f:
+        f.write("\n".join(["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"] + [f"w{i}" for i in range(50)]))
+    return BertTokenizerFast(vocab_file=vocab_path)
+
+class FakeClassifier:
+    """
+    Label depends on a text's real token count (CLS/SEP included); padding is ignored
+    through the attention mask, as in a real model.
+    """
+    config = SimpleNamespace(max_position_embeddings=64, id2label={0: "negative", 1: "neutral", 2: "positive"})
+
+    def __call__(self, input_ids, attention_mask, **kwargs):
+        lengths = attention_mask.sum(dim=1)
+        logits = torch.nn.functional.one_hot(lengths % 3, 3).float() * 2 + lengths.unsqueeze(1).float() / 10
+        return SimpleNamespace(logits=logits)
+
+class TestPooling(unittest.TestCase):
+    def test_single_window_is_unchanged(self):
+        self.assertEqual(pool_probabilities([[0.2, 0.8]]), [0.2, 0.8])
+
+    def test_confident_windows_weigh_more(self):
+        pooled = pool_probabilities([[0.9, 0.1], [0.4, 0.6]])
+        # weights 0.9 and 0.6
+        self.assertAlmostEqual(pooled[0], (0.9 * 0.9 + 0.6 * 0.4) / 1.5)
+        self.assertAlmostEqual(sum(pooled), 1.0)
+
+@unittest.skipIf(BertTokenizerFast is None, "transformers not installed")
+class TestTokenization(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        tokenizer = make_tokenizer(self.tmp_dir.name)
+
+        self.model = SentimentModel()
+        # Tokenizer only; no weights are needed to build the windows
+        self.model._pipeline = SimpleNamespace(
+            tokenizer=tokenizer,
+            model=SimpleNamespace(config=SimpleNamespace(max_position_embeddings=8))
+        )
+        self.texts = ["w1 w2 w3", " ".join(f"w{i}" for i in range(20))]
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_truncates_at_token_limit(self):
+        self.model.max_length = 512
+        features, owners = self.model._tokenize(self.texts)
+        self.assertEqual(owners, [0, 1])
+        self.assertEqual([len(f["input_ids"]) for f in features], [5, 8])
+
+    def test_long_texts_become_overlapping_windows(self):
+        self.model.chunk_long_texts = True
+        self.model.window_stride = 2
+        features, owners = self.model._tokenize(self.texts)
+        self.assertEqual(owners[0], 0)
+        self.assertGreater(owners.count(1), 1)
+        self.assertTrue(all(len(f["input_ids"]) <= 8 for f in features))
+        self.assertEqual(set(features[0]), {"input_ids", "token_type_ids", "attention_mask"})
+
+@unittest.skipIf(BertTokenizerFast is None or torch is None, "transformers/torch not installed")
+class TestBatchInference(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.tokenizer = make_tokenizer(self.tmp_dir.name)
+        self.classifier = FakeClassifier()
+        self.model = SentimentModel()
+        self.model._pipeline = SimpleNamespace(tokenizer=self.tokenizer, model=self.classifier)
+        # Unsorted lengths, so length bucketing reorders them internally
+        self.texts = [" ".join(f"w{i}" for i in range(n)) for n in (9, 1, 5, 12, 2, 7, 3)]
+        set_cache_enabled(False)
+
+    def tearDown(self):
+        set_cache_enabled(True)
+        self.tmp_dir.cleanup()
+
+    def single_text(self, text):
+        """
+        The old per-text path: one unpadded forward pass, top class as label/score.
+        """
+        encoded = self.tokenizer(text, truncation=True, return_tensors="pt")
+        with torch.no_grad():
+            probs = self.classifier(**encoded).logits.softmax(dim=-1)[0].tolist()
+        best = max(range(len(probs)), key=probs.__getitem__)
+        return self.model._to_sentiment({"label": self.classifier.config.id2label[best], "score": probs[best]})
+
+    def test_batched_results_match_single_texts_in_order(self):
+        results = self.model.analyze_batch(self.texts, batch_size=3)
+        self.assertEqual(results, [self.single_text(text) for text in self.texts])
+        # Lengths 3, 4, 5 tokens: one text per label, so a reordering would show
+        self.assertEqual([results[i]["label"] for i in (1, 4, 6)], ["negative", "neutral", "positive"])
+        self.assertLess(results[1]["score"], 0)
+        self.assertEqual(results[4]["score"], 0)
+        self.assertGreater(results[6]["score"], 0)
+
+    def test_duplicates_are_scored_once(self):
+        calls = []
+        original = self.model._infer_batch
+
+        def counting(texts, batch_size):
+            calls.append(list(texts))
+            return original(texts, batch_size)
+
+        self.model._infer_batch = counting
+        results = self.model.analyze_batch(["w1 w2", "w3", "w1 w2"])
+        self.assertEqual(calls, [["w1 w2", "w3"]])
+        self.assertEqual(results[0], results[2])
+
+if __name__ == "__main__":
+    unittest.main()
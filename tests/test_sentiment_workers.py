@@ -0,0 +1,81 @@
+import sys
+import os
+import unittest
+
+# Add root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from pipelines.sentiment_workers import ShardedSentimentScorer
+from services.cache import SQLiteCache, get_sentiment_cache, sentiment_cache_key
+
+class FakeModel:
+    """
+    Deterministic stand-in for SentimentModel; records which process scored each text.
+    """
+    def analyze_batch(self, texts):
+        return [
+            {"label": "positive", "score": round(len(t) / 100, 3), "confidence": 1.0, "pid": os.getpid()}
+            for t in texts
+        ]
+
+class CachedFakeModel(FakeModel):
+    cache_model_name = "fake"
+
+def worker_cache_enabled(_):
+    return get_sentiment_cache().enabled
+
+class TestShardedSentimentScorer(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.scorer = ShardedSentimentScorer(2, chunk_size=3, torch_threads=1, model_factory=FakeModel)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.scorer.close()
+
+    def test_analyze_batch_keeps_order(self):
+        texts = ["x" * i for i in range(20)]
+        scores = [s["score"] for s in self.scorer.analyze_batch(texts)]
+        self.assertEqual(scores, [round(i / 100, 3) for i in range(20)])
+
+    def test_iter_scores_streams_chunks_in_order(self):
+        chunks = ([{"id": i, "text": "x" * i}] for i in range(10))
+        results = list(self.scorer.iter_scores(chunks))
+        self.assertEqual([chunk[0]["id"] for chunk, _ in results], list(range(10)))
+        self.assertEqual([s[0]["score"] for _, s in results], [round(i / 100, 3) for i in range(10)])
+        self.assertNotIn(os.getpid(), {s[0]["pid"] for _, s in results})
+
+class TestShardedScorerCache(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.scorer = ShardedSentimentScorer(2, chunk_size=3, torch_threads=1, model_factory=CachedFakeModel)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.scorer.close()
+
+    def setUp(self):
+        self.scorer.cache = SQLiteCache(":memory:")
+
+    def test_workers_never_use_the_cache(self):
+        self.assertEqual(self.scorer.pool.map(worker_cache_enabled, range(4)), [False] * 4)
+
+    def test_parent_serves_hits_and_stores_misses(self):
+        texts = ["kargo", "fatura", "kargo", "iade"]
+        first = self.scorer.analyze_batch(texts)
+        self.assertEqual(self.scorer.cache.stats()["hits"], 0)
+        second = self.scorer.analyze_batch(texts)
+        self.assertEqual(second, first)
+        self.assertEqual(self.scorer.cache.stats()["hits"], 3)
+
+    def test_disabled_cache_is_bypassed(self):
+        self.scorer.cache.enabled = False
+        chunks = ([{"id": i, "text": "x" * i}] for i in range(5))
+        results = [s[0]["score"] for _, s in self.scorer.iter_scores(chunks)]
+        self.assertEqual(results, [round(i / 100, 3) for i in range(5)])
+        self.scorer.cache.enabled = True
+        keys = [sentiment_cache_key("fake", "x" * i) for i in range(5)]
+        self.assertEqual(self.scorer.cache.get_many(keys), {})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+import sys
+import os
+import unittest
+
+# Add root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from services.topic_classifier import EmbeddingTopicClassifier
+
+KEYWORDS = [("kargo",), ("fiyat",), ("temsilci", "hizmet")]
+
+class KeywordEncoder:
+    """
+    Stand-in sentence encoder: one dimension per keyword group, plus one for unrelated text.
+    """
+    def encode(self, texts, batch_size=None, normalize_embeddings=True):
+        rows = []
+        for text in texts:
+            row = [float(any(k in text.lower() for k in group)) for group in KEYWORDS]
+            rows.append(row + [float(not any(row))])
+        return np.array(rows)
+
+@unittest.skipIf(np is None, "numpy not installed")
+class TestEmbeddingTopicClassifier(unittest.TestCase):
+    def setUp(self):
+        taxonomy = {"kargo": ["kargo geç geldi"], "fiyat": ["fiyat yüksek"], "hizmet": ["temsilci ilgisiz"]}
+        self.classifier = EmbeddingTopicClassifier(taxonomy=taxonomy, min_similarity=0.8, encoder=KeywordEncoder())
+
+    def test_assigns_nearest_topic(self):
+        topics, scores = self.classifier.classify(["Kargo rezalet", "Temsilci kapattı"])
+        self.assertEqual(topics, ["kargo", "hizmet"])
+        self.assertTrue(all(s >= 0.8 for s in scores))
+
+    def test_low_confidence_items_go_to_fallback_in_one_call(self):
+        calls = []
+
+        def fallback(texts):
+            calls.append(texts)
+            return ["uygulama"] * len(texts)
+
+        topics = self.classifier.extract_batch(["Uygulama açılmıyor", "Fiyat uçmuş", "Site çöktü"], fallback=fallback)
+        self.assertEqual(topics, ["uygulama", "fiyat", "uygulama"])
+        self.assertEqual(calls, [["Uygulama açılmıyor", "Site çöktü"]])
+
+if __name__ == "__main__":
+    unittest.main()
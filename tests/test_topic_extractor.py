@@ -0,0 +1,106 @@
+import sys
+import os
+import re
+import json
+import asyncio
+import unittest
+
+# Add root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.topic_extractor import TopicExtractor, parse_batch_response, FAILED_TOPIC
+
+class FakeClient:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.prompts = []
+
+    def generate_content(self, prompt):
+        self.prompts.append(prompt)
+        return self.responses.pop(0)
+
+class CountingClient:
+    """
+    Answers every batch prompt with "kargo" for each numbered comment.
+    """
+    def __init__(self):
+        self.prompts = []
+
+    def generate_content(self, prompt):
+        self.prompts.append(prompt)
+        positions = re.findall(r'^(\d+)\. "', prompt, re.MULTILINE)
+        return json.dumps({pos: "kargo" for pos in positions}) if positions else "kargo"
+
+class FakeSentimentModel:
+    def analyze_batch(self, texts):
+        return [{"label": "neutral", "score": 0.0, "confidence": 1.0} for _ in texts]
+
+class TestTopicExtractor(unittest.TestCase):
+    def test_parse_json_with_code_fence(self):
+        response = '```json\n{"1": "Kargo", "2": "fiyat"}\n```'
+        self.assertEqual(parse_batch_response(response, 2), {1: "Kargo", 2: "fiyat"})
+
+    def test_parse_numbered_lines(self):
+        response = "1. kargo\n2) kalite\n9: hizmet"
+        self.assertEqual(parse_batch_response(response, 3), {1: "kargo", 2: "kalite"})
+
+    def test_batch_matches_single_normalization(self):
+        client = FakeClient(['{"1": "\\"Kargo\\"", "2": "Fiyat"}'])
+        extractor = TopicExtractor(client, batch_size=25)
+        topics = extractor.extract_batch(["Kargo geç geldi", "Çok pahalı"])
+        self.assertEqual(topics, ["kargo", "fiyat"])
+        self.assertEqual(len(client.prompts), 1)
+
+    def test_missing_items_are_reasked(self):
+        client = FakeClient(['{"1": "kargo"}', "Hizmet\n"])
+        extractor = TopicExtractor(client, batch_size=25)
+        topics = extractor.extract_batch(["Kargo geç geldi", "Temsilci ilgisiz"])
+        self.assertEqual(topics, ["kargo", "hizmet"])
+        self.assertEqual(len(client.prompts), 2)
+
+    def test_failed_batch_is_not_reasked(self):
+        # "" is what the clients return on quota exhaustion or API errors
+        client = FakeClient(["", '{"1": "kargo", "2": "iade"}'])
+        extractor = TopicExtractor(client, batch_size=3)
+        topics = extractor.extract_batch(["a", "b", "c", "Kargo geç", "İade yok"])
+        self.assertEqual(topics, [FAILED_TOPIC] * 3 + ["kargo", "iade"])
+        self.assertEqual(len(client.prompts), 2)
+
+    def test_failed_requests_give_one_value(self):
+        # Batched chunk, single-item last chunk and per-comment path all fail the same way
+        failing = FakeClient([""] * 3)
+        topics = TopicExtractor(failing, batch_size=2).extract_batch(["a", "b", "c"])
+        self.assertEqual(topics, [FAILED_TOPIC] * 3)
+        self.assertEqual(TopicExtractor(FakeClient([""])).extract("a"), FAILED_TOPIC)
+
+    def test_failed_batch_is_not_reasked_async(self):
+        class FakeAsyncClient:
+            def __init__(self):
+                self.calls = 0
+
+            async def generate_many(self, prompts):
+                self.calls += len(prompts)
+                return ["" for _ in prompts]
+
+        client = FakeAsyncClient()
+        topics = asyncio.run(TopicExtractor(None, batch_size=25).extract_batch_async(["a", "b"], client))
+        self.assertEqual(topics, [FAILED_TOPIC, FAILED_TOPIC])
+        self.assertEqual(client.calls, 1)
+
+class TestPipelineChunking(unittest.TestCase):
+    def test_chunks_hold_whole_topic_batches(self):
+        from pipelines.sentiment_pipeline import SentimentPipeline
+
+        client = CountingClient()
+        pipeline = SentimentPipeline(sentiment_model=FakeSentimentModel(), gemini_client=client,
+                                     topic_mode="llm", chunk_size=64)
+        self.assertEqual(pipeline.chunk_size % pipeline.topic_extractor.batch_size, 0)
+
+        comments = [{"id": i, "text": f"yorum {i}"} for i in range(600)]
+        results = list(pipeline.iter_run(comments, chunk_size=256))
+        self.assertEqual(len(results), 600)
+        # 600 / 25: no partial topic batch at any chunk boundary
+        self.assertEqual(len(client.prompts), 24)
+
+if __name__ == "__main__":
+    unittest.main()
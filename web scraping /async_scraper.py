@@ -0,0 +1,215 @@
+import asyncio
+import json
+import os
+import argparse
+import logging
+import sys
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+from card_extraction import CARD_SELECTOR, EXTRACT_CARDS_JS, to_records, load_seen
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+    handlers=[
+        logging.StreamHandler(sys.stdout)
+    ]
+)
+logger = logging.getLogger(__name__)
+
+URL_TEMPLATE = "https://www.sikayetvar.com/{slug}"
+USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) Chrome/120 Safari/537.36"
+
+# Resources the scraper never reads; skipping them cuts page load time
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font"}
+
+async def _block_heavy_resources(route):
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+class ContextPool:
+    """
+    Fixed set of browser contexts shared by concurrent scrapes of one browser.
+    A context is checked out per company and returned when that scrape finishes.
+    """
+    def __init__(self, browser, size):
+        self.browser = browser
+        self.size = size
+        self.contexts = []
+        self.available = asyncio.Queue()
+
+    async def start(self):
+        for _ in range(self.size):
+            context = await self.browser.new_context(
+                viewport={"width": 1280, "height": 900},
+                user_agent=USER_AGENT
+            )
+            await context.route("**/*", _block_heavy_resources)
+            self.contexts.append(context)
+            self.available.put_nowait(context)
+        return self
+
+    async def acquire(self):
+        return await self.available.get()
+
+    def release(self, context):
+        self.available.put_nowait(context)
+
+    async def close(self):
+        for context in self.contexts:
+            await context.close()
+
+async def extract_cards(page, company_slug, start):
+    """
+    Reads complaint cards from index `start` onwards in a single browser round-trip.
+    Returns (items, total card count).
+    """
+    result = await page.evaluate(EXTRACT_CARDS_JS, [CARD_SELECTOR, start])
+    return to_records(company_slug, result["items"]), result["total"]
+
+async def scrape_company(context, company_slug, max_items=100, url_template=URL_TEMPLATE,
+                         timeout_ms=30000, scroll_timeout_ms=10000, max_stagnation=3,
+                         seen=None, stop_after_seen=3):
+    """
+    Scrapes one company's complaint list in an existing browser context.
+    Instead of fixed sleeps it waits for the first cards to render and, after each
+    scroll, for the card count to grow.
+    With a `seen` fingerprint set only new complaints are kept, and scraping stops after
+    `stop_after_seen` consecutive seen ones (the list is newest first; a single seen
+    card may just be pinned).
+    """
+    url = url_template.format(slug=company_slug)
+    data = []
+    page = await context.new_page()
+    try:
+        logger.info(f"[{company_slug}] Navigating to {url}...")
+        await page.goto(url, wait_until="domcontentloaded", timeout=timeout_ms)
+        try:
+            await page.wait_for_selector(CARD_SELECTOR, timeout=timeout_ms)
+        except PlaywrightTimeoutError:
+            # The first batch sometimes only renders after a scroll
+            await page.keyboard.press("End")
+            await page.wait_for_selector(CARD_SELECTOR, timeout=timeout_ms)
+
+        seen = seen or set()
+        seen_cards = 0
+        stagnation = 0
+        seen_streak = 0
+        while len(data) < max_items and stagnation < max_stagnation and seen_streak < stop_after_seen:
+            items, seen_cards = await extract_cards(page, company_slug, seen_cards)
+            for item in items:
+                if item["fingerprint"] in seen:
+                    seen_streak += 1
+                    if seen_streak >= stop_after_seen:
+                        logger.info(f"[{company_slug}] Reached already analyzed complaints.")
+                        break
+                    continue
+                seen_streak = 0
+                data.append(item)
+                if len(data) >= max_items:
+                    break
+            if len(data) >= max_items or seen_streak >= stop_after_seen:
+                break
+
+            # Trigger the next batch and wait until it is in the DOM
+            await page.keyboard.press("End")
+            try:
+                await page.wait_for_function(
+                    "([selector, count]) => document.querySelectorAll(selector).length > count",
+                    arg=[CARD_SELECTOR, seen_cards],
+                    timeout=scroll_timeout_ms
+                )
+                stagnation = 0
+            except PlaywrightTimeoutError:
+                stagnation += 1
+                logger.debug(f"[{company_slug}] No new cards after scroll ({stagnation}/{max_stagnation}).")
+    except Exception as e:
+        logger.error(f"[{company_slug}] Scrape failed: {e}")
+        raise
+    finally:
+        await page.close()
+
+    logger.info(f"[{company_slug}] Collected {len(data)} items.")
+    return data
+
+async def scrape_companies(companies, max_items=100, concurrency=4, output_dir=".",
+                           url_template=URL_TEMPLATE, headless=True, state_dir=None, **scrape_kwargs):
+    """
+    Scrapes several companies concurrently with one headless browser and a pool of
+    `concurrency` contexts. Each company is saved to `<output_dir>/<slug>_latest.json`;
+    companies whose scrape failed or found nothing keep their previous file.
+    With `state_dir`, complaints listed in `<state_dir>/<slug>.json` are skipped (incremental mode).
+    Returns {slug: items}.
+    """
+    results = {}
+    async with async_playwright() as p:
+        logger.info(f"Launching browser ({concurrency} contexts)...")
+        browser = await p.chromium.launch(headless=headless)
+        pool = await ContextPool(browser, min(concurrency, len(companies)) or 1).start()
+
+        async def run(company_slug):
+            seen = load_seen(os.path.join(state_dir, f"{company_slug}.json")) if state_dir else None
+            context = await pool.acquire()
+            try:
+                results[company_slug] = await scrape_company(
+                    context, company_slug, max_items, url_template, seen=seen, **scrape_kwargs
+                )
+            except Exception:
+                # Already logged; one company failing must not stop the others
+                results[company_slug] = []
+                return
+            finally:
+                pool.release(context)
+            # A failed or empty scrape keeps the previous file instead of overwriting it with []
+            if results[company_slug]:
+                save_items(results[company_slug], os.path.join(output_dir, f"{company_slug}_latest.json"))
+            else:
+                logger.warning(f"[{company_slug}] Nothing scraped; keeping the previous output file.")
+
+        try:
+            await asyncio.gather(*(run(company) for company in companies))
+        finally:
+            await pool.close()
+            await browser.close()
+            logger.info("Browser closed.")
+
+    return results
+
+def save_items(items, output_file):
+    directory = os.path.dirname(output_file)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(output_file, "w", encoding="utf-8") as f:
+        json.dump(items, f, ensure_ascii=False, indent=2)
+    logger.info(f"Data saved to {output_file}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Scrape complaints for several companies from Sikayetvar concurrently.")
+    parser.add_argument("--companies", nargs="+", required=True, help="Company slugs to scrape")
+    parser.add_argument("--max", type=int, default=100, help="Maximum number of items per company (default: 100)")
+    parser.add_argument("--concurrency", type=int, default=4, help="Browser contexts scraping in parallel (default: 4)")
+    parser.add_argument("--output-dir", type=str, default=".", help="Directory for <slug>_latest.json files (default: .)")
+    parser.add_argument("--headed", action="store_true", help="Show the browser window")
+    parser.add_argument("--state-dir", type=str, help="Pipeline history directory; only complaints not analyzed yet are scraped")
+
+    args = parser.parse_args()
+
+    results = asyncio.run(scrape_companies(
+        args.companies,
+        max_items=args.max,
+        concurrency=args.concurrency,
+        output_dir=args.output_dir,
+        headless=not args.headed,
+        state_dir=args.state_dir
+    ))
+
+    for company, items in results.items():
+        print(f"{company}: {len(items)}")
+    # Partial results are still usable; fail only when nothing was scraped.
+    # In incremental mode an empty result just means there is nothing new.
+    sys.exit(0 if args.state_dir or any(results.values()) else 1)
+
+if __name__ == "__main__":
+    main()
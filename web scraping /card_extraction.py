@@ -0,0 +1,60 @@
+import hashlib
+import json
+import os
+import re
+
+# Shared by the sync and async scrapers: one page.evaluate round-trip returns every
+# card added since `start`, instead of several element-handle calls per card.
+CARD_SELECTOR = "article.card-v2"
+
+EXTRACT_CARDS_JS = """
+([selector, start]) => {
+    const cards = document.querySelectorAll(selector);
+    const items = [];
+    for (let i = start; i < cards.length; i++) {
+        const card = cards[i];
+        const desc = card.querySelector(".complaint-description");
+        const text = desc ? desc.textContent.trim() : "";
+        if (!text) continue;
+        const user = card.querySelector("span.username");
+        const date = card.querySelector(".post-time .time");
+        items.push({
+            text: text,
+            user: user ? user.textContent.trim() : null,
+            date: date ? date.textContent.trim() : null
+        });
+    }
+    return {total: cards.length, items: items};
+}
+"""
+
+WHITESPACE_RE = re.compile(r"\s+")
+
+def fingerprint(company_slug, text, user=None):
+    """
+    Stable ID of a complaint: hash of company, user and whitespace-normalized text.
+    The date is left out because the site shows relative times ("2 saat önce").
+    """
+    normalized = WHITESPACE_RE.sub(" ", text).strip()
+    return hashlib.sha256(f"{company_slug}\0{user or ''}\0{normalized}".encode("utf-8")).hexdigest()[:32]
+
+def to_records(company_slug, items):
+    return [
+        {
+            "company": company_slug,
+            "text": item["text"],
+            "user": item["user"],
+            "date": item["date"],
+            "fingerprint": fingerprint(company_slug, item["text"], item["user"])
+        }
+        for item in items
+    ]
+
+def load_seen(state_path):
+    """
+    Fingerprints already analyzed for a company, from the pipeline's history state file.
+    """
+    if not state_path or not os.path.exists(state_path):
+        return set()
+    with open(state_path, "r", encoding="utf-8") as f:
+        return set(json.load(f).get("seen", []))
@@ -4,6 +4,7 @@ import time
 import argparse
 import logging
 import sys
+from card_extraction import CARD_SELECTOR, EXTRACT_CARDS_JS, to_records
 
 # Configure logging
 logging.basicConfig(
@@ -50,48 +51,23 @@ def scrape_sikayetvar(company_slug, max_items=100, output_file="data.json"):
         stagnation = 0
 
         while len(data) < max_items and stagnation < 3:
-            cards = page.query_selector_all("article.card-v2")
-            
+            # One round-trip returns only the cards added since the last batch
+            result = page.evaluate(EXTRACT_CARDS_JS, [CARD_SELECTOR, prev_len])
+            card_count = result["total"]
+
             # Log progress every batch or if stagnant
-            if len(cards) == prev_len:
+            if card_count == prev_len:
                 stagnation += 1
-                logger.debug(f"Stagnation detected ({stagnation}/3). Card count: {len(cards)}")
+                logger.debug(f"Stagnation detected ({stagnation}/3). Card count: {card_count}")
             else:
                 stagnation = 0
-                logger.info(f"Found {len(cards)} cards so far...")
+                logger.info(f"Found {card_count} cards so far...")
 
-            prev_len = len(cards)
+            prev_len = card_count
 
             # Process new cards
-            new_cards_indices = range(len(data), len(cards))
-            
-            for i in new_cards_indices:
-                if len(data) >= max_items:
-                    break
-                
-                card = cards[i]
-                try:
-                    desc = card.query_selector(".complaint-description")
-                    if not desc:
-                        continue
-
-                    text = desc.text_content().strip()
-                    if not text:
-                        continue
-
-                    user = card.query_selector("span.username")
-                    date = card.query_selector(".post-time .time")
-
-                    data.append({
-                        "company": company_slug,
-                        "text": text,
-                        "user": user.text_content().strip() if user else None,
-                        "date": date.text_content().strip() if date else None
-                    })
-
-                except Exception as e:
-                    logger.warning(f"Error processing card: {e}")
-                    continue
+            new_items = to_records(company_slug, result["items"])
+            data.extend(new_items[:max_items - len(data)])
 
             # Check if we are done before scrolling again
             if len(data) >= max_items: